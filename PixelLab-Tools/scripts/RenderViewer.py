@@ -14,6 +14,47 @@ try:
 except ImportError:
     HAS_OIIO = False
 
+from pixellab import atlas, images, proxies, sequences
+from pixellab.thumbnails import tile_qimage
+
+
+class RenderThumbnailLoader(QtCore.QThread):
+    thumbnail_ready = QtCore.Signal(str, object)  # image path, uint8 tile, QImage or None
+
+    def __init__(self, root, paths, size=(160, 90)):
+        super().__init__()
+        self.root = root
+        self.paths = paths
+        self.size = size
+
+    def run(self):
+        thumbs = None
+        if images.HAS_OIIO:
+            try:
+                thumbs = atlas.open_atlas(self.root, self.size)
+            except Exception as e:
+                print(f"Could not open thumbnail atlas for {self.root}: {e}")
+        for image_path in self.paths:
+            if self.isInterruptionRequested():
+                return
+            result = None
+            try:
+                # A current proxy is already display-ready and much cheaper to decode
+                path = proxies.proxy_for_frame(os.path.dirname(image_path), os.path.basename(image_path)) or image_path
+                if thumbs is not None:
+                    result, _ = thumbs.get_or_build(path)
+                else:
+                    # QImage, unlike QPixmap, may be built outside the GUI thread
+                    reader = QtGui.QImageReader(path)
+                    reader.setAutoTransform(True)
+                    image = reader.read()
+                    if not image.isNull():
+                        result = image.scaled(self.size[0], self.size[1], QtCore.Qt.KeepAspectRatio,
+                                              QtCore.Qt.SmoothTransformation)
+            except Exception as e:
+                print(f"Thumbnail failed for {image_path}: {e}")
+            self.thumbnail_ready.emit(image_path, result)
+
 
 def get_folder_owner(path):
     try:
@@ -124,9 +165,13 @@ class RenderBrowser(QtWidgets.QDialog):
 
         layout.addWidget(self.render_table)
 
+        self.thumb_labels = {}  # image path -> label waiting for its thumbnail
+        self.thumb_loaders = []
+
         QtCore.QTimer.singleShot(300, self.populate_render_table)
 
-    def generate_thumbnail(self, image_path, size=(160, 90)):
+    def generate_thumbnail(self, image_path):
+        """Placeholder label; the pixmap is filled in by a RenderThumbnailLoader."""
         label = QtWidgets.QLabel()
         label.setAlignment(QtCore.Qt.AlignCenter)
         label.setStyleSheet("padding: 2px; background-color: #222222; color: gray;")
@@ -135,41 +180,39 @@ class RenderBrowser(QtWidgets.QDialog):
             label.setText("File not found")
             return label
 
-        ext = os.path.splitext(image_path)[1].lower()
-        display_path = image_path
+        label.setText("Loading...")
+        self.thumb_labels[image_path] = label
+        return label
 
-        if ext == ".exr" and HAS_OIIO:
-            try:
-                import tempfile
-                buf = oiio.ImageBuf(image_path)
-                tmp = tempfile.NamedTemporaryFile(suffix=".png", delete=False)
-                display_path = tmp.name
-                buf.write(display_path)
-            except Exception:
-                label.setText("EXR read error")
-                return label
-
-        reader = QtGui.QImageReader(display_path)
-        reader.setAutoTransform(True)
-        image = reader.read()
-
-        if image.isNull():
-            label.setText("Unsupported Format")
+    def load_thumbnails(self):
+        if not self.thumb_labels:
+            return
+        # Cached tiles for everything under $HIP/render live in one atlas
+        render_dir = os.path.join(hou.getenv("HIP") or "", "render")
+        loader = RenderThumbnailLoader(render_dir, list(self.thumb_labels))
+        loader.thumbnail_ready.connect(self.set_thumbnail)
+        loader.finished.connect(lambda: self.thumb_loaders.remove(loader))
+        self.thumb_loaders.append(loader)
+        loader.start()
+
+    def set_thumbnail(self, image_path, result):
+        label = self.thumb_labels.pop(image_path, None)
+        if label is None:
+            return
+        if result is None:
+            label.setText("Read error" if images.HAS_OIIO else "Unsupported Format")
+        elif isinstance(result, QtGui.QImage):
+            label.setPixmap(QtGui.QPixmap.fromImage(result))
         else:
-            pixmap = QtGui.QPixmap.fromImage(image)
-            scaled_pixmap = pixmap.scaled(size[0], size[1], QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
-            label.setPixmap(scaled_pixmap)
-
-        if ext == ".exr" and HAS_OIIO:
-            try:
-                os.remove(display_path)
-            except:
-                pass
-
-        return label
+            # The tile is a view into the atlas map, the pixmap takes the only copy
+            label.setPixmap(QtGui.QPixmap.fromImage(tile_qimage(result)))
 
     def populate_render_table(self):
         try:
+            # Rows are about to be rebuilt, so earlier loaders have nothing left to fill
+            for loader in self.thumb_loaders:
+                loader.requestInterruption()
+            self.thumb_labels.clear()
             self.render_table.setRowCount(0)
             hip_dir = hou.getenv("HIP") or ""
             render_dir = os.path.join(hip_dir, "render")
@@ -189,15 +232,8 @@ class RenderBrowser(QtWidgets.QDialog):
                     if not exr_files:
                         continue
                     exr_files.sort()
-                    pattern = re.compile(r"^(.*?)(\d+)\.[^.]+$")
-                    matches = [pattern.match(f) for f in exr_files]
-                    frame_range = ""
-                    if matches and all(matches):
-                        start = int(matches[0].group(2))
-                        end = int(matches[-1].group(2))
-                        frame_range = f"{start}-{end}"
-                    else:
-                        frame_range = f"1-{len(exr_files)}"
+                    seq = sequences.scan_sequence(layer_path, names=exr_files)
+                    frame_range = seq.frame_set.span() if seq else f"1-{len(exr_files)}"
                     resolution = "Unknown"
                     try:
                         if HAS_OIIO:
@@ -234,6 +270,7 @@ class RenderBrowser(QtWidgets.QDialog):
             for col, width in enumerate(min_widths):
                 self.render_table.setColumnWidth(col, width)
                 self.render_table.horizontalHeader().setMinimumSectionSize(50)
+            self.load_thumbnails()
 
         except Exception as e:
             print("populate_render_table error:", e)
@@ -269,6 +306,11 @@ class RenderBrowser(QtWidgets.QDialog):
             return
 
         try:
+            proxy_seq = proxies.find_proxy_sequence(folder)
+            if proxy_seq:
+                subprocess.Popen(["mplay"] + proxy_seq.mplay_args())
+                return
+
             extensions = [".exr", ".jpg", ".jpeg", ".png", ".dpx", ".tif", ".tiff"]
             files = sorted(f for f in os.listdir(folder)
                            if os.path.splitext(f)[1].lower() in extensions)
@@ -319,6 +361,10 @@ class RenderBrowser(QtWidgets.QDialog):
             subprocess.Popen(['xdg-open', folder])
 
     def closeEvent(self, event):
+        # The dialog is dropped from hou.session below, a running QThread must not outlive it
+        for loader in list(self.thumb_loaders):
+            loader.requestInterruption()
+            loader.wait()
         try:
             if hasattr(hou.session, "render_browser_window"):
                 hou.session.render_browser_window = None
@@ -1,90 +1,54 @@
-import os
-import re
-import platform
 import getpass
-import subprocess
 from PySide2 import QtWidgets, QtCore
-from PySide2.QtCore import QDate, QDateTime
+from PySide2.QtCore import QDate
 from PySide2.QtWidgets import QLabel
 
+from pixellab import deadline_client, deadline_jobs
+from pixellab.deadline_table import JobDetailFetcher, JobTable
+
 # ---------------------------
 # Worker threads
 # ---------------------------
 class DeadlineJobLoader(QtCore.QThread):
-    jobs_loaded = QtCore.Signal(list)  # list of job dicts
+    jobs_loaded = QtCore.Signal(list, bool)  # list of job dicts, True if Deadline listed every job
     error = QtCore.Signal(str)
 
-    def __init__(self, deadline_cmd, user=None, parent=None):
+    def __init__(self, client, user=None, parent=None):
         super().__init__(parent)
-        self.deadline_cmd = deadline_cmd
+        self.client = client
         self.user = user
 
     def run(self):
         jobs = []
+        complete = False
         try:
-            args = [self.deadline_cmd, "GetJobs"]
-            if self.user:
-                args += ["-UserName", self.user]
-            result = subprocess.run(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            out = result.stdout.strip() or result.stderr.strip()
-            current_job = {}
-            for line in out.splitlines():
-                if "=" in line:
-                    k, v = line.split("=", 1)
-                    current_job[k.strip()] = v.strip()
-                elif not line.strip():  # blank line => job boundary
-                    if current_job:
-                        jobs.append(current_job.copy())
-                        current_job.clear()
-            if current_job:
-                jobs.append(current_job.copy())
+            jobs = self.client.get_jobs(self.user)
+            complete = True
         except Exception as e:
             self.error.emit(str(e))
         finally:
-            self.jobs_loaded.emit(jobs)
-
-
-class JobInfoLoader(QtCore.QThread):
-    info_loaded = QtCore.Signal(dict)
-    error = QtCore.Signal(str)
-
-    def __init__(self, deadline_cmd, job_id, parent=None):
-        super().__init__(parent)
-        self.deadline_cmd = deadline_cmd
-        self.job_id = job_id
-
-    def run(self):
-        parsed = {}
-        try:
-            result = subprocess.run([self.deadline_cmd, "GetJob", self.job_id], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            out = result.stdout.strip() or result.stderr.strip()
-            for line in out.splitlines():
-                if "=" in line:
-                    k, v = line.split("=", 1)
-                    parsed[k.strip()] = v.strip()
-        except Exception as e:
-            self.error.emit(str(e))
-        finally:
-            self.info_loaded.emit(parsed)
+            self.jobs_loaded.emit(jobs, complete)
 
 
 class CommandRunner(QtCore.QThread):
-    finished_running = QtCore.Signal(str, bool, str)  # command, success, message
+    """Runs one command on a list of jobs; the client batches ids and bounds concurrency."""
+    job_done = QtCore.Signal(str, bool, str)  # job id, success, message
+    finished_running = QtCore.Signal(str, dict)  # command, {job id: (success, message)}
 
-    def __init__(self, deadline_cmd, command, job_id, parent=None):
+    def __init__(self, client, command, job_ids, parent=None):
         super().__init__(parent)
-        self.deadline_cmd = deadline_cmd
+        self.client = client
         self.command = command
-        self.job_id = job_id
+        self.job_ids = job_ids
 
     def run(self):
+        results = {}
         try:
-            result = subprocess.run([self.deadline_cmd, self.command, self.job_id], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            success = result.returncode == 0
-            msg = (result.stdout.strip() or result.stderr.strip())
-            self.finished_running.emit(self.command, success, msg)
+            results = self.client.job_command(self.command, self.job_ids, progress=self.job_done.emit)
         except Exception as e:
-            self.finished_running.emit(self.command, False, str(e))
+            results = {jid: (False, str(e)) for jid in self.job_ids}
+        finally:
+            self.finished_running.emit(self.command, results)
 
 # ---------------------------
 # Main GUI
@@ -93,9 +57,8 @@ class DeadlineGUI(QtWidgets.QWidget):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Deadline Jobs Viewer")
-        self.resize(900, 550)
+        self.resize(1200, 600)
         self.apply_dark_theme()
-        self.jobs = []
         self.threads = []  # keep references to threads to avoid GC
         layout = QtWidgets.QVBoxLayout(self)
         layout.addWidget(self.create_deadline_page())
@@ -151,20 +114,15 @@ class DeadlineGUI(QtWidgets.QWidget):
         left_layout.addLayout(filter_layout)
 
         # Job table
-        self.deadline_table = QtWidgets.QTableWidget()
-        self.deadline_table.setColumnCount(14)
-        self.deadline_table.setHorizontalHeaderLabels([
-            "Job Name", "User", "Progress", "Status", "Frames", "Pool",
-            "Priority", "Submitted", "Started", "Completed",
-            "Output Directory", "Output File", "Submitted From", "Job ID"
-        ])
-        self.deadline_table.setSortingEnabled(True)
+        self.deadline_table = QtWidgets.QTableView()
+        self.job_table = JobTable(self.deadline_table)
+        self.job_table.apply_filter(self._job_filter())
         self.deadline_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
         self.deadline_table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
         self.deadline_table.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
         self.deadline_table.customContextMenuRequested.connect(self.show_deadline_context_menu)
-        self.deadline_table.itemSelectionChanged.connect(self._deadline_row_selected)
-        self.deadline_table.itemDoubleClicked.connect(self._deadline_row_selected)
+        self.deadline_table.selectionModel().selectionChanged.connect(self._deadline_row_selected)
+        self.deadline_table.doubleClicked.connect(self._deadline_row_selected)
         left_layout.addWidget(self.deadline_table)
 
         # Action buttons
@@ -181,15 +139,38 @@ class DeadlineGUI(QtWidgets.QWidget):
         actions_row.addStretch()
         left_layout.addLayout(actions_row)
 
-        main = QtWidgets.QHBoxLayout()
-        main.addWidget(left)
+        # Job info panel, filled from the detail cache as the selection moves
+        right = QtWidgets.QWidget()
+        right_layout = QtWidgets.QVBoxLayout(right)
+        info_label = QLabel("Job Info")
+        info_label.setStyleSheet("font-weight: bold; font-size: 14px; padding: 6px;")
+        right_layout.addWidget(info_label)
+
+        self.job_info_table = QtWidgets.QTableWidget()
+        self.job_info_table.setColumnCount(2)
+        self.job_info_table.setHorizontalHeaderLabels(["Field", "Value"])
+        self.job_info_table.horizontalHeader().setStretchLastSection(True)
+        self.job_info_table.verticalHeader().setVisible(False)
+        self.job_info_table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        right_layout.addWidget(self.job_info_table)
 
+        self.job_details = JobDetailFetcher(self)
+        self.job_details.detail_ready.connect(self._show_job_info)
+
+        main = QtWidgets.QHBoxLayout()
+        main.addWidget(left, 3)
+        main.addWidget(right, 1)
 
         page = QtWidgets.QWidget()
         page.setLayout(main)
 
         self._deadline_timer = QtCore.QTimer(self)
         self._deadline_timer.timeout.connect(self.load_deadline_jobs)
+        # Job actions finishing close together share a single refresh
+        self._action_refresh_timer = QtCore.QTimer(self)
+        self._action_refresh_timer.setSingleShot(True)
+        self._action_refresh_timer.setInterval(400)
+        self._action_refresh_timer.timeout.connect(self.load_deadline_jobs)
 
         return page
 
@@ -256,26 +237,15 @@ class DeadlineGUI(QtWidgets.QWidget):
     # Loading jobs (threaded)
     # ---------------------------
     def load_deadline_jobs(self):
-        # Avoid overlapping refreshes
+        # Avoid overlapping refreshes; the table keeps its rows until the new list is diffed in
         self._deadline_timer.stop()
-        self.saved_filter_text = self.search_bar.text()
-        self.search_bar.blockSignals(True)
-        self.search_bar.clear()
-        self.deadline_table.setRowCount(0)
-        self.jobs = []
-
-        deadline_bin_dir = os.getenv("DEADLINE_PATH", r"C:\Program Files\Thinkbox\Deadline10\bin")
-        self.deadline_cmd = os.path.join(deadline_bin_dir, "deadlinecommand")
-        if platform.system() == "Windows" and not self.deadline_cmd.lower().endswith(".exe"):
-            if os.path.isfile(self.deadline_cmd + ".exe"):
-                self.deadline_cmd += ".exe"
 
         user = self.user_filter.currentText().strip() or getpass.getuser()
 
         # disable refresh while loading
         self.refresh_btn.setEnabled(False)
 
-        loader = DeadlineJobLoader(self.deadline_cmd, user)
+        loader = DeadlineJobLoader(deadline_client.shared_client(), user)
         loader.jobs_loaded.connect(self._jobs_from_thread)
         loader.error.connect(self._worker_error)
         loader.finished.connect(lambda: self._thread_cleanup(loader))
@@ -293,154 +263,41 @@ class DeadlineGUI(QtWidgets.QWidget):
         # show minimal message (main thread)
         print("Worker error:", msg)
 
-    def _jobs_from_thread(self, jobs):
-        # Called on main thread via signal
-        self.jobs = []
-        for job in jobs:
-            jobid = job.get("JobId") or job.get("Id") or job.get("ID") or ""
-            job["__parsed_jobid"] = jobid
-            job["__submit_qdate"] = self._parse_job_submit_date(job.get("JobSubmitDateTime", "") or job.get("JobSubmitDate", ""))
-            self.jobs.append(job)
-
-        # restore search text and enable refresh
-        self.search_bar.blockSignals(False)
+    def _jobs_from_thread(self, jobs, complete):
+        # Called on main thread via signal; only added, removed and changed jobs touch the table
         try:
-            self.search_bar.setText(self.saved_filter_text)
+            # A failed listing must not diff every job as removed and wipe the table
+            if complete:
+                added, removed, changed = self.job_table.update(jobs)
+                self.job_details.forget(removed)
+                self.job_details.note_jobs([self.job_table.jobs[jid] for jid in added + changed])
         finally:
             self.refresh_btn.setEnabled(True)
 
-        self.apply_deadline_filter()
-
         # restart auto timer if needed
         if self.auto_refresh_chk.isChecked():
             self._deadline_timer.start(self.auto_interval.value() * 1000)
 
-    def _parse_job_submit_date(self, val):
-        if not val:
-            return None
-        try:
-            if str(val).isdigit():
-                dt = QDateTime.fromSecsSinceEpoch(int(val))
-                return dt.date()
-            for fmt in ("yyyy-MM-dd hh:mm:ss", "yyyy-MM-ddThh:mm:ss", "yyyy-MM-dd hh:mm", "yyyy-MM-dd"):
-                dt = QDateTime.fromString(val, fmt)
-                if dt.isValid():
-                    return dt.date()
-            m = re.search(r"(\d{4}-\d{2}-\d{2})", val)
-            if m:
-                dt = QDateTime.fromString(m.group(1), "yyyy-MM-dd")
-                if dt.isValid():
-                    return dt.date()
-        except Exception:
-            pass
-        return None
-
     # ---------------------------
-    # Table population (main thread only)
+    # Filtering (main thread only)
     # ---------------------------
-    def add_deadline_job_row(self, job):
-        row = self.deadline_table.rowCount()
-        self.deadline_table.insertRow(row)
-
-        name = job.get("Name", "Unknown")
-        user = job.get("UserName", "") or job.get("User", "")
-        status = job.get("Status", "")
-        pool = job.get("Pool", "")
-        priority = str(job.get("Priority", ""))
-        job_id = job.get("__parsed_jobid", "UNKNOWN")
-        raw_frames = job.get("Frames", "")
-        frame_numbers = set()
-
-        if isinstance(raw_frames, str):
-            parts = re.split(r"[,\s]+", raw_frames.strip())
-            for p in parts:
-                if "-" in p:
-                    try:
-                        a, b = p.split("-", 1)
-                        frame_numbers.update(range(int(a), int(b) + 1))
-                    except:
-                        pass
-                elif p.isdigit():
-                    frame_numbers.add(int(p))
-
-        frame_list = sorted(frame_numbers)
-        frame_range = f"{frame_list[0]}-{frame_list[-1]}" if frame_list else ""
-
-        submit_time = job.get("JobSubmitDateTime", "")
-        started_time = job.get("JobStartedDateTime", "")
-        completed_time = job.get("JobCompletedDateTime", "")
-        output_dir = job.get("JobOutputDirectories", "")
-        output_file = job.get("JobOutputFileNames", "")
-        output_dir = output_dir[0] if isinstance(output_dir, list) and output_dir else output_dir
-        output_file = output_file[0] if isinstance(output_file, list) and output_file else output_file
-        submit_machine = job.get("JobSubmitMachine", "")
-
-        try:
-            completed = int(job.get("JobCompletedTasks", 0))
-            total = int(job.get("JobTaskCount", 1))
-            progress = int((completed / total) * 100) if total > 0 else 0
-        except:
-            progress = 0
-
-        columns = [
-            name, user, None, status, frame_range, pool,
-            priority, submit_time, started_time, completed_time,
-            output_dir, output_file, submit_machine, job_id
-        ]
-
-        for i, value in enumerate(columns):
-            if i == 2:
-                pb = QtWidgets.QProgressBar()
-                pb.setValue(progress)
-                pb.setAlignment(QtCore.Qt.AlignCenter)
-                pb.setFormat(f"{progress}%")
-                pb.setFixedHeight(16)
-                self.deadline_table.setCellWidget(row, i, pb)
-            else:
-                item = QtWidgets.QTableWidgetItem(value or "")
-                item.setTextAlignment(QtCore.Qt.AlignCenter)
-                item.setData(QtCore.Qt.UserRole, job_id)
-                self.deadline_table.setItem(row, i, item)
+    def _job_filter(self):
+        return deadline_jobs.JobFilter(
+            self.search_bar.text(), self.user_filter.currentText() or "",
+            self.date_start.date().toPython(), self.date_end.date().toPython(), require_date=True)
 
     def apply_deadline_filter(self):
-        filter_text = self.search_bar.text().lower().strip()
-        user_filter_text = (self.user_filter.currentText() or "").lower().strip()
-        date_from = self.date_start.date()
-        date_to = self.date_end.date()
-
-        self.deadline_table.setRowCount(0)
-        for job in getattr(self, "jobs", []):
-            name = job.get("Name", "").lower()
-            user = (job.get("UserName", "") or job.get("User", "")).lower()
-            jobid = (job.get("__parsed_jobid", "") or "").lower()
-            submit_qdate = job.get("__submit_qdate", None)
-            if not submit_qdate:
-                continue
-            if not (date_from <= submit_qdate <= date_to):
-                continue
-            if user_filter_text and user_filter_text not in user:
-                continue
-            if filter_text and filter_text not in name and filter_text not in user and filter_text not in jobid:
-                continue
-            self.add_deadline_job_row(job)
+        self.job_table.apply_filter(self._job_filter())
 
     def get_selected_job_ids(self):
-        selected = self.deadline_table.selectionModel().selectedRows()
-        job_ids = set()
-        for row in selected:
-            for col in range(self.deadline_table.columnCount()):
-                item = self.deadline_table.item(row.row(), col)
-                if item and item.data(QtCore.Qt.UserRole):
-                    job_ids.add(item.data(QtCore.Qt.UserRole))
-                    break
-        return list(job_ids)
+        return self.job_table.selected_job_ids()
 
     def show_deadline_context_menu(self, pos):
         index = self.deadline_table.indexAt(pos)
         if not index.isValid():
             return
         self.deadline_table.selectRow(index.row())
-        job_id = self.deadline_table.item(index.row(), 0).data(QtCore.Qt.UserRole)
+        job_id = self.job_table.job_id_at(index.row())
         if not job_id:
             return
         menu = QtWidgets.QMenu()
@@ -456,55 +313,23 @@ class DeadlineGUI(QtWidgets.QWidget):
         if not sels:
             return
         row = sels[0].row()
-        job_id = self.deadline_table.item(row, 0).data(QtCore.Qt.UserRole)
+        job_id = self.job_table.job_id_at(row)
         if job_id:
-            self.fetch_and_show_job_info(job_id)
+            self.job_details.request(job_id, self.job_table.neighbour_ids(row, JobDetailFetcher.PREFETCH_ROWS))
 
 
     # ---------------------------
     # Job info (threaded)
     # ---------------------------
     def fetch_and_show_job_info(self, job_id):
-        # ensure self.deadline_cmd exists
-        if not hasattr(self, "deadline_cmd") or not self.deadline_cmd:
-            deadline_bin_dir = os.getenv("DEADLINE_PATH", r"C:\Program Files\Thinkbox\Deadline10\bin")
-            self.deadline_cmd = os.path.join(deadline_bin_dir, "deadlinecommand")
-            if platform.system() == "Windows" and os.path.isfile(self.deadline_cmd + ".exe"):
-                self.deadline_cmd += ".exe"
-
-        info_loader = JobInfoLoader(self.deadline_cmd, job_id)
-        info_loader.info_loaded.connect(self._show_job_info)
-        info_loader.error.connect(self._worker_error)
-        info_loader.finished.connect(lambda: self._thread_cleanup(info_loader))
-        info_loader.start()
-        self.threads.append(info_loader)
-
-    def _show_job_info(self, parsed):
-        # Create a modal dialog to show job info
-        dialog = QtWidgets.QDialog(self)
-        dialog.setWindowTitle("Job Info")
-        dialog.resize(600, 400)
-        layout = QtWidgets.QVBoxLayout(dialog)
-    
-        table = QtWidgets.QTableWidget()
-        table.setColumnCount(2)
-        table.setHorizontalHeaderLabels(["Field", "Value"])
-        table.horizontalHeader().setStretchLastSection(True)
-        table.verticalHeader().setVisible(False)
-    
-        for i, (k, v) in enumerate(sorted(parsed.items())):
-            table.insertRow(i)
-            table.setItem(i, 0, QtWidgets.QTableWidgetItem(k))
-            table.setItem(i, 1, QtWidgets.QTableWidgetItem(v))
-    
-        layout.addWidget(table)
-    
-        btn_close = QtWidgets.QPushButton("Close")
-        btn_close.clicked.connect(dialog.accept)
-        layout.addWidget(btn_close)
-    
-        dialog.exec_()
+        self.job_details.request(job_id, immediate=True)
 
+    def _show_job_info(self, job_id, parsed):
+        self.job_info_table.setRowCount(0)
+        for i, (k, v) in enumerate(sorted(parsed.items())):
+            self.job_info_table.insertRow(i)
+            self.job_info_table.setItem(i, 0, QtWidgets.QTableWidgetItem(k))
+            self.job_info_table.setItem(i, 1, QtWidgets.QTableWidgetItem(v))
 
     # ---------------------------
     # Run commands (threaded)
@@ -512,47 +337,50 @@ class DeadlineGUI(QtWidgets.QWidget):
     def _run_command_on_jobs(self, command, job_ids):
         if not job_ids:
             return
-        if not hasattr(self, "deadline_cmd") or not self.deadline_cmd:
-            deadline_bin_dir = os.getenv("DEADLINE_PATH", r"C:\Program Files\Thinkbox\Deadline10\bin")
-            self.deadline_cmd = os.path.join(deadline_bin_dir, "deadlinecommand")
-            if platform.system() == "Windows" and os.path.isfile(self.deadline_cmd + ".exe"):
-                self.deadline_cmd += ".exe"
 
-        # optionally disable action buttons to prevent double-clicks
+        # disable action buttons to prevent double-clicks
         self.suspend_btn.setEnabled(False)
         self.resume_btn.setEnabled(False)
         self.delete_btn.setEnabled(False)
 
-        for jid in job_ids:
-            runner = CommandRunner(self.deadline_cmd, command, jid)
-            runner.finished_running.connect(self._command_finished)
-            runner.finished.connect(lambda: self._thread_cleanup(runner))
-            runner.start()
-            self.threads.append(runner)
+        runner = CommandRunner(deadline_client.shared_client(), command, job_ids)
+        runner.job_done.connect(lambda jid, success, msg, cmd=command: self._job_command_done(cmd, jid, success, msg))
+        runner.finished_running.connect(self._command_finished)
+        runner.finished.connect(lambda: self._thread_cleanup(runner))
+        runner.start()
+        self.threads.append(runner)
 
     def suspend_selected_jobs(self):
         self._run_command_on_jobs("SuspendJob", self.get_selected_job_ids())
-        # refresh after a short delay
-        QtCore.QTimer.singleShot(400, self.load_deadline_jobs)
 
     def resume_selected_jobs(self):
         self._run_command_on_jobs("ResumeJob", self.get_selected_job_ids())
-        QtCore.QTimer.singleShot(400, self.load_deadline_jobs)
 
     def delete_selected_jobs(self):
         self._run_command_on_jobs("DeleteJob", self.get_selected_job_ids())
-        QtCore.QTimer.singleShot(400, self.load_deadline_jobs)
 
-    def _command_finished(self, command, success, message):
+    def _job_command_done(self, command, job_id, success, message):
+        print(f"{command} {job_id}: success={success}, msg={message}")
+
+    def _command_finished(self, command, results):
         # Called on main thread
-        print(f"{command} finished: success={success}, msg={message}")
-        # re-enable action buttons (could be more nuanced)
         self.suspend_btn.setEnabled(True)
         self.resume_btn.setEnabled(True)
         self.delete_btn.setEnabled(True)
-        # optionally show small popup for failures
-        if not success:
-            QtWidgets.QMessageBox.warning(self, f"{command} failed", message or "Unknown error")
+        if command == "DeleteJob":
+            # drop deleted rows now instead of waiting for the refresh
+            deleted = [jid for jid, (success, _) in results.items() if success]
+            self.job_table.merge([], deleted)
+            self.job_details.forget(deleted)
+        # one refresh for the whole action, however many jobs it touched
+        self._action_refresh_timer.start()
+        failed = [(jid, msg) for jid, (success, msg) in results.items() if not success]
+        if failed:
+            lines = [f"{jid}: {msg or 'Unknown error'}" for jid, msg in failed[:20]]
+            if len(failed) > 20:
+                lines.append(f"... and {len(failed) - 20} more")
+            QtWidgets.QMessageBox.warning(self, f"{command} failed",
+                                          f"{len(failed)} of {len(results)} jobs failed:\n\n" + "\n".join(lines))
 
 # ---------------------------
 # Entrypoint
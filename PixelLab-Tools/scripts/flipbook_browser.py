@@ -1,60 +1,18 @@
 import os
 import glob
 import subprocess
-import numpy as np
-import OpenImageIO as oiio
 from PySide2 import QtWidgets, QtGui, QtCore
 import hou
 import re
 
+from pixellab import flipbook_meta
+from pixellab.thumbnails import FilmstripScrubber, FlipbookThumbnailService, frame_range_from_names
+
 # Close any previous instance
 for w in QtWidgets.QApplication.allWidgets():
     if w.objectName() == "FlipbookImageSequenceBrowser":
         w.close()
 
-def load_exr_thumbnail(path, size=(160, 90)):
-    img = oiio.ImageInput.open(path)
-    if not img:
-        return None
-    spec = img.spec()
-    pixels = img.read_image(format=oiio.FLOAT)
-    img.close()
-    if pixels is None:
-        return None
-
-    w, h, c = spec.width, spec.height, spec.nchannels
-    pixels = np.clip(pixels, 0.0, 1.0)
-    arr = (pixels * 255).astype(np.uint8)
-
-    if c == 3:
-        arr = arr.reshape(h, w, 3)
-        fmt = QtGui.QImage.Format_RGB888
-    elif c >= 4:
-        arr = arr.reshape(h, w, c)[:, :, :4]
-        fmt = QtGui.QImage.Format_RGBA8888
-    else:
-        return None
-
-    arr = np.ascontiguousarray(arr)
-    qimg = QtGui.QImage(arr.data, w, h, w * arr.shape[2], fmt).copy()
-    return QtGui.QPixmap.fromImage(qimg.scaled(*size, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation))
-
-from PySide2.QtGui import QPainter, QColor, QFont
-
-def add_overlay_text(pixmap, resolution, frame_range):
-    painter = QPainter(pixmap)
-    painter.setRenderHint(QPainter.TextAntialiasing)
-
-    margin = 6
-    rect = pixmap.rect().adjusted(margin, margin, -margin, -margin)
-    text = f"{resolution[0]}x{resolution[1]}\n{frame_range[0]}-{frame_range[1]}"
-
-    painter.setPen(QColor("white"))
-    painter.setFont(QFont("Segoe UI", 6, QFont.Normal))
-    painter.drawText(rect, QtCore.Qt.AlignLeft | QtCore.Qt.AlignTop, text)
-    painter.end()
-    return pixmap
-
 class EXRFlipbookBrowser(QtWidgets.QWidget):
     def __init__(self):
         super().__init__()
@@ -142,12 +100,13 @@ class EXRFlipbookBrowser(QtWidgets.QWidget):
         main_layout.addLayout(btn_layout)
 
         self.folders = []
-        self.thumbnail_index = 0
         self.item_lookup = {}
+        self.folder_meta = {}
 
-        self.timer = QtCore.QTimer()
-        self.timer.setInterval(50)
-        self.timer.timeout.connect(self.load_next_thumbnail)
+        self.thumbnails = FlipbookThumbnailService(parent=self)
+        self.thumbnails.thumbnails_ready.connect(self.apply_thumbnails)
+        self.thumbnails.filmstrips_ready.connect(self.apply_filmstrips)
+        self.scrubber = FilmstripScrubber(self.list_widget)
 
         QtCore.QTimer.singleShot(100, self.start_thumbnail_loading)
 
@@ -157,11 +116,14 @@ class EXRFlipbookBrowser(QtWidgets.QWidget):
     def start_thumbnail_loading(self):
         self.list_widget.clear()
         self.item_lookup.clear()
-        self.timer.stop()
+        self.folder_meta.clear()
+        self.thumbnails.cancel()
+        self.scrubber.clear()
 
         root = self.hip_root()
         if not os.path.isdir(root):
             return
+        self.thumbnails.set_root(root)
 
         self.folders = []
         seen_paths = set()
@@ -171,7 +133,13 @@ class EXRFlipbookBrowser(QtWidgets.QWidget):
             if folder_path in seen_paths or not os.path.isdir(folder_path):
                 continue
 
-            exrs = sorted(glob.glob(os.path.join(folder_path, "*.exr")))
+            # The sidecar lists the frames, only glob folders from older flipbooks
+            meta = flipbook_meta.read_sidecar(folder_path)
+            if meta:
+                exrs = flipbook_meta.frame_paths(folder_path, meta)
+                self.folder_meta[folder_path] = meta
+            else:
+                exrs = sorted(glob.glob(os.path.join(folder_path, "*.exr")))
             if not exrs:
                 continue
 
@@ -185,38 +153,35 @@ class EXRFlipbookBrowser(QtWidgets.QWidget):
             self.list_widget.addItem(item)
             self.item_lookup[folder_path] = item
 
-        self.thumbnail_index = 0
-        self.timer.start()
-
-    def load_next_thumbnail(self):
-        if self.thumbnail_index >= len(self.folders):
-            self.timer.stop()
-            return
-
-        name, folder_path, exrs = self.folders[self.thumbnail_index]
-        thumb = load_exr_thumbnail(exrs[0])
-        if thumb:
-            img = oiio.ImageInput.open(exrs[0])
-            spec = img.spec() if img else None
-            if img:
-                img.close()
-            resolution = (spec.width, spec.height) if spec else (0, 0)
-
-            frames = []
-            for f in exrs:
-                base = os.path.splitext(os.path.basename(f))[0]
-                m = re.search(r'(\d+)$', base)
-                if m:
-                    frames.append(int(m.group(1)))
-            if frames:
-                frame_range = (min(frames), max(frames))
+        for name, folder_path, exrs in self.folders:
+            meta = self.folder_meta.get(folder_path)
+            if meta:
+                self.thumbnails.request(folder_path, exrs[0], meta["frame_range"], meta["resolution"])
             else:
-                frame_range = (0, 0)
-
-            overlay_pixmap = add_overlay_text(thumb.copy(), resolution, frame_range)
-            self.item_lookup[folder_path].setIcon(QtGui.QIcon(overlay_pixmap))
-
-        self.thumbnail_index += 1
+                self.thumbnails.request(folder_path, exrs[0], frame_range_from_names(exrs))
+        # Queued behind the thumbnails so first frames still show up first
+        for name, folder_path, exrs in self.folders:
+            self.thumbnails.request_filmstrip(folder_path, folder_path, exrs)
+
+    def apply_thumbnails(self, batch):
+        self.list_widget.setUpdatesEnabled(False)
+        try:
+            for folder_path, image in batch:
+                item = self.item_lookup.get(folder_path)
+                if item:
+                    self.scrubber.rest_icon(item, QtGui.QIcon(QtGui.QPixmap.fromImage(image)))
+        finally:
+            self.list_widget.setUpdatesEnabled(True)
+
+    def apply_filmstrips(self, batch):
+        for folder_path, strip in batch:
+            item = self.item_lookup.get(folder_path)
+            if item:
+                self.scrubber.set_strip(item, strip)
+
+    def closeEvent(self, event):
+        self.thumbnails.shutdown()
+        super().closeEvent(event)
 
     def show_context_menu(self, pos):
         items = self.list_widget.selectedItems()
@@ -247,6 +212,17 @@ class EXRFlipbookBrowser(QtWidgets.QWidget):
             return
 
         folder = os.path.dirname(exr_sequence[0])
+        meta = self.folder_meta.get(folder)
+        if meta and flipbook_meta.is_partial(meta):
+            # Still rendering progressively: the list repeats finished frames over the gaps
+            subprocess.Popen(["mplay"] + exr_sequence)
+            return
+        if meta:
+            start, end = meta["frame_range"]
+            sequence = flipbook_meta.houdini_pattern(folder, meta)
+            subprocess.Popen(["mplay", "-f", str(start), str(end), "1", sequence])
+            return
+
         files = sorted(os.path.basename(f) for f in exr_sequence)
 
         pattern = re.compile(r"(.*?)(\d+)(\.[^.]+)$")
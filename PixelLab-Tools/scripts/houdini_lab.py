@@ -2,6 +2,7 @@ import os
 import sys
 import getpass
 import re
+import threading
 import hou
 import shutil
 import platform
@@ -12,60 +13,512 @@ from PySide2 import QtWidgets, QtCore, QtGui
 from PySide2.QtWidgets import QLabel, QMessageBox
 from PySide2.QtCore import QSettings, QDate, QDateTime
 
-# Optional OpenImageIO and numpy for EXR thumbnail loading
+# Optional OpenImageIO for EXR headers
 try:
     import OpenImageIO as oiio
-    import numpy as np
-    HAS_OIIO = True
 except Exception:
-    HAS_OIIO = False
+    oiio = None
+
+from pixellab import (atlas, contact_sheet, deadline_client, deadline_jobs, flipbook_meta, flipbook_storage, images,
+                      proxies, render_diff, render_watch)
+from pixellab.deadline_table import JobDetailFetcher, JobTable
+from pixellab.thumbnails import FilmstripScrubber, FlipbookThumbnailService, frame_range_from_names, tile_qimage
+
+# Thumbnails decode through pixellab.images, which also needs numpy
+HAS_OIIO = oiio is not None and images.HAS_OIIO
+
+RENDER_WATCH_INTERVAL_MS = 2000
+RENDER_WATCH_IDLE_MS = 10000
 
 
 class DeadlineJobLoader(QtCore.QThread):
-    job_loaded = QtCore.Signal(dict)
-    finished_loading = QtCore.Signal()
+    jobs_loaded = QtCore.Signal(list)  # a batch of job dicts
+    finished_loading = QtCore.Signal(bool)  # True if Deadline listed every job
 
-    def __init__(self, deadline_cmd, user):
+    BATCH_SIZE = 200
+    BATCH_SECONDS = 0.1
+
+    def __init__(self, client, user):
         super().__init__()
-        self.deadline_cmd = deadline_cmd
+        self.client = client
         self.user = user
 
     def run(self):
+        complete = False
         try:
-            # If deadline command missing extension on Windows, try .exe
-            if platform.system() == "Windows" and not self.deadline_cmd.lower().endswith(".exe"):
-                if os.path.isfile(self.deadline_cmd + ".exe"):
-                    self.deadline_cmd = self.deadline_cmd + ".exe"
+            # Jobs are parsed as they stream in and handed to the GUI a batch at a time
+            for batch in deadline_jobs.batches(self.client.iter_jobs(self.user), self.BATCH_SIZE, self.BATCH_SECONDS):
+                self.jobs_loaded.emit(batch)
+            complete = True
+        except Exception as e:
+            print("Error loading Deadline jobs:", e)
+        finally:
+            self.finished_loading.emit(complete)
 
-            if not os.path.isfile(self.deadline_cmd):
-                # Still continue; the subprocess will likely error but we catch it
-                pass
 
-            result = subprocess.run(
-                [self.deadline_cmd, "GetJobsFilter", f"Username={self.user}"],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            output = result.stdout.strip().splitlines()
-
-            job = {}
-            for line in output:
-                line = line.strip()
-                if line == "":
-                    if job:
-                        self.job_loaded.emit(job)
-                        job = {}
-                else:
-                    if "=" in line:
-                        key, value = line.split("=", 1)
-                        job[key.strip()] = value.strip()
-            if job:
-                self.job_loaded.emit(job)
+class JobActionRunner(QtCore.QThread):
+    """Suspend/resume/delete a list of jobs off the GUI thread; the client batches ids."""
+    job_done = QtCore.Signal(str, bool, str)  # job id, success, message
+    finished_running = QtCore.Signal(str, dict)  # command, {job id: (success, message)}
+
+    def __init__(self, client, command, job_ids):
+        super().__init__()
+        self.client = client
+        self.command = command
+        self.job_ids = job_ids
+
+    def run(self):
+        results = {}
+        try:
+            results = self.client.job_command(self.command, self.job_ids, progress=self.job_done.emit)
         except Exception as e:
-            print("Error loading Deadline jobs:", e)
+            results = {jid: (False, str(e)) for jid in self.job_ids}
         finally:
-            self.finished_loading.emit()
+            self.finished_running.emit(self.command, results)
+
+
+class ProxyGenerator(QtCore.QThread):
+    progress = QtCore.Signal(int, int, str)  # done, total, layer path
+    finished_generating = QtCore.Signal(int, int)  # written, failed
+
+    def __init__(self, layer_dirs, scale, fmt):
+        super().__init__()
+        self.layer_dirs = layer_dirs
+        self.scale = scale
+        self.fmt = fmt
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        written = failed = 0
+        try:
+            written, failed = proxies.generate_proxies(
+                self.layer_dirs, self.scale, self.fmt,
+                cancel_event=self.cancel_event,
+                progress=lambda done, total, layer: self.progress.emit(done, total, layer))
+        except Exception as e:
+            print("Proxy generation error:", e)
+        finally:
+            self.finished_generating.emit(written, failed)
+
+class RenderThumbnailLoader(QtCore.QThread):
+    thumbnail_ready = QtCore.Signal(str, object)  # layer path, uint8 tile
+
+    def __init__(self, root, jobs, size=(64, 36)):
+        super().__init__()
+        self.root = root
+        self.jobs = jobs  # [(layer_path, frame_path)]
+        self.size = size
+
+    def run(self):
+        try:
+            thumbs = atlas.open_atlas(self.root, self.size)
+        except Exception as e:
+            print(f"Could not open thumbnail atlas for {self.root}: {e}")
+            return
+        for layer_path, frame_path in self.jobs:
+            try:
+                path = proxies.proxy_for_frame(layer_path, os.path.basename(frame_path)) or frame_path
+                tile, _ = thumbs.get_or_build(path)
+                if tile is not None:
+                    self.thumbnail_ready.emit(layer_path, tile)
+            except Exception as e:
+                print(f"Render thumbnail failed for {frame_path}: {e}")
+
+
+class ContactSheetBuilder(QtCore.QThread):
+    progress = QtCore.Signal(int, int)
+    sheet_ready = QtCore.Signal(str)
+    failed = QtCore.Signal(str)
+
+    def __init__(self, version_dir, frames_per_layer):
+        super().__init__()
+        self.version_dir = version_dir
+        self.frames_per_layer = frames_per_layer
+
+    def run(self):
+        try:
+            mosaic, cells = contact_sheet.build_contact_sheet(
+                self.version_dir, self.frames_per_layer,
+                progress=lambda done, total: self.progress.emit(done, total))
+            if mosaic is None:
+                self.failed.emit(f"No image sequences found in:\n{self.version_dir}")
+                return
+            h, w = mosaic.shape[:2]
+            image = QtGui.QImage(mosaic.data, w, h, w * 3, QtGui.QImage.Format_RGB888).copy()
+            # QPainter on a QImage is safe outside the GUI thread
+            painter = QtGui.QPainter(image)
+            painter.setFont(QtGui.QFont("Segoe UI", 9))
+            for label, x, y in cells:
+                painter.setPen(QtGui.QColor(0, 0, 0))
+                painter.drawText(x + 7, y + 17, label)
+                painter.setPen(QtGui.QColor("white"))
+                painter.drawText(x + 6, y + 16, label)
+            painter.end()
+
+            path = contact_sheet.sheet_path(self.version_dir)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if not image.save(path, "JPG", 92):
+                self.failed.emit(f"Could not write:\n{path}")
+                return
+            self.sheet_ready.emit(path)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+class RenderDiffWorker(QtCore.QThread):
+    progress = QtCore.Signal(str, int, int)  # layer, done, total
+    layer_done = QtCore.Signal(str, object, object, object)  # layer, [FrameDiff], worst frame, heat rgb
+    finished_diff = QtCore.Signal()
+
+    def __init__(self, version_a, version_b):
+        super().__init__()
+        self.version_a = version_a
+        self.version_b = version_b
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            for layer, seq_a, seq_b, frames in render_diff.match_layers(self.version_a, self.version_b):
+                if self.cancel_event.is_set():
+                    break
+                results, worst, heat = render_diff.diff_layer(
+                    seq_a, seq_b, frames, cancel_event=self.cancel_event,
+                    progress=lambda done, total, l=layer: self.progress.emit(l, done, total))
+                heat_rgb = render_diff.heatmap_rgb(heat) if heat is not None else None
+                self.layer_done.emit(layer, results, worst, heat_rgb)
+        except Exception as e:
+            print("Render diff error:", e)
+        finally:
+            self.finished_diff.emit()
+
+
+class FrameChangeGraph(QtWidgets.QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumHeight(140)
+        self.results = []
+
+    def set_results(self, results):
+        self.results = results
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QtGui.QPainter(self)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.fillRect(self.rect(), QtGui.QColor("#222222"))
+        if not self.results:
+            painter.setPen(QtGui.QColor("gray"))
+            painter.drawText(self.rect(), QtCore.Qt.AlignCenter, "Select a layer")
+            return
+
+        rect = self.rect().adjusted(36, 10, -10, -20)
+        peak = max(r.max_abs for r in self.results) or 1.0
+        first, last = self.results[0].frame, self.results[-1].frame
+        span = max(1, last - first)
+
+        def point(frame, value):
+            x = rect.left() + (frame - first) / span * rect.width()
+            y = rect.bottom() - value / peak * rect.height()
+            return QtCore.QPointF(x, y)
+
+        painter.setPen(QtGui.QColor("#555555"))
+        painter.drawRect(rect)
+        painter.drawText(4, rect.top() + 10, f"{peak:.3f}")
+        painter.drawText(rect.left(), self.height() - 4, str(first))
+        painter.drawText(rect.right() - 30, self.height() - 4, str(last))
+
+        for attr, colour in (("max_abs", "#FFDAB3"), ("mean", "#4FC3F7")):
+            path = QtGui.QPainterPath(point(self.results[0].frame, getattr(self.results[0], attr)))
+            for r in self.results[1:]:
+                path.lineTo(point(r.frame, getattr(r, attr)))
+            painter.setPen(QtGui.QPen(QtGui.QColor(colour), 1.5))
+            painter.drawPath(path)
+
+
+class RenderDiffDialog(QtWidgets.QDialog):
+    def __init__(self, render_dir, version_a=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Render Version Diff")
+        self.resize(820, 520)
+        self.render_dir = render_dir
+        self.layer_results = {}
+        self.worker = None
+
+        versions = sorted(f for f in os.listdir(render_dir)
+                          if f.lower().startswith("v") and os.path.isdir(os.path.join(render_dir, f)))
+        self.version_a = QtWidgets.QComboBox()
+        self.version_b = QtWidgets.QComboBox()
+        self.version_a.addItems(versions)
+        self.version_b.addItems(versions)
+        if version_a in versions:
+            self.version_a.setCurrentText(version_a)
+            idx = versions.index(version_a)
+            self.version_b.setCurrentIndex(min(idx + 1, len(versions) - 1))
+        elif len(versions) > 1:
+            self.version_a.setCurrentIndex(len(versions) - 2)
+            self.version_b.setCurrentIndex(len(versions) - 1)
+
+        self.run_btn = QtWidgets.QPushButton("Compare")
+        self.run_btn.clicked.connect(self.start_diff)
+        self.progress = QtWidgets.QProgressBar()
+        self.progress.setFixedHeight(16)
+
+        top = QtWidgets.QHBoxLayout()
+        top.addWidget(QLabel("A:"))
+        top.addWidget(self.version_a)
+        top.addWidget(QLabel("B:"))
+        top.addWidget(self.version_b)
+        top.addWidget(self.run_btn)
+        top.addWidget(self.progress, 1)
+
+        self.layer_list = QtWidgets.QListWidget()
+        self.layer_list.currentItemChanged.connect(self.show_layer)
+        self.graph = FrameChangeGraph()
+        self.heatmap_label = QLabel()
+        self.heatmap_label.setAlignment(QtCore.Qt.AlignCenter)
+        self.heatmap_label.setMinimumSize(*render_diff.HEATMAP_SIZE)
+        self.summary_label = QLabel()
+
+        right = QtWidgets.QVBoxLayout()
+        right.addWidget(QLabel("Per-frame change (max abs / mean)"))
+        right.addWidget(self.graph, 1)
+        right.addWidget(self.heatmap_label)
+        right.addWidget(self.summary_label)
+
+        body = QtWidgets.QHBoxLayout()
+        body.addWidget(self.layer_list, 1)
+        body.addLayout(right, 2)
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.addLayout(top)
+        layout.addLayout(body)
+
+    def start_diff(self):
+        if self.worker and self.worker.isRunning():
+            self.worker.cancel()
+            return
+        a, b = self.version_a.currentText(), self.version_b.currentText()
+        if not a or not b or a == b:
+            QMessageBox.warning(self, "Render Diff", "Pick two different versions.")
+            return
+        self.layer_list.clear()
+        self.layer_results.clear()
+        self.graph.set_results([])
+        self.heatmap_label.clear()
+        self.summary_label.clear()
+
+        self.worker = RenderDiffWorker(os.path.join(self.render_dir, a), os.path.join(self.render_dir, b))
+        self.worker.progress.connect(self._diff_progress)
+        self.worker.layer_done.connect(self._layer_done)
+        self.worker.finished_diff.connect(self._diff_finished)
+        self.run_btn.setText("Cancel")
+        self.worker.start()
+
+    def _diff_progress(self, layer, done, total):
+        self.progress.setRange(0, total)
+        self.progress.setValue(done)
+        self.progress.setFormat(f"{layer}  %v/%m")
+
+    def _layer_done(self, layer, results, worst, heat_rgb):
+        self.layer_results[layer] = (results, worst, heat_rgb)
+        changed = sum(1 for r in results if r.max_abs > 0)
+        item = QtWidgets.QListWidgetItem(f"{layer}  ({changed}/{len(results)} changed)")
+        item.setData(QtCore.Qt.UserRole, layer)
+        if changed:
+            item.setForeground(QtGui.QColor("#FFDAB3"))
+        self.layer_list.addItem(item)
+        if self.layer_list.count() == 1:
+            self.layer_list.setCurrentItem(item)
+
+    def _diff_finished(self):
+        self.run_btn.setText("Compare")
+        self.progress.setFormat("Done")
+
+    def show_layer(self, item, _previous=None):
+        if not item:
+            return
+        results, worst, heat_rgb = self.layer_results[item.data(QtCore.Qt.UserRole)]
+        self.graph.set_results(results)
+        if heat_rgb is not None:
+            h, w = heat_rgb.shape[:2]
+            image = QtGui.QImage(heat_rgb.data, w, h, w * 3, QtGui.QImage.Format_RGB888).copy()
+            self.heatmap_label.setPixmap(QtGui.QPixmap.fromImage(image).scaled(
+                *render_diff.HEATMAP_SIZE, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation))
+        if results:
+            finite = [r.psnr for r in results if r.psnr != float("inf")]
+            min_psnr = f"{min(finite):.1f} dB" if finite else "identical"
+            self.summary_label.setText(
+                f"Largest change at frame {worst}  |  max abs {max(r.max_abs for r in results):.4f}"
+                f"  |  lowest PSNR {min_psnr}")
+
+    def closeEvent(self, event):
+        if self.worker and self.worker.isRunning():
+            self.worker.cancel()
+            self.worker.wait()
+        super().closeEvent(event)
+
+class FlipbookStorageWorker(QtCore.QThread):
+    scanned = QtCore.Signal(object, int)  # [VersionUsage], mp4 bytes
+    progress = QtCore.Signal(int, int, str)  # done, total, version
+    deleted = QtCore.Signal(int, object)  # freed bytes, [(version, error)]
+    scan_failed = QtCore.Signal(str)
+
+    def __init__(self, root, to_delete=None):
+        super().__init__()
+        self.root = root
+        self.to_delete = to_delete
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        if self.to_delete is None:
+            try:
+                self.scanned.emit(*flipbook_storage.scan(self.root))
+            except Exception as e:
+                print("Flipbook storage scan error:", e)
+                self.scan_failed.emit(str(e))
+            return
+        try:
+            freed, errors = flipbook_storage.delete_frames(
+                self.to_delete, cancel_event=self.cancel_event,
+                progress=lambda done, total, name: self.progress.emit(done, total, name))
+            self.deleted.emit(freed, errors)
+        except Exception as e:
+            print("Flipbook storage error:", e)
+            self.deleted.emit(0, [("", str(e))])
+
+class FlipbookStorageDialog(QtWidgets.QDialog):
+    COLUMNS = ["Version", "Frames", "Frame Size", "Other", "MP4", "Status"]
+
+    def __init__(self, root, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Flipbook Storage")
+        self.resize(720, 460)
+        self.root = root
+        self.versions = []
+        self.plan = []
+        self.mp4_bytes = 0
+        self.worker = None
+
+        self.keep_spin = QtWidgets.QSpinBox()
+        self.keep_spin.setRange(0, 99)
+        self.keep_spin.setValue(flipbook_storage.DEFAULT_KEEP_LAST)
+        self.keep_spin.setToolTip("Frames of the newest versions are always kept")
+        self.keep_spin.valueChanged.connect(self.update_plan)
+        self.clean_btn = QtWidgets.QPushButton("Delete Frames")
+        self.clean_btn.clicked.connect(self.start_cleanup)
+        self.clean_btn.setEnabled(False)
+        self.progress = QtWidgets.QProgressBar()
+        self.progress.setFixedHeight(16)
+
+        top = QtWidgets.QHBoxLayout()
+        top.addWidget(QLabel("Keep frames of last"))
+        top.addWidget(self.keep_spin)
+        top.addWidget(QLabel("versions"))
+        top.addWidget(self.clean_btn)
+        top.addWidget(self.progress, 1)
+
+        self.table = QtWidgets.QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.summary_label = QLabel("Scanning...")
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.addLayout(top)
+        layout.addWidget(self.table)
+        layout.addWidget(self.summary_label)
+
+        self.worker = FlipbookStorageWorker(root)
+        self.worker.scanned.connect(self._scanned)
+        self.worker.scan_failed.connect(lambda error: self.summary_label.setText(f"Scan failed: {error}"))
+        self.worker.start()
+
+    def _scanned(self, versions, mp4_bytes):
+        self.versions = versions
+        self.mp4_bytes = mp4_bytes
+        self.update_plan()
+
+    def update_plan(self):
+        self.plan = flipbook_storage.plan_cleanup(self.versions, self.keep_spin.value())
+        doomed = set(v.name for v in self.plan)
+        kept = set(v.name for v in self.versions[-self.keep_spin.value():]) if self.keep_spin.value() else set()
+        fmt = flipbook_storage.format_bytes
+
+        self.table.setRowCount(len(self.versions))
+        for row, usage in enumerate(reversed(self.versions)):
+            if usage.name in doomed:
+                status, color = "Frames will be deleted", "#FFDAB3"
+            elif not usage.frames:
+                status, color = "Frames deleted", "#888888"
+            elif usage.name in kept:
+                status, color = "Kept (recent)", None
+            elif not usage.verified:
+                status, color = "Kept (no verified MP4)", "#FF8080"
+            else:
+                status, color = "Kept", None
+            values = [usage.name, str(len(usage.frames)), fmt(usage.frame_bytes), fmt(usage.other_bytes),
+                      fmt(usage.mp4_bytes) if usage.mp4 else "-", status]
+            for col, value in enumerate(values):
+                item = QtWidgets.QTableWidgetItem(value)
+                if color:
+                    item.setForeground(QtGui.QColor(color))
+                self.table.setItem(row, col, item)
+        self.table.resizeColumnsToContents()
+
+        frame_bytes = sum(v.frame_bytes for v in self.versions)
+        freeable = sum(v.frame_bytes for v in self.plan)
+        self.summary_label.setText(
+            f"{len(self.versions)} versions  |  frames {fmt(frame_bytes)}  |  MP4s {fmt(self.mp4_bytes)}"
+            f"  |  {fmt(freeable)} can be freed")
+        self.clean_btn.setEnabled(bool(self.plan))
+        self.clean_btn.setText(f"Delete Frames of {len(self.plan)} Versions" if self.plan else "Delete Frames")
+
+    def start_cleanup(self):
+        if not self.plan:
+            return
+        freeable = flipbook_storage.format_bytes(sum(v.frame_bytes for v in self.plan))
+        names = ", ".join(v.name for v in self.plan)
+        if QMessageBox.question(self, "Delete Flipbook Frames",
+                                f"Delete the frames of {names} ({freeable})?\nTheir MP4s are kept.",
+                                QMessageBox.Yes | QMessageBox.No) != QMessageBox.Yes:
+            return
+        # Deletes exactly what this scan found, no second walk of the tree
+        self.worker = FlipbookStorageWorker(self.root, to_delete=list(self.plan))
+        self.worker.progress.connect(self._delete_progress)
+        self.worker.deleted.connect(self._deleted)
+        self.clean_btn.setEnabled(False)
+        self.keep_spin.setEnabled(False)
+        self.worker.start()
+
+    def _delete_progress(self, done, total, name):
+        self.progress.setRange(0, total)
+        self.progress.setValue(done)
+        self.progress.setFormat(f"{name}  %v/%m")
+
+    def _deleted(self, freed, errors):
+        self.progress.setFormat(f"Freed {flipbook_storage.format_bytes(freed)}")
+        self.keep_spin.setEnabled(True)
+        self.worker.wait()
+        self.update_plan()
+        if errors:
+            QMessageBox.warning(self, "Flipbook Storage",
+                                "Some files could not be deleted:\n" + "\n".join(f"{v}: {e}" for v, e in errors[:10]))
+
+    def closeEvent(self, event):
+        if self.worker and self.worker.isRunning():
+            self.worker.cancel()
+            self.worker.wait()
+        super().closeEvent(event)
 
 def get_default_base_path():
     return r"\\spdata\PROJECTS_TEMP"
@@ -384,6 +837,7 @@ class HoudiniManager(QtWidgets.QMainWindow):
         self.exr_list.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
         self.exr_list.customContextMenuRequested.connect(self.show_flipbook_context)
         self.exr_list.itemDoubleClicked.connect(self.open_in_mplay)
+        self.exr_scrubber = FilmstripScrubber(self.exr_list)
 
         refresh_btn = QtWidgets.QPushButton("🔄 Refresh")
         refresh_btn.clicked.connect(self.refresh_exr_thumbnails)
@@ -391,9 +845,13 @@ class HoudiniManager(QtWidgets.QMainWindow):
         mp4_btn = QtWidgets.QPushButton("🎞️ Open MP4 Folder")
         mp4_btn.clicked.connect(self.open_mp4_folder)
 
+        storage_btn = QtWidgets.QPushButton("💾 Storage")
+        storage_btn.clicked.connect(self.open_flipbook_storage)
+
         btn_row = QtWidgets.QHBoxLayout()
         btn_row.addWidget(refresh_btn)
         btn_row.addWidget(mp4_btn)
+        btn_row.addWidget(storage_btn)
         btn_row.addStretch()
 
         layout = QtWidgets.QVBoxLayout()
@@ -408,80 +866,83 @@ class HoudiniManager(QtWidgets.QMainWindow):
         self.exr_list.clear()
         self.exr_folders = []
         self.exr_items = {}
-        self.exr_index = 0
+        self.exr_meta = {}
+        if not hasattr(self, "flipbook_thumbnails"):
+            self.flipbook_thumbnails = FlipbookThumbnailService(parent=self)
+            self.flipbook_thumbnails.thumbnails_ready.connect(self._apply_exr_thumbnails)
+            self.flipbook_thumbnails.filmstrips_ready.connect(self._apply_exr_filmstrips)
+        self.flipbook_thumbnails.cancel()
+        self.exr_scrubber.clear()
 
         flipbook_root = os.path.normpath(hou.expandString("$HIP/Flipbooks"))
         if not os.path.exists(flipbook_root):
             return
+        self.flipbook_thumbnails.set_root(flipbook_root)
 
         for name in sorted(os.listdir(flipbook_root)):
             folder = os.path.join(flipbook_root, name)
             if not os.path.isdir(folder):
                 continue
-            exrs = sorted([f for f in os.listdir(folder) if f.lower().endswith(".exr")])
-            if not exrs:
+            meta = flipbook_meta.read_sidecar(folder)
+            if meta:
+                exr_paths = flipbook_meta.frame_paths(folder, meta)
+                self.exr_meta[folder] = meta
+            else:
+                exr_paths = [os.path.join(folder, f) for f in sorted(os.listdir(folder)) if f.lower().endswith(".exr")]
+            if not exr_paths:
                 continue
 
-            exr_paths = [os.path.join(folder, f) for f in exrs]
             self.exr_folders.append((name, folder, exr_paths))
 
             placeholder = QtGui.QPixmap(160, 90)
             placeholder.fill(QtGui.QColor("#2a2a2a"))
             item = QtWidgets.QListWidgetItem(QtGui.QIcon(placeholder), name)
             item.setData(QtCore.Qt.UserRole, exr_paths)
+            if meta:
+                resx, resy = meta["resolution"]
+                start, end = meta["frame_range"]
+                item.setToolTip(f"{resx}x{resy}  {start}-{end}\n{meta.get('camera', '')}")
             self.exr_list.addItem(item)
             self.exr_items[folder] = item
 
-        self.thumb_timer = QtCore.QTimer()
-        self.thumb_timer.timeout.connect(self.load_next_exr_thumbnail)
-        self.thumb_timer.start(60)
-
-    def load_next_exr_thumbnail(self):
-        if self.exr_index >= len(self.exr_folders):
-            self.thumb_timer.stop()
+        if not HAS_OIIO:
             return
+        for name, folder, exr_paths in self.exr_folders:
+            meta = self.exr_meta.get(folder)
+            if meta:
+                self.flipbook_thumbnails.request(folder, exr_paths[0], meta["frame_range"], meta["resolution"])
+            else:
+                self.flipbook_thumbnails.request(folder, exr_paths[0], frame_range_from_names(exr_paths))
+        for name, folder, exr_paths in self.exr_folders:
+            self.flipbook_thumbnails.request_filmstrip(folder, folder, exr_paths)
 
-        name, folder, exr_paths = self.exr_folders[self.exr_index]
-        thumb = self.load_exr_thumbnail(exr_paths[0])
-        if thumb:
-            self.exr_items[folder].setIcon(QtGui.QIcon(thumb))
-        self.exr_index += 1
-
-    def load_exr_thumbnail(self, path, size=(160, 90)):
-        if not HAS_OIIO:
-            return None
+    def _apply_exr_thumbnails(self, batch):
+        self.exr_list.setUpdatesEnabled(False)
         try:
-            inp = oiio.ImageInput.open(path)
-            if not inp:
-                return None
-            spec = inp.spec()
-            pixels = inp.read_image(format=oiio.FLOAT)
-            inp.close()
-
-            if pixels is None:
-                return None
-
-            w, h, c = spec.width, spec.height, spec.nchannels
-            pixels = (pixels * 255).clip(0, 255).astype(np.uint8)
-
-            if c == 3:
-                img = pixels.reshape(h, w, 3)
-                fmt = QtGui.QImage.Format_RGB888
-            elif c >= 4:
-                img = pixels.reshape(h, w, c)[:, :, :4]
-                fmt = QtGui.QImage.Format_RGBA8888
-            else:
-                return None
+            for folder, image in batch:
+                item = self.exr_items.get(folder)
+                if item:
+                    self.exr_scrubber.rest_icon(item, QtGui.QIcon(QtGui.QPixmap.fromImage(image)))
+        finally:
+            self.exr_list.setUpdatesEnabled(True)
 
-            qimg = QtGui.QImage(img.data, w, h, w * img.shape[2], fmt)
-            return QtGui.QPixmap.fromImage(qimg).scaled(*size, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
-        except Exception as e:
-            print(f"Thumbnail load failed for {path}: {e}")
-            return None
+    def _apply_exr_filmstrips(self, batch):
+        for folder, strip in batch:
+            item = self.exr_items.get(folder)
+            if item:
+                self.exr_scrubber.set_strip(item, strip)
 
     def open_in_mplay(self, item):
         exr_sequence = item.data(QtCore.Qt.UserRole)
-        if exr_sequence:
+        if not exr_sequence:
+            return
+        folder = os.path.dirname(exr_sequence[0])
+        meta = getattr(self, "exr_meta", {}).get(folder)
+        if meta and not flipbook_meta.is_partial(meta):
+            start, end = meta["frame_range"]
+            sequence = flipbook_meta.houdini_pattern(folder, meta)
+            subprocess.Popen(["mplay", "-f", str(start), str(end), "1", sequence])
+        else:
             subprocess.Popen(["mplay"] + exr_sequence)
 
     def open_mp4_folder(self):
@@ -497,6 +958,15 @@ class HoudiniManager(QtWidgets.QMainWindow):
         except Exception as e:
             print(f"Failed to open MP4 folder: {e}")
 
+    def open_flipbook_storage(self):
+        root = os.path.normpath(hou.expandString("$HIP/Flipbooks"))
+        if not os.path.isdir(root):
+            QMessageBox.information(self, "Flipbook Storage", "No Flipbooks folder in $HIP yet.")
+            return
+        dialog = FlipbookStorageDialog(root, parent=self)
+        dialog.finished.connect(lambda _: self.refresh_exr_thumbnails())
+        dialog.show()
+
     def show_flipbook_context(self, pos):
         items = self.exr_list.selectedItems()
         if not items:
@@ -881,11 +1351,13 @@ class HoudiniManager(QtWidgets.QMainWindow):
    # ========== RENDER PAGE ==========
     def create_render_page(self):
         self.render_table = QtWidgets.QTableWidget()
-        self.render_table.setColumnCount(7)
+        self.render_table.setColumnCount(8)
         self.render_table.setHorizontalHeaderLabels([
             "Render Layer", "Frame Range", "Frame Count", "Resolution",
-            "Version", "Date & Time", "User"
+            "Version", "Date & Time", "User", "Health"
         ])
+        self.render_table.setIconSize(QtCore.QSize(64, 36))
+        self.render_table.verticalHeader().setDefaultSectionSize(40)
         self.render_table.horizontalHeader().setStretchLastSection(True)
         self.render_table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
         self.render_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
@@ -893,9 +1365,53 @@ class HoudiniManager(QtWidgets.QMainWindow):
         self.render_table.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
         self.render_table.customContextMenuRequested.connect(self.show_render_context_menu)
         self.render_table.cellDoubleClicked.connect(self.handle_render_double_click)
+        self.render_thumb_loaders = []
+        self.watched_render_versions = set()
+        self.render_poller = render_watch.DirectoryPoller()
+        self._render_idle_polls = 0
+        self.render_watch_timer = QtCore.QTimer()
+        self.render_watch_timer.timeout.connect(self._poll_render_watch)
+        self.render_watch_label = QLabel("")
         QtCore.QTimer.singleShot(300, self.populate_render_table)
+
+        # Proxy generation row
+        self.proxy_scale_combo = QtWidgets.QComboBox()
+        self.proxy_scale_combo.addItem("Half Res", "half")
+        self.proxy_scale_combo.addItem("Quarter Res", "quarter")
+        self.proxy_format_combo = QtWidgets.QComboBox()
+        self.proxy_format_combo.addItem("JPEG", ".jpg")
+        self.proxy_format_combo.addItem("PNG", ".png")
+        self.proxy_btn = QtWidgets.QPushButton("🧩 Generate Proxies")
+        self.proxy_btn.setToolTip("Build proxies for the selected layers (all layers if none selected)")
+        self.proxy_btn.clicked.connect(lambda: self.generate_render_proxies())
+        self.proxy_cancel_btn = QtWidgets.QPushButton("✖ Cancel")
+        self.proxy_cancel_btn.setEnabled(False)
+        self.proxy_cancel_btn.clicked.connect(self.cancel_render_proxies)
+        self.proxy_progress = QtWidgets.QProgressBar()
+        self.proxy_progress.setFixedHeight(16)
+        self.proxy_progress.setVisible(False)
+
+        proxy_row = QtWidgets.QHBoxLayout()
+        proxy_row.addWidget(QLabel("Proxies:"))
+        proxy_row.addWidget(self.proxy_scale_combo)
+        proxy_row.addWidget(self.proxy_format_combo)
+        proxy_row.addWidget(self.proxy_btn)
+        proxy_row.addWidget(self.proxy_cancel_btn)
+        proxy_row.addWidget(self.proxy_progress, 1)
+        proxy_row.addStretch()
+        self.contact_sheet_btn = QtWidgets.QPushButton("🗂 Contact Sheet")
+        self.contact_sheet_btn.setToolTip("Tile every layer of the selected version into one image")
+        self.contact_sheet_btn.clicked.connect(lambda: self.build_contact_sheet())
+        proxy_row.addWidget(self.contact_sheet_btn)
+        diff_btn = QtWidgets.QPushButton("🔍 Diff Versions")
+        diff_btn.setToolTip("Compare matching layers and frames of two render versions")
+        diff_btn.clicked.connect(lambda: self.open_render_diff())
+        proxy_row.addWidget(diff_btn)
+
         layout = QtWidgets.QVBoxLayout()
+        layout.addLayout(proxy_row)
         layout.addWidget(self.render_table)
+        layout.addWidget(self.render_watch_label)
         widget = QtWidgets.QWidget()
         widget.setLayout(layout)
         return widget
@@ -908,7 +1424,7 @@ class HoudiniManager(QtWidgets.QMainWindow):
             if not os.path.exists(render_dir):
                 return
             version_folders = sorted([f for f in os.listdir(render_dir) if f.lower().startswith('v') and os.path.isdir(os.path.join(render_dir, f))])
-            row = 0
+            thumbnails = []
             for i, version in enumerate(version_folders):
                 version_path = os.path.join(render_dir, version)
                 layer_folders = sorted(os.listdir(version_path))
@@ -917,52 +1433,160 @@ class HoudiniManager(QtWidgets.QMainWindow):
                     layer_path = os.path.join(version_path, layer)
                     if not os.path.isdir(layer_path):
                         continue
-                    exr_files = [f for f in os.listdir(layer_path) if os.path.splitext(f)[1].lower() in (".exr", ".jpg", ".jpeg", ".png", ".dpx", ".tif", ".tiff")]
-                    if not exr_files:
+                    summary = render_watch.layer_summary(layer_path)
+                    if not summary:
                         continue
-                    exr_files.sort()
-                    pattern = re.compile(r"^(.*?)(\d+)\.[^.]+$")
-                    matches = [pattern.match(f) for f in exr_files]
-                    frame_range = ""
-                    if matches and all(matches):
-                        start = int(matches[0].group(2))
-                        end = int(matches[-1].group(2))
-                        frame_range = f"{start}-{end}"
-                    else:
-                        frame_range = f"1-{len(exr_files)}"
-                    resolution = "Unknown"
-                    try:
-                        if HAS_OIIO:
-                            img = oiio.ImageInput.open(os.path.join(layer_path, exr_files[0]))
-                            if img:
-                                spec = img.spec()
-                                resolution = f"{spec.width}x{spec.height}"
-                                img.close()
-                    except Exception:
-                        resolution = "Unknown"
-                    modified_time = os.path.getmtime(layer_path)
-                    datetime_str = QDateTime.fromSecsSinceEpoch(int(modified_time)).toString("yyyy-MM-dd hh:mm")
-                    user = getpass.getuser()
-                    frame_count = str(len(exr_files))
-                    row_data = [layer, frame_range, frame_count, resolution, version, datetime_str, user]
-                    self.render_table.insertRow(row)
-                    for col, data in enumerate(row_data):
-                        item = QtWidgets.QTableWidgetItem(data)
-                        item.setForeground(text_color)
-                        item.setData(QtCore.Qt.UserRole, layer_path)
-                        if col == 0:
-                            item.setTextAlignment(QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter)
-                        else:
-                            item.setTextAlignment(QtCore.Qt.AlignCenter)
-                        self.render_table.setItem(row, col, item)
-                    row += 1
-            min_widths = [140, 140, 90, 140, 90, 140, 140]
+                    self._add_render_row(self.render_table.rowCount(), layer, version, layer_path, summary, text_color)
+                    if summary.latest:
+                        thumbnails.append((layer_path, summary.latest))
+            min_widths = [140, 140, 90, 140, 90, 140, 140, 100]
             for col, width in enumerate(min_widths):
                 self.render_table.setColumnWidth(col, width)
                 self.render_table.horizontalHeader().setMinimumSectionSize(50)
+            self._rewatch_render_versions()
+            self._load_render_thumbnails(thumbnails)
         except Exception as e:
             print("populate_render_table error:", e)
 
+    def _add_render_row(self, row, layer, version, layer_path, summary, text_color):
+        resolution = "Unknown"
+        try:
+            if HAS_OIIO and summary.latest:
+                img = oiio.ImageInput.open(summary.latest)
+                if img:
+                    spec = img.spec()
+                    resolution = f"{spec.width}x{spec.height}"
+                    img.close()
+        except Exception:
+            resolution = "Unknown"
+        modified_time = os.path.getmtime(layer_path)
+        datetime_str = QDateTime.fromSecsSinceEpoch(int(modified_time)).toString("yyyy-MM-dd hh:mm")
+        user = getpass.getuser()
+        row_data = [layer, summary.frame_range, str(summary.frame_count), resolution, version, datetime_str, user, summary.health]
+        self.render_table.insertRow(row)
+        for col, data in enumerate(row_data):
+            item = QtWidgets.QTableWidgetItem(data)
+            item.setForeground(text_color)
+            item.setData(QtCore.Qt.UserRole, layer_path)
+            if col == 0:
+                item.setTextAlignment(QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter)
+            else:
+                item.setTextAlignment(QtCore.Qt.AlignCenter)
+            self.render_table.setItem(row, col, item)
+        self._set_render_health(row, summary)
+
+    def _set_render_health(self, row, summary):
+        item = self.render_table.item(row, 7)
+        if item:
+            item.setText(summary.health)
+            if summary.health != "OK":
+                item.setForeground(QtGui.QColor("#FF8A80"))
+            else:
+                item.setForeground(self.render_table.item(row, 0).foreground())
+
+    def _render_row_for(self, layer_path):
+        for row in range(self.render_table.rowCount()):
+            item = self.render_table.item(row, 0)
+            if item and item.data(QtCore.Qt.UserRole) == layer_path:
+                return row
+        return -1
+
+    def _load_render_thumbnails(self, jobs):
+        if not jobs or not HAS_OIIO:
+            return
+        render_dir = os.path.join(hou.getenv("HIP") or "", "render")
+        loader = RenderThumbnailLoader(render_dir, jobs)
+        loader.thumbnail_ready.connect(self._set_render_thumbnail)
+        loader.finished.connect(lambda: self.render_thumb_loaders.remove(loader))
+        self.render_thumb_loaders.append(loader)
+        loader.start()
+
+    def _set_render_thumbnail(self, layer_path, tile):
+        row = self._render_row_for(layer_path)
+        if row >= 0:
+            # The tile is a view into the atlas map, the pixmap takes the only copy
+            self.render_table.item(row, 0).setIcon(QtGui.QIcon(QtGui.QPixmap.fromImage(tile_qimage(tile))))
+
+    # ----- Live watch of versions still being written -----
+    def toggle_render_watch(self, version_path):
+        if version_path in self.watched_render_versions:
+            self.watched_render_versions.discard(version_path)
+        else:
+            self.watched_render_versions.add(version_path)
+        self._rewatch_render_versions()
+
+    def _rewatch_render_versions(self):
+        self.render_poller.clear()
+        for version_path in self.watched_render_versions:
+            self.render_poller.add(version_path)
+            for row in range(self.render_table.rowCount()):
+                item = self.render_table.item(row, 0)
+                layer_path = item.data(QtCore.Qt.UserRole) if item else None
+                if layer_path and os.path.dirname(layer_path) == version_path:
+                    summary = render_watch.layer_summary(layer_path)
+                    self.render_poller.add(layer_path, summary.latest if summary else None)
+
+        names = sorted(os.path.basename(v) for v in self.watched_render_versions)
+        self.render_watch_label.setText("👁 Watching: " + ", ".join(names) if names else "")
+        self._render_idle_polls = 0
+        if self.watched_render_versions:
+            self.render_watch_timer.start(RENDER_WATCH_INTERVAL_MS)
+        else:
+            self.render_watch_timer.stop()
+
+    def _poll_render_watch(self):
+        changed = self.render_poller.poll()
+        if not changed:
+            # Back off while the farm is quiet
+            self._render_idle_polls += 1
+            if self._render_idle_polls == 15:
+                self.render_watch_timer.setInterval(RENDER_WATCH_IDLE_MS)
+            return
+        self._render_idle_polls = 0
+        self.render_watch_timer.setInterval(RENDER_WATCH_INTERVAL_MS)
+
+        thumbnails = []
+        for path in changed:
+            if path in self.watched_render_versions:
+                self._add_new_render_layers(path, thumbnails)
+                continue
+            summary = render_watch.layer_summary(path)
+            row = self._render_row_for(path)
+            if not summary or row < 0:
+                continue
+            self.render_poller.set_probe(path, summary.latest)
+            self.render_table.item(row, 1).setText(summary.frame_range)
+            self.render_table.item(row, 2).setText(str(summary.frame_count))
+            modified = QDateTime.fromSecsSinceEpoch(int(os.path.getmtime(path))).toString("yyyy-MM-dd hh:mm")
+            self.render_table.item(row, 5).setText(modified)
+            self._set_render_health(row, summary)
+            if summary.latest:
+                thumbnails.append((path, summary.latest))
+        self._load_render_thumbnails(thumbnails)
+
+    def _add_new_render_layers(self, version_path, thumbnails):
+        version = os.path.basename(version_path)
+        last_row = -1
+        for row in range(self.render_table.rowCount()):
+            item = self.render_table.item(row, 0)
+            if item and os.path.dirname(item.data(QtCore.Qt.UserRole)) == version_path:
+                last_row = row
+        colour = self.render_table.item(last_row, 0).foreground().color() if last_row >= 0 else QtGui.QColor("#FFFFFF")
+        insert_at = last_row + 1 if last_row >= 0 else self.render_table.rowCount()
+        for layer in sorted(os.listdir(version_path)):
+            layer_path = os.path.join(version_path, layer)
+            if not os.path.isdir(layer_path) or self._render_row_for(layer_path) >= 0:
+                continue
+            summary = render_watch.layer_summary(layer_path)
+            # Still watch empty new layers so their first frames show up
+            self.render_poller.add(layer_path, summary.latest if summary else None)
+            if not summary:
+                continue
+            self._add_render_row(insert_at, layer, version, layer_path, summary, colour)
+            insert_at += 1
+            if summary.latest:
+                thumbnails.append((layer_path, summary.latest))
+
     def show_render_context_menu(self, pos):
         index = self.render_table.indexAt(pos)
         if not index.isValid():
@@ -977,8 +1601,125 @@ class HoudiniManager(QtWidgets.QMainWindow):
         menu = QtWidgets.QMenu()
         menu.addAction("📂 Open Folder", lambda: self.open_folder(folder_path))
         menu.addAction("📋 Copy Path", lambda: QtWidgets.QApplication.clipboard().setText(folder_path))
+        menu.addAction("🧩 Generate Proxies", lambda: self.generate_render_proxies([folder_path]))
+        menu.addAction("🗂 Contact Sheet", lambda: self.build_contact_sheet(os.path.dirname(folder_path)))
+        menu.addAction("🔍 Diff Against Next Version",
+                       lambda: self.open_render_diff(os.path.basename(os.path.dirname(folder_path))))
+        version_path = os.path.dirname(folder_path)
+        watching = version_path in self.watched_render_versions
+        menu.addAction(("⏹ Stop Watching " if watching else "👁 Watch ") + os.path.basename(version_path),
+                       lambda: self.toggle_render_watch(version_path))
         menu.addAction("🗑️ Delete", lambda: self.delete_render_folder(row, folder_path))
         menu.exec_(self.render_table.viewport().mapToGlobal(pos))
+
+    def selected_render_layers(self):
+        rows = sorted({index.row() for index in self.render_table.selectionModel().selectedRows()})
+        if not rows:
+            rows = range(self.render_table.rowCount())
+        layers = []
+        for row in rows:
+            item = self.render_table.item(row, 0)
+            if item and item.data(QtCore.Qt.UserRole):
+                layers.append(item.data(QtCore.Qt.UserRole))
+        return layers
+
+    def generate_render_proxies(self, layer_dirs=None):
+        if getattr(self, "proxy_thread", None) and self.proxy_thread.isRunning():
+            return
+        layer_dirs = layer_dirs or self.selected_render_layers()
+        if not layer_dirs:
+            return
+        if not HAS_OIIO:
+            QMessageBox.warning(self, "Proxies", "OpenImageIO is required to build proxies.")
+            return
+
+        self.proxy_thread = ProxyGenerator(
+            layer_dirs, self.proxy_scale_combo.currentData(), self.proxy_format_combo.currentData())
+        self.proxy_thread.progress.connect(self._proxy_progress)
+        self.proxy_thread.finished_generating.connect(self._proxy_finished)
+        self.proxy_progress.setRange(0, 0)
+        self.proxy_progress.setFormat("Scanning...")
+        self.proxy_progress.setVisible(True)
+        self.proxy_btn.setEnabled(False)
+        self.proxy_cancel_btn.setEnabled(True)
+        self.proxy_thread.start()
+
+    def cancel_render_proxies(self):
+        if getattr(self, "proxy_thread", None):
+            self.proxy_thread.cancel()
+            self.proxy_cancel_btn.setEnabled(False)
+            self.proxy_progress.setFormat("Cancelling...")
+
+    def _proxy_progress(self, done, total, layer_path):
+        self.proxy_progress.setRange(0, total)
+        self.proxy_progress.setValue(done)
+        self.proxy_progress.setFormat(f"{os.path.basename(layer_path)}  %v/%m")
+
+    def _proxy_finished(self, written, failed):
+        self.proxy_btn.setEnabled(True)
+        self.proxy_cancel_btn.setEnabled(False)
+        self.proxy_progress.setVisible(False)
+        if failed:
+            QMessageBox.warning(self, "Proxies", f"{written} proxies written, {failed} failed.\nSee the console for details.")
+
+    def build_contact_sheet(self, version_dir=None):
+        if getattr(self, "sheet_thread", None) and self.sheet_thread.isRunning():
+            return
+        if not version_dir:
+            layers = self.selected_render_layers()
+            if not layers:
+                return
+            version_dir = os.path.dirname(layers[0])
+        if not HAS_OIIO:
+            QMessageBox.warning(self, "Contact Sheet", "OpenImageIO is required to build contact sheets.")
+            return
+        frames, ok = QtWidgets.QInputDialog.getInt(
+            self, "Contact Sheet", f"Frames per layer for {os.path.basename(version_dir)}:", 1, 1, 12)
+        if not ok:
+            return
+
+        self.sheet_thread = ContactSheetBuilder(version_dir, frames)
+        self.sheet_thread.progress.connect(self._contact_sheet_progress)
+        self.sheet_thread.sheet_ready.connect(self._contact_sheet_ready)
+        self.sheet_thread.failed.connect(self._contact_sheet_failed)
+        self.contact_sheet_btn.setEnabled(False)
+        self.proxy_progress.setRange(0, 0)
+        self.proxy_progress.setFormat("Contact sheet...")
+        self.proxy_progress.setVisible(True)
+        self.sheet_thread.start()
+
+    def _contact_sheet_progress(self, done, total):
+        self.proxy_progress.setRange(0, total)
+        self.proxy_progress.setValue(done)
+        self.proxy_progress.setFormat("Contact sheet  %v/%m")
+
+    def _contact_sheet_done(self):
+        self.contact_sheet_btn.setEnabled(True)
+        if not (getattr(self, "proxy_thread", None) and self.proxy_thread.isRunning()):
+            self.proxy_progress.setVisible(False)
+
+    def _contact_sheet_ready(self, path):
+        self._contact_sheet_done()
+        try:
+            subprocess.Popen(["mplay", path])
+        except Exception as e:
+            QMessageBox.information(self, "Contact Sheet", f"Saved to:\n{path}\n\nCould not open MPlay: {e}")
+
+    def _contact_sheet_failed(self, message):
+        self._contact_sheet_done()
+        QMessageBox.warning(self, "Contact Sheet", message)
+
+    def open_render_diff(self, version=None):
+        render_dir = os.path.join(hou.getenv("HIP") or "", "render")
+        if not os.path.isdir(render_dir):
+            QMessageBox.warning(self, "Render Diff", f"No render folder found:\n{render_dir}")
+            return
+        if not HAS_OIIO:
+            QMessageBox.warning(self, "Render Diff", "OpenImageIO is required to compare renders.")
+            return
+        self.render_diff_dialog = RenderDiffDialog(render_dir, version, self)
+        self.render_diff_dialog.show()
+
     def handle_render_double_click(self, row, column):
         import re
     
@@ -995,6 +1736,12 @@ class HoudiniManager(QtWidgets.QMainWindow):
             return
     
         try:
+            # Prefer current proxies over the full-resolution frames
+            proxy_seq = proxies.find_proxy_sequence(folder)
+            if proxy_seq:
+                subprocess.Popen(["mplay"] + proxy_seq.mplay_args())
+                return
+
             # Supported image sequence extensions
             extensions = [".exr", ".jpg", ".jpeg", ".png", ".dpx", ".tif", ".tiff"]
             files = sorted(f for f in os.listdir(folder)
@@ -1034,6 +1781,7 @@ class HoudiniManager(QtWidgets.QMainWindow):
         if confirm == QtWidgets.QMessageBox.Yes:
             try:
                 shutil.rmtree(path)
+                self.render_poller.remove(path)
                 self.render_table.removeRow(row)
             except Exception as e:
                 QMessageBox.warning(self, "Delete Failed", str(e))
@@ -1096,19 +1844,14 @@ class HoudiniManager(QtWidgets.QMainWindow):
         left_layout.addLayout(filter_layout)
 
         # Deadline table
-        self.deadline_table = QtWidgets.QTableWidget()
-        self.deadline_table.setColumnCount(14)
-        self.deadline_table.setHorizontalHeaderLabels([
-            "Job Name", "User", "Progress", "Status", "Frames", "Pool",
-            "Priority", "Submitted", "Started", "Completed",
-            "Output Directory", "Output File", "Submitted From", "Job ID"
-        ])
-        self.deadline_table.setSortingEnabled(True)
+        self.deadline_table = QtWidgets.QTableView()
+        self.job_table = JobTable(self.deadline_table)
+        self.job_table.apply_filter(self._job_filter())
         self.deadline_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
         self.deadline_table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
         self.deadline_table.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
         self.deadline_table.customContextMenuRequested.connect(self.show_deadline_context_menu)
-        self.deadline_table.itemSelectionChanged.connect(self._deadline_row_selected)
+        self.deadline_table.selectionModel().selectionChanged.connect(self._deadline_row_selected)
 
         left_layout.addWidget(self.deadline_table)
 
@@ -1140,6 +1883,9 @@ class HoudiniManager(QtWidgets.QMainWindow):
         self.job_info_table.verticalHeader().setVisible(False)
         right_layout.addWidget(self.job_info_table)
 
+        self.job_details = JobDetailFetcher(self)
+        self.job_details.detail_ready.connect(self._show_job_info)
+
         # Layout: left + right
         main = QtWidgets.QHBoxLayout()
         main.addWidget(left, 3)
@@ -1151,6 +1897,12 @@ class HoudiniManager(QtWidgets.QMainWindow):
         # autorefresh timer
         self._deadline_timer = QtCore.QTimer()
         self._deadline_timer.timeout.connect(self.load_deadline_jobs)
+        # Job actions finishing close together share a single refresh
+        self._action_refresh_timer = QtCore.QTimer()
+        self._action_refresh_timer.setSingleShot(True)
+        self._action_refresh_timer.setInterval(200)
+        self._action_refresh_timer.timeout.connect(self.load_deadline_jobs)
+        self.job_action_runners = []
 
         return page
 
@@ -1162,191 +1914,67 @@ class HoudiniManager(QtWidgets.QMainWindow):
             self._deadline_timer.stop()
 
     def load_deadline_jobs(self):
-        # preserve filter text
-        self.saved_filter_text = self.search_bar.text()
-        self.search_bar.blockSignals(True)
-        self.search_bar.clear()
-        # clear table & jobs
-        self.deadline_table.setRowCount(0)
-        self.jobs = []
-        # prepare deadline command
-        deadline_bin_dir = os.getenv("DEADLINE_PATH", r"C:\Program Files\Thinkbox\Deadline10\bin")
-        self.deadline_cmd = os.path.join(deadline_bin_dir, "deadlinecommand")
-        if platform.system() == "Windows" and not self.deadline_cmd.lower().endswith(".exe"):
-            if os.path.isfile(self.deadline_cmd + ".exe"):
-                self.deadline_cmd += ".exe"
+        if getattr(self, "loader_thread", None) is not None and self.loader_thread.isRunning():
+            # the running listing may predate a job action; list again once it is done
+            self.reload_pending = True
+            return
+        self.reload_pending = False
+        # Batches go straight into the table; jobs not seen by the end were removed from Deadline
+        self.loading_seen = set()
         user = self.user_filter.currentText().strip() or getpass.getuser()
         # start loader thread
-        self.loader_thread = DeadlineJobLoader(self.deadline_cmd, user)
-        self.loader_thread.job_loaded.connect(self._store_loaded_job_and_add)
+        self.loader_thread = DeadlineJobLoader(deadline_client.shared_client(), user)
+        self.loader_thread.jobs_loaded.connect(self._add_loaded_jobs)
         self.loader_thread.finished_loading.connect(self._deadline_loader_finished)
+        # finished_loading is emitted from run(), while isRunning() is still True
+        self.loader_thread.finished.connect(self._deadline_loader_stopped)
         self.loader_thread.start()
 
-    def _store_loaded_job_and_add(self, job):
-        # store job
-        if not hasattr(self, "jobs"):
-            self.jobs = []
-        # normalize a few keys
-        jobid = job.get("JobId") or job.get("Id") or job.get("ID") or ""
-        job["__parsed_jobid"] = jobid
-        # parse submit time into QDate for filtering convenience
-        qdate = self._parse_job_submit_date(job.get("JobSubmitDateTime", "") or job.get("JobSubmitDate", ""))
-        job["__submit_qdate"] = qdate
-        self.jobs.append(job)
-        # add immediately (we'll filter later)
-        # but only add if it matches current filters
-        # (apply_deadline_filter will rebuild entire table incrementally)
-        # simply re-apply filter
-        self.apply_deadline_filter()
-
-    def _deadline_loader_finished(self):
-        self.search_bar.blockSignals(False)
-        try:
-            self.search_bar.setText(self.saved_filter_text)
-        except Exception:
-            pass
-        self.apply_deadline_filter()
+    def _add_loaded_jobs(self, batch):
+        # Only new and changed jobs touch the model, so selection and scroll survive
+        jobs = self.job_table.jobs
+        fresh = []
+        for job in batch:
+            jid = deadline_jobs.job_id(job)
+            self.loading_seen.add(jid)
+            if jobs.get(jid) != job:
+                fresh.append(job)
+        if fresh:
+            self.job_table.merge(fresh)
+            self.job_details.note_jobs(fresh)
+
+    def _deadline_loader_finished(self, complete):
+        # A failed or partial listing must not wipe the jobs we already show
+        if complete:
+            gone = [jid for jid in self.job_table.jobs if jid not in self.loading_seen]
+            if gone:
+                self.job_table.merge([], gone)
+                self.job_details.forget(gone)
+
+    def _deadline_loader_stopped(self):
+        if getattr(self, "reload_pending", False):
+            # Qt emits finished just before clearing isRunning(); the wait is over at once
+            self.loader_thread.wait()
+            self.load_deadline_jobs()
 
-    def _parse_job_submit_date(self, val):
-        # Try a few formats: epoch seconds (digits), common ISO, or human readable
-        try:
-            if not val:
-                return None
-            if str(val).isdigit():
-                dt = QDateTime.fromSecsSinceEpoch(int(val))
-                return dt.date()
-            # Try ISO formats
-            for fmt in ("yyyy-MM-dd hh:mm:ss", "yyyy-MM-ddThh:mm:ss", "yyyy-MM-dd hh:mm", "yyyy-MM-dd"):
-                dt = QDateTime.fromString(val, fmt)
-                if dt.isValid():
-                    return dt.date()
-            # try fallback parsing numeric inside string
-            m = re.search(r"(\d{4}-\d{2}-\d{2})", val)
-            if m:
-                dt = QDateTime.fromString(m.group(1), "yyyy-MM-dd")
-                if dt.isValid():
-                    return dt.date()
-        except Exception:
-            pass
-        return None
-
-    def add_deadline_job_row(self, job):
-        row = self.deadline_table.rowCount()
-        self.deadline_table.insertRow(row)
-        name = job.get("Name", "Unknown")
-        user = job.get("UserName", "") or job.get("User", "")
-        status = job.get("Status", "")
-        pool = job.get("Pool", "")
-        priority = str(job.get("Priority", ""))
-        job_id = job.get("__parsed_jobid", "UNKNOWN")
-        # frames parsing
-        raw_frames = job.get("Frames", "")
-        frame_numbers = set()
-        if isinstance(raw_frames, str):
-            parts = re.split(r"[,\s]+", raw_frames.strip())
-            for p in parts:
-                if "-" in p:
-                    try:
-                        a, b = p.split("-", 1)
-                        a_i, b_i = int(a), int(b)
-                        frame_numbers.update(range(a_i, b_i + 1))
-                    except Exception:
-                        pass
-                elif p.isdigit():
-                    frame_numbers.add(int(p))
-        frame_list = sorted(frame_numbers)
-        frame_range = f"{frame_list[0]}-{frame_list[-1]}" if frame_list else ""
-        # times
-        submit_time = job.get("JobSubmitDateTime", "")
-        started_time = job.get("JobStartedDateTime", "")
-        completed_time = job.get("JobCompletedDateTime", "")
-        # outputs
-        output_dirs = job.get("JobOutputDirectories", "")
-        output_files = job.get("JobOutputFileNames", "")
-        submit_machine = job.get("JobSubmitMachine", "")
-        output_dir = output_dirs[0] if isinstance(output_dirs, list) and output_dirs else (output_dirs or "")
-        output_file = output_files[0] if isinstance(output_files, list) and output_files else (output_files or "")
-        # progress
-        try:
-            completed = int(job.get("JobCompletedTasks", 0))
-            total = int(job.get("JobTaskCount", 1))
-            progress = int((completed / total) * 100) if total > 0 else 0
-        except Exception:
-            progress = 0
-        columns = [
-            name, user, None, status, frame_range, pool,
-            priority, submit_time, started_time, completed_time,
-            output_dir, output_file, submit_machine, job_id
-        ]
-        for i, value in enumerate(columns):
-            if i == 2:
-                progress_bar = QtWidgets.QProgressBar()
-                progress_bar.setValue(progress)
-                progress_bar.setAlignment(QtCore.Qt.AlignCenter)
-                progress_bar.setFormat(f"{progress}%")
-                progress_bar.setFixedHeight(16)
-                self.deadline_table.setCellWidget(row, i, progress_bar)
-            else:
-                item = QtWidgets.QTableWidgetItem(value or "")
-                if i == 0:
-                    item.setTextAlignment(QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter)
-                else:
-                    item.setTextAlignment(QtCore.Qt.AlignCenter)
-                item.setData(QtCore.Qt.UserRole, job_id)
-                self.deadline_table.setItem(row, i, item)
+    def _job_filter(self):
+        return deadline_jobs.JobFilter(
+            self.search_bar.text(), self.user_filter.currentText() or "",
+            self.date_start.date().toPython(), self.date_end.date().toPython(), require_date=False)
 
     def apply_deadline_filter(self):
-        # Rebuild table from self.jobs applying search, user, and date filters
-        filter_text = self.search_bar.text().lower().strip()
-        user_filter_text = (self.user_filter.currentText() or "").lower().strip()
-        date_from = self.date_start.date()
-        date_to = self.date_end.date()
-        self.deadline_table.setRowCount(0)
-        for job in getattr(self, "jobs", []):
-            name = (job.get("Name", "") or "").lower()
-            user = (job.get("UserName", "") or job.get("User", "") or "").lower()
-            jobid = (job.get("__parsed_jobid", "") or "").lower()
-            # date filtering: if job has __submit_qdate, filter by range; else accept
-            submit_qdate = job.get("__submit_qdate", None)
-            date_ok = True
-            if submit_qdate and isinstance(submit_qdate, QDate):
-                date_ok = (submit_qdate >= date_from) and (submit_qdate <= date_to)
-            # user filter if set
-            user_ok = True
-            if user_filter_text:
-                user_ok = user_filter_text in user
-            # text filter
-            text_ok = False
-            if not filter_text:
-                text_ok = True
-            else:
-                if filter_text in name or filter_text in user or filter_text in jobid:
-                    text_ok = True
-            if date_ok and user_ok and text_ok:
-                self.add_deadline_job_row(job)
+        # Hides rows that do not match instead of rebuilding the table
+        self.job_table.apply_filter(self._job_filter())
 
     def get_selected_job_ids(self):
-        selected = self.deadline_table.selectionModel().selectedRows()
-        job_ids = set()
-        for row in selected:
-            for col in range(self.deadline_table.columnCount()):
-                item = self.deadline_table.item(row.row(), col)
-                if item and item.data(QtCore.Qt.UserRole):
-                    job_ids.add(item.data(QtCore.Qt.UserRole))
-                    break
-        return list(job_ids)
+        return self.job_table.selected_job_ids()
 
     def show_deadline_context_menu(self, pos):
         index = self.deadline_table.indexAt(pos)
         if not index.isValid():
             return
         self.deadline_table.selectRow(index.row())
-        job_id = None
-        for col in range(self.deadline_table.columnCount()):
-            item = self.deadline_table.item(index.row(), col)
-            if item and item.data(QtCore.Qt.UserRole):
-                job_id = item.data(QtCore.Qt.UserRole)
-                break
+        job_id = self.job_table.job_id_at(index.row())
         if not job_id:
             return
         menu = QtWidgets.QMenu()
@@ -1358,38 +1986,20 @@ class HoudiniManager(QtWidgets.QMainWindow):
         menu.exec_(self.deadline_table.viewport().mapToGlobal(pos))
 
     def _deadline_row_selected(self):
-        # when user selects a row, auto-load job info for convenience
+        # when user selects a row, show its job info; cached, debounced and prefetched around the row
         sels = self.deadline_table.selectionModel().selectedRows()
         if not sels:
             return
         row = sels[0].row()
-        job_id = None
-        for col in range(self.deadline_table.columnCount()):
-            item = self.deadline_table.item(row, col)
-            if item and item.data(QtCore.Qt.UserRole):
-                job_id = item.data(QtCore.Qt.UserRole)
-                break
+        job_id = self.job_table.job_id_at(row)
         if job_id:
-            # fetch job info asynchronously to avoid blocking UI
-            QtCore.QTimer.singleShot(10, lambda jid=job_id: self.fetch_and_show_job_info(jid))
+            self.job_details.request(job_id, self.job_table.neighbour_ids(row, JobDetailFetcher.PREFETCH_ROWS))
 
     def fetch_and_show_job_info(self, job_id):
+        self.job_details.request(job_id, immediate=True)
+
+    def _show_job_info(self, job_id, parsed):
         try:
-            if not hasattr(self, "deadline_cmd") or not self.deadline_cmd:
-                deadline_bin_dir = os.getenv("DEADLINE_PATH", r"C:\Program Files\Thinkbox\Deadline10\bin")
-                self.deadline_cmd = os.path.join(deadline_bin_dir, "deadlinecommand")
-                if platform.system() == "Windows" and os.path.isfile(self.deadline_cmd + ".exe"):
-                    self.deadline_cmd += ".exe"
-            result = subprocess.run([self.deadline_cmd, "GetJob", job_id], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            out = result.stdout.strip()
-            if not out:
-                out = result.stderr.strip()
-            parsed = {}
-            for line in out.splitlines():
-                if "=" in line:
-                    k, v = line.split("=", 1)
-                    parsed[k.strip()] = v.strip()
-            # show in job_info_table
             self.job_info_table.setRowCount(0)
             for i, (k, v) in enumerate(sorted(parsed.items())):
                 self.job_info_table.insertRow(i)
@@ -1403,29 +2013,49 @@ class HoudiniManager(QtWidgets.QMainWindow):
             print("fetch job info error:", e)
 
     def suspend_selected_jobs(self):
-        for job_id in self.get_selected_job_ids():
-            self.run_deadline_command("SuspendJob", job_id)
-        QtCore.QTimer.singleShot(200, self.load_deadline_jobs)
+        self.run_deadline_command("SuspendJob", self.get_selected_job_ids())
 
     def resume_selected_jobs(self):
-        for job_id in self.get_selected_job_ids():
-            self.run_deadline_command("ResumeJob", job_id)
-        QtCore.QTimer.singleShot(200, self.load_deadline_jobs)
+        self.run_deadline_command("ResumeJob", self.get_selected_job_ids())
 
     def delete_selected_jobs(self):
-        for job_id in self.get_selected_job_ids():
-            self.run_deadline_command("DeleteJob", job_id)
-        QtCore.QTimer.singleShot(200, self.load_deadline_jobs)
+        self.run_deadline_command("DeleteJob", self.get_selected_job_ids())
 
-    def run_deadline_command(self, command, job_id):
-        try:
-            result = subprocess.run([self.deadline_cmd, command, job_id], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            if result.returncode != 0:
-                print(f"{command} failed for job {job_id}: {result.stderr.strip()}")
-            else:
-                print(f"{command} succeeded for job {job_id}")
-        except Exception as e:
-            print(f"Error running {command} for job {job_id}: {e}")
+    def run_deadline_command(self, command, job_ids):
+        if not job_ids:
+            return
+        runner = JobActionRunner(deadline_client.shared_client(), command, job_ids)
+        runner.job_done.connect(lambda jid, success, msg, cmd=command: self._job_command_done(cmd, jid, success, msg))
+        runner.finished_running.connect(self._job_command_finished)
+        runner.finished.connect(lambda: self._job_action_cleanup(runner))
+        self.job_action_runners.append(runner)
+        runner.start()
+
+    def _job_command_done(self, command, job_id, success, message):
+        if success:
+            print(f"{command} succeeded for job {job_id}")
+        else:
+            print(f"{command} failed for job {job_id}: {message}")
+
+    def _job_command_finished(self, command, results):
+        if command == "DeleteJob":
+            # drop deleted rows now instead of waiting for the refresh
+            deleted = [jid for jid, (success, _) in results.items() if success]
+            self.job_table.merge([], deleted)
+            self.job_details.forget(deleted)
+        # one refresh for the whole action, however many jobs it touched
+        self._action_refresh_timer.start()
+        failed = [(jid, msg) for jid, (success, msg) in results.items() if not success]
+        if failed:
+            lines = [f"{jid}: {msg or 'Unknown error'}" for jid, msg in failed[:20]]
+            if len(failed) > 20:
+                lines.append(f"... and {len(failed) - 20} more")
+            QMessageBox.warning(self, f"{command} failed",
+                                f"{len(failed)} of {len(results)} jobs failed:\n\n" + "\n".join(lines))
+
+    def _job_action_cleanup(self, runner):
+        if runner in self.job_action_runners:
+            self.job_action_runners.remove(runner)
 
     # ========== REFRESH ==========
     def refresh_everything(self):
@@ -3,32 +3,38 @@ import os
 import re
 import subprocess
 import sys
+import time
 from PySide2 import QtWidgets, QtCore
 
+from pixellab import (encode_queue, ffmpeg, flipbook_meta, flipbook_profiles, images, local_render, progressive,
+                      resume, stream_encode)
+from pixellab.framesets import FrameSet
+
 def get_ffmpeg_bin():
-    pixellab = os.getenv("PIXELLAB")
-    if not pixellab:
-        raise hou.Error("Environment variable PIXELLAB is not set.")
-    ffmpeg = os.path.join(pixellab, "ffmpeg", "bin", "ffmpeg.exe")
-    if not os.path.exists(ffmpeg):
-        raise hou.Error(f"ffmpeg.exe not found at:\n{ffmpeg}")
-    return ffmpeg
+    try:
+        return ffmpeg.get_ffmpeg_bin()
+    except RuntimeError as e:
+        raise hou.Error(str(e))
 
-def find_next_version(base_folder):
+def find_latest_version(base_folder):
     if not os.path.exists(base_folder):
-        return "V001"
+        return None
     versions = [entry for entry in os.listdir(base_folder)
                 if os.path.isdir(os.path.join(base_folder, entry)) and re.match(r"V\d{3}", entry)]
-    if not versions:
+    return max(versions) if versions else None
+
+def find_next_version(base_folder):
+    last_version = find_latest_version(base_folder)
+    if not last_version:
         return "V001"
-    versions.sort()
-    last_version = versions[-1]
     next_version_number = int(last_version[1:]) + 1
     return f"V{next_version_number:03}"
 
 class FlipbookDialog(QtWidgets.QDialog):
-    def __init__(self, parent=None, start="1001", end="1100", version="V001"):
+    def __init__(self, parent=None, start="1001", end="1100", version="V001", latest_version=None):
         super().__init__(parent)
+        self.next_version = version
+        self.latest_version = latest_version
         self.setWindowTitle("Flipbook Parameters")
         self.setFixedWidth(300)
 
@@ -39,11 +45,48 @@ class FlipbookDialog(QtWidgets.QDialog):
         self.version_edit = QtWidgets.QLineEdit(version)
         self.open_checkbox = QtWidgets.QCheckBox("Open MP4 after render")
         self.open_checkbox.setChecked(False)  # Default to OFF
+        self.stream_checkbox = QtWidgets.QCheckBox("Encode while rendering")
+        self.stream_checkbox.setToolTip("Feed each rendered chunk straight into ffmpeg instead of encoding afterwards")
+        self.stream_checkbox.setEnabled(images.HAS_OIIO)
+        self.progressive_checkbox = QtWidgets.QCheckBox("Progressive (every 8th frame first)")
+        self.progressive_checkbox.setToolTip("Render every 8th, 4th and 2nd frame before the rest so the browser can play it early")
+        self.progressive_checkbox.toggled.connect(self.update_render_options)
+        self.workers_spin = QtWidgets.QSpinBox()
+        self.workers_spin.setRange(0, 16)
+        self.workers_spin.setSpecialValueText("This session")
+        self.workers_spin.setToolTip("Render frame chunks in this many headless hython processes")
+        self.workers_spin.valueChanged.connect(self.update_render_options)
+        self.resume_checkbox = QtWidgets.QCheckBox("Resume existing version")
+        self.resume_checkbox.setToolTip("Keep the valid frames already in the version folder and render only the missing ones")
+        self.resume_checkbox.setEnabled(latest_version is not None)
+        self.resume_checkbox.toggled.connect(self.on_resume_toggled)
+        self.intermediate_combo = QtWidgets.QComboBox()
+        for name, intermediate in flipbook_profiles.INTERMEDIATES.items():
+            self.intermediate_combo.addItem(intermediate.label, name)
+        self.intermediate_combo.setCurrentIndex(self.intermediate_combo.findData(flipbook_profiles.default_intermediate()))
+        self.encode_combo = QtWidgets.QComboBox()
+        for name, preset in flipbook_profiles.ENCODE_PRESETS.items():
+            self.encode_combo.addItem(preset.label, name)
+        self.encode_combo.setCurrentIndex(self.encode_combo.findData(flipbook_profiles.default_encode()))
+        self.extra_checks = {}
+        extras_row = QtWidgets.QHBoxLayout()
+        for name, extra in flipbook_profiles.EXTRA_OUTPUTS.items():
+            check = QtWidgets.QCheckBox(extra.label)
+            check.setChecked(name in flipbook_profiles.default_outputs())
+            extras_row.addWidget(check)
+            self.extra_checks[name] = check
 
         form_layout.addRow("Start Frame:", self.start_edit)
         form_layout.addRow("End Frame:", self.end_edit)
         form_layout.addRow("Version:", self.version_edit)
+        form_layout.addRow("Frames:", self.intermediate_combo)
+        form_layout.addRow("Encode:", self.encode_combo)
+        form_layout.addRow("Also write:", extras_row)
+        form_layout.addRow("Workers:", self.workers_spin)
         form_layout.addRow("", self.open_checkbox)
+        form_layout.addRow("", self.stream_checkbox)
+        form_layout.addRow("", self.progressive_checkbox)
+        form_layout.addRow("", self.resume_checkbox)
 
         button_layout = QtWidgets.QHBoxLayout()
         self.flipbook_button = QtWidgets.QPushButton("Flipbook")
@@ -56,6 +99,20 @@ class FlipbookDialog(QtWidgets.QDialog):
         self.flipbook_button.clicked.connect(self.validate_and_accept)
         self.cancel_button.clicked.connect(self.reject)
 
+    def update_render_options(self, *args):
+        # Streaming needs frames in order from this session; progressive passes render here too
+        headless = self.workers_spin.value() > 0
+        if headless:
+            self.progressive_checkbox.setChecked(False)
+        self.progressive_checkbox.setEnabled(not headless)
+        in_order = not headless and not self.progressive_checkbox.isChecked()
+        if not in_order:
+            self.stream_checkbox.setChecked(False)
+        self.stream_checkbox.setEnabled(images.HAS_OIIO and in_order)
+
+    def on_resume_toggled(self, checked):
+        self.version_edit.setText(self.latest_version if checked else self.next_version)
+
     def validate_and_accept(self):
         if not self.start_edit.text().isdigit() or not self.end_edit.text().isdigit():
             QtWidgets.QMessageBox.warning(self, "Invalid Input", "Start and End frames must be integers.")
@@ -70,21 +127,119 @@ class FlipbookDialog(QtWidgets.QDialog):
             self.start_edit.text(),
             self.end_edit.text(),
             self.version_edit.text().strip(),
-            self.open_checkbox.isChecked()
+            self.open_checkbox.isChecked(),
+            self.stream_checkbox.isChecked(),
+            self.intermediate_combo.currentData(),
+            self.encode_combo.currentData(),
+            [name for name, check in self.extra_checks.items() if check.isChecked()],
+            self.resume_checkbox.isChecked(),
+            self.progressive_checkbox.isChecked(),
+            self.workers_spin.value()
         )
 
+def open_mp4(mp4_path):
+    try:
+        if os.name == "nt":
+            os.startfile(mp4_path.replace("/", "\\"))
+        elif sys.platform == "darwin":
+            subprocess.call(["open", mp4_path])
+        else:
+            subprocess.call(["xdg-open", mp4_path])
+    except Exception as e:
+        hou.ui.displayMessage(f"Encoded but could not open MP4:\n{str(e)}")
+
+def render_ranges(rop, frames):
+    """Render only the frames of a FrameSet, e.g. the gaps left by a crashed flipbook."""
+    total = len(frames)
+    done = 0
+    with hou.InterruptableOperation("Flipbook", "Rendering missing frames", open_interrupt_dialog=True) as operation:
+        for first, last, step in frames.ranges():
+            operation.updateLongProgress(done / float(total), f"Rendering {first}-{last} ({done}/{total} done)")
+            rop.render(frame_range=(first, last, step))
+            done += len(range(first, last + 1, step))
+
+def render_headless(rop, hipfile, frames, workers):
+    """Render frames in parallel hython processes from a temporary copy of the scene.
+
+    The session must have no unsaved changes (main() saves first): saving the
+    copy clears the unsaved flag, which would otherwise lose the user's edits.
+    """
+    # Saved next to the original so $HIP and relative paths resolve the same for the workers;
+    # they rename it back to hipfile on load so $HIPNAME and $HIPFILE do too
+    temp_hip = os.path.join(os.path.dirname(hipfile), f".{os.path.basename(hipfile)}.flipbook_{os.getpid()}.hip")
+    hou.hipFile.save(temp_hip, save_to_recent_files=False)
+    hou.hipFile.setName(hipfile)
+    try:
+        hython = local_render.hython_bin()
+        chunks = local_render.split_frames(frames, workers)
+        runner = local_render.LocalJobRunner(
+            [(chunk, local_render.worker_cmd(hython, temp_hip, rop.path(), chunk, scene_name=hipfile)) for chunk in chunks], workers)
+        with hou.InterruptableOperation("Flipbook", "Rendering in headless workers", open_interrupt_dialog=True) as operation:
+            def progress(rendered, total, running):
+                operation.updateLongProgress(rendered / float(total), f"Rendered {rendered}/{total} ({running} workers)")
+            try:
+                runner.run(progress)
+            except RuntimeError as e:
+                raise hou.Error(str(e))
+    finally:
+        if os.path.exists(temp_hip):
+            os.remove(temp_hip)
+
+def render_progressive(rop, exr_folder, start_f, end_f, missing=None):
+    """Render coarse-to-fine passes, marking each finished pass in the sidecar for the browsers."""
+    frame_passes = [(step, [f for f in frames if missing is None or f in missing])
+                    for step, frames in progressive.passes(start_f, end_f)]
+    total = max(1, sum(len(frames) for _, frames in frame_passes))
+    done = 0
+    with hou.InterruptableOperation("Flipbook", "Rendering progressively", open_interrupt_dialog=True) as operation:
+        for step, frames in frame_passes:
+            for first, last, inc in progressive.frame_ranges(frames):
+                operation.updateLongProgress(done / float(total), f"Every {step} frame(s): {first}-{last} ({done}/{total} done)")
+                rop.render(frame_range=(first, last, inc))
+                done += len(range(first, last + 1, inc))
+            flipbook_meta.update_sidecar(exr_folder, progressive_step=step)
+
+def stream_render(rop, exr_folder, frame_name, start_f, end_f, resx, resy, ffmpeg_bin, mp4_path, encode, extras,
+                  missing=None):
+    """Render through the ROP in chunks while ffmpeg encodes the frames already written.
+
+    With missing (a FrameSet) only those frames are rendered, the rest are
+    read back from exr_folder as they are.
+    """
+    def render_chunk(first, last):
+        if missing is None:
+            rop.render(frame_range=(first, last, 1))
+        else:
+            for run in (missing & FrameSet.from_range(first, last)).ranges():
+                rop.render(frame_range=run)
+        return [os.path.join(exr_folder, frame_name % f) for f in range(first, last + 1)]
+
+    outputs = [ffmpeg.x264_output(mp4_path, **flipbook_profiles.encode_args(encode))] + [out for _, out in extras]
+    cmd = ffmpeg.multi_output_cmd(ffmpeg_bin, ffmpeg.rawvideo_input_args(resx, resy), outputs)
+    encoder = stream_encode.StreamEncoder(cmd, resx, resy)
+    try:
+        with hou.InterruptableOperation("Flipbook", "Rendering and encoding", open_interrupt_dialog=True) as operation:
+            def progress(rendered, encoded, total):
+                operation.updateLongProgress(rendered / float(total), f"Rendered {rendered}/{total}, encoded {encoded}")
+            return stream_encode.stream_frames(render_chunk, encoder, start_f, end_f, progress=progress)
+    except BaseException:
+        for output in outputs:
+            if os.path.exists(output["path"]):
+                os.remove(output["path"])
+        raise
+
 def open_sequence_in_mplay(first_frame_path, total_frames):
-    match = re.match(r"(.*?)(\d+)\.exr$", os.path.basename(first_frame_path))
+    match = re.match(r"(.*?)(\d+)(\.[^.]+)$", os.path.basename(first_frame_path))
     if not match:
-        hou.ui.displayMessage("Invalid EXR filename format.")
+        hou.ui.displayMessage("Invalid frame filename format.")
         return
 
-    prefix, frame_str = match.groups()
+    prefix, frame_str, ext = match.groups()
     start_frame = int(frame_str)
     end_frame = start_frame + total_frames - 1
     padding = len(frame_str)
 
-    sequence_pattern = f"{prefix}$F{padding}.exr"
+    sequence_pattern = f"{prefix}$F{padding}{ext}"
     directory = os.path.dirname(first_frame_path)
     full_pattern = os.path.join(directory, sequence_pattern)
 
@@ -106,6 +261,7 @@ def main():
 
     base = os.path.join(hip, "Flipbooks")
     version_guess = find_next_version(base)
+    latest_version = find_latest_version(base)
 
     start, end = hou.playbar.frameRange()
     default_start = str(int(start))
@@ -115,17 +271,38 @@ def main():
     if not app:
         app = QtWidgets.QApplication([])
 
-    dialog = FlipbookDialog(start=default_start, end=default_end, version=version_guess)
+    dialog = FlipbookDialog(start=default_start, end=default_end, version=version_guess,
+                            latest_version=latest_version)
     if dialog.exec_() != QtWidgets.QDialog.Accepted:
         return  # silently exit if user cancels
 
-    start_f_str, end_f_str, user_version, open_after = dialog.get_values()
+    start_f_str, end_f_str, user_version, open_after, stream, intermediate, encode, extra_names, resuming, progressive_mode, workers = dialog.get_values()
     start_f = int(start_f_str)
     end_f = int(end_f_str)
 
+    if workers and (hou.hipFile.isNewFile() or hou.hipFile.hasUnsavedChanges()):
+        # Writing the worker copy marks the session saved, so the user's edits must be on disk first
+        if hou.hipFile.isNewFile():
+            hou.ui.displayMessage("Save the scene before rendering in headless workers.", title="Flipbook")
+            return
+        choice = hou.ui.displayMessage("The scene has unsaved changes. Headless workers render from the saved "
+                                       "scene, so it has to be saved first.",
+                                       buttons=("Save and Render", "Cancel"), default_choice=0, close_choice=1,
+                                       title="Flipbook")
+        if choice != 0:
+            return
+        hou.hipFile.save()
+
     exr_folder = os.path.join(base, user_version)
     os.makedirs(exr_folder, exist_ok=True)
 
+    previous = flipbook_meta.read_sidecar(exr_folder) if resuming else None
+    previous_intermediate = previous and previous.get("intermediate")
+    previous_intermediate = flipbook_profiles.RETIRED_INTERMEDIATES.get(previous_intermediate, previous_intermediate)
+    if previous_intermediate in flipbook_profiles.INTERMEDIATES:
+        # The frames on disk decide the format, or none of them would match
+        intermediate = previous_intermediate
+
     viewer = hou.ui.paneTabOfType(hou.paneTabType.SceneViewer)
     if not viewer:
         raise hou.Error("No Scene Viewer found.")
@@ -139,7 +316,8 @@ def main():
 
     # Create temporary OpenGL ROP
     rop = hou.node("/out").createNode("opengl", node_name="temp_flipbook")
-    exr_pattern = os.path.join(exr_folder, f"{hip_name}_{user_version}.$F4.exr")
+    frame_ext = flipbook_profiles.INTERMEDIATES[intermediate].ext
+    exr_pattern = os.path.join(exr_folder, f"{hip_name}_{user_version}.$F4{frame_ext}")
     rop.setParms({
         "camera": camera.path(),
         "trange": 1,
@@ -161,45 +339,70 @@ def main():
             rop.parm("bgimage").set(bg_image)
     if rop.parm("soho_initsim"):
         rop.parm("soho_initsim").set(True)
+    flipbook_profiles.apply_rop_parms(rop, intermediate)
 
-    rop.parm("execute").pressButton()
-    rop.destroy()
-
+    frame_name = f"{hip_name}_{user_version}.%04d{frame_ext}"
     mp4_dir = os.path.join(base, "mp4")
     os.makedirs(mp4_dir, exist_ok=True)
     mp4_path = os.path.join(mp4_dir, f"{hip_name}.{user_version}.mp4")
-    exr_input_pattern = os.path.join(exr_folder, f"{hip_name}_{user_version}.%04d.exr")
-
-    cmd = [
-        ffmpeg_bin,
-        "-y",
-        "-start_number", str(start_f),
-        "-framerate", "24",
-        "-i", exr_input_pattern,
-        "-c:v", "libx264",
-        "-preset", "veryslow",
-        "-crf", "0",
-        "-pix_fmt", "yuv444p",
-        mp4_path
-    ]
-
-    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    if result.returncode != 0:
-        raise hou.Error("FFmpeg conversion failed:\n" + result.stderr.decode())
-
-    if open_after:
-        try:
-            if os.name == "nt":
-                os.startfile(mp4_path.replace("/", "\\"))
-            elif sys.platform == "darwin":
-                subprocess.call(["open", mp4_path])
-            else:
-                subprocess.call(["xdg-open", mp4_path])
-        except Exception as e:
-            hou.ui.displayMessage(f"Rendered but could not open MP4:\n{str(e)}")
+    extras = flipbook_profiles.extra_outputs(mp4_dir, f"{hip_name}.{user_version}", extra_names)
+
+    missing = None
+    if resuming:
+        missing = resume.missing_frames(exr_folder, frame_name, start_f, end_f)
+        print(f"Resuming {user_version}: {len(missing)} of {end_f - start_f + 1} frames to render "
+              f"({missing or 'none'})")
+
+    if progressive_mode:
+        # Written up front so the browsers can show each pass as it lands
+        flipbook_meta.new_sidecar(
+            exr_folder, "opengl", hip_name, user_version, camera.path(), (resx, resy), (start_f, end_f),
+            frame_name, intermediate=intermediate, encode_profile=encode, progressive_step=None)
+
+    render_start = time.time()
+    try:
+        if progressive_mode:
+            render_progressive(rop, exr_folder, start_f, end_f, missing)
+        elif workers:
+            frames = list(missing if missing is not None else range(start_f, end_f + 1))
+            if frames:
+                render_headless(rop, hipfile, frames, workers)
+        elif stream:
+            stream_render(rop, exr_folder, frame_name, start_f, end_f, resx, resy, ffmpeg_bin, mp4_path, encode, extras,
+                          missing=missing)
+        elif missing is not None:
+            if missing:
+                render_ranges(rop, missing)
+        else:
+            rop.parm("execute").pressButton()
+    finally:
+        rop.destroy()
+    render_seconds = round(time.time() - render_start, 2)
+    if previous and previous.get("render_seconds") is not None:
+        render_seconds = round(render_seconds + previous["render_seconds"], 2)
+    flipbook_meta.new_sidecar(
+        exr_folder, "opengl", hip_name, user_version, camera.path(), (resx, resy), (start_f, end_f),
+        frame_name, render_seconds=render_seconds, intermediate=intermediate, encode_profile=encode,
+        **({"resumed_frames": len(missing)} if missing is not None else {}))
+
+    if stream:
+        # The encode finished with the render, its time is part of render_seconds
+        flipbook_meta.update_sidecar(exr_folder, mp4=mp4_path, streamed=True,
+                                     outputs={name: out["path"] for name, out in extras})
+        if open_after:
+            open_mp4(mp4_path)
+    else:
+        # Encode in the background so Houdini is usable as soon as the frames are written.
+        # Long ranges are split into GOP-aligned segments encoded in parallel.
+        job = encode_queue.sequence_job(
+            f"{hip_name} {user_version}", ffmpeg_bin, os.path.join(exr_folder, frame_name), start_f, end_f,
+            mp4_path, folder=exr_folder, on_done=(lambda job: open_mp4(job.output)) if open_after else None,
+            extra_outputs=extras, **flipbook_profiles.encode_args(encode))
+        encode_queue.shared_queue().submit(job)
+        encode_queue.show_queue_window(hou.qt.mainWindow())
 
     # Open in MPlay by default
-    first_frame_path = os.path.join(exr_folder, f"{hip_name}_{user_version}.{start_f:04d}.exr")
+    first_frame_path = os.path.join(exr_folder, frame_name % start_f)
     open_sequence_in_mplay(first_frame_path, end_f - start_f + 1)
 
 main()
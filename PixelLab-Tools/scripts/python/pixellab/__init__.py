@@ -0,0 +1,5 @@
+"""Shared helpers for the PixelLab Houdini tools.
+
+The tool scripts in $PIXELLAB/scripts are exec'd from menus and shelves, so
+anything more than one script needs lives here and is imported normally.
+"""
@@ -0,0 +1,316 @@
+"""One packed thumbnail file per render or flipbook root.
+
+Tiles are fixed-size uint8 RGB written back to back into <base>.tiles,
+which is memory-mapped for reading, so a cached thumbnail is a view into
+the map rather than a file open and decode. <base>.index is append-only
+text, one "slot mtime_ns size width height path" line per tile, and the
+last line for a path wins. width/height are the source's full resolution
+so overlays never reopen the file; lines written before they were added
+have no size. Superseded and deleted entries are dropped by compact(),
+which runs when an atlas is opened with too much dead space. Opening
+stats every indexed file, so do it off the GUI thread.
+
+Other sessions may have the same atlas open, so compaction never rewrites
+files in place. It writes a new generation, <base>.<generation>.tiles and
+.index, and then atomically replaces <base>.current, which names the
+generation to use (the bare <base>.tiles/.index when it is missing).
+Sessions still on an older generation keep reading its unchanged files
+and switch over before their next append. Generations nobody has written
+to for GENERATION_MAX_AGE seconds are deleted when an atlas is opened.
+Appends and compaction hold an OS file lock on <base>.lock, so a tile's
+slot in the index is always where its pixels were written, whichever
+session wrote them.
+"""
+import contextlib
+import os
+import re
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from pixellab import cache, images
+
+COMPACT_MIN_SLOTS = 64
+COMPACT_DEAD_RATIO = 0.5
+GENERATION_MAX_AGE = 3600
+
+
+def stat_key(path):
+    try:
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size
+    except OSError:
+        return None
+
+
+def build_tile(path, tile_size):
+    """(display-ready letterboxed (h, w, 3) uint8 tile, full (width, height)) for an image, or (None, None)."""
+    rgb, size = images.read_rgb(path, max_size=tile_size)
+    if rgb is None:
+        return None, None
+    return images.fit_tile(images.display_uint8(rgb, path), *tile_size), size
+
+
+@contextlib.contextmanager
+def _process_lock(path):
+    """Exclusive lock on path across every Houdini session on this machine or share."""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT)
+    try:
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        else:
+            while True:
+                try:
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after ten tries, keep waiting
+                    continue
+        try:
+            yield
+        finally:
+            if not fcntl:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    finally:
+        # Closing also drops the flock
+        os.close(fd)
+
+
+class ThumbnailAtlas:
+    def __init__(self, root, tile_size):
+        self.root = root
+        self.tile_size = tile_size
+        self.tile_shape = (tile_size[1], tile_size[0], 3)
+        self.tile_bytes = tile_size[0] * tile_size[1] * 3
+        self.base = cache.atlas_base(root, tile_size)
+        self.current_path = self.base + ".current"
+        self.lock_path = self.base + ".lock"
+        self._lock = threading.Lock()
+        self._map = None
+        os.makedirs(os.path.dirname(self.base), exist_ok=True)
+        superseded = self._open_generation(self._read_current())
+        slots = len(self.entries) + superseded
+        if slots >= COMPACT_MIN_SLOTS:
+            dead = superseded + sum(1 for path, (_, key, _) in self.entries.items() if stat_key(path) != key)
+            if dead > COMPACT_DEAD_RATIO * slots:
+                self.compact()
+        self._remove_old_generations()
+
+    def _generation_paths(self, generation):
+        prefix = f"{self.base}.{generation}" if generation else self.base
+        return prefix + ".tiles", prefix + ".index"
+
+    def _read_current(self):
+        """Generation named by <base>.current, "" for the original files."""
+        try:
+            with open(self.current_path, "r", encoding="utf-8") as f:
+                return f.read().strip()
+        except OSError:
+            return ""
+
+    def _open_generation(self, generation):
+        """Switch to a generation's files; returns its superseded line count."""
+        self.generation = generation
+        self.tiles_path, self.index_path = self._generation_paths(generation)
+        self._map = None
+        self.entries, superseded = self._read_index()
+        return superseded
+
+    def _follow(self):
+        """Move to the generation another session compacted into, if any. Call with the lock held."""
+        generation = self._read_current()
+        if generation != self.generation:
+            self._open_generation(generation)
+
+    def _remove_old_generations(self):
+        """Delete generations other than the current one that nobody has written to for a while."""
+        directory, name = os.path.split(self.base)
+        pattern = re.compile(re.escape(name) + r"\.(?:[0-9a-f]+\.)?(?:tiles|index)$")
+        keep = {os.path.basename(p) for p in self._generation_paths(self.generation)}
+        cutoff = time.time() - GENERATION_MAX_AGE
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return
+        for filename in names:
+            if filename in keep or not pattern.match(filename):
+                continue
+            path = os.path.join(directory, filename)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                # Still mapped by a session on Windows; a later open retries
+                pass
+
+    def _slot_count(self):
+        try:
+            return os.path.getsize(self.tiles_path) // self.tile_bytes
+        except OSError:
+            return 0
+
+    def _read_index(self):
+        """({path: (slot, key, size)}, dead line count) from the index file."""
+        entries = {}
+        lines = 0
+        slots = self._slot_count()
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    # A torn last line from an interrupted write is skipped
+                    if not line.endswith("\n"):
+                        break
+                    parts = line.rstrip("\n").split("\t", 5)
+                    if len(parts) == 6 and parts[3].isdigit() and parts[4].isdigit():
+                        resolution = (int(parts[3]), int(parts[4])) if parts[3] != "0" else None
+                        path = parts[5]
+                    elif len(parts) >= 4:
+                        resolution = None
+                        path = "\t".join(parts[3:])
+                    else:
+                        continue
+                    slot, mtime_ns, size = int(parts[0]), int(parts[1]), int(parts[2])
+                    if slot < slots:
+                        entries[path] = (slot, (mtime_ns, size), resolution)
+                    lines += 1
+        except (OSError, ValueError):
+            pass
+        return entries, lines - len(entries)
+
+    def _tiles(self, slot):
+        # Remap only when the file has grown past the current map
+        if self._map is None or slot >= self._map.shape[0]:
+            slots = self._slot_count()
+            if slot >= slots:
+                return None
+            # Copy-on-write so the views are writable buffers for QImage
+            self._map = np.memmap(self.tiles_path, dtype=np.uint8, mode="c",
+                                  shape=(slots,) + self.tile_shape)
+        return self._map[slot]
+
+    def get(self, path, key=None):
+        """(mapped tile, full size or None) for path if it is cached and current, else (None, None)."""
+        key = key or stat_key(path)
+        with self._lock:
+            entry = self.entries.get(path)
+            if key is None or not entry or entry[1] != key:
+                return None, None
+            try:
+                tile = self._tiles(entry[0])
+            except OSError:
+                # Our generation was removed after another session compacted
+                tile = None
+            if tile is None:
+                self._follow()
+                return None, None
+            return tile, entry[2]
+
+    def _write_index(self, slot, key, resolution, path):
+        width, height = resolution or (0, 0)
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(f"{slot}\t{key[0]}\t{key[1]}\t{width}\t{height}\t{path}\n")
+        self.entries[path] = (slot, key, resolution)
+
+    def set_resolution(self, path, resolution):
+        """Record the size of an entry written without one; points a new index line at the same tile."""
+        with self._lock, _process_lock(self.lock_path):
+            self._follow()
+            entry = self.entries.get(path)
+            if entry and resolution:
+                self._write_index(entry[0], entry[1], resolution, path)
+
+    def put(self, path, tile, key=None, resolution=None):
+        key = key or stat_key(path)
+        if key is None:
+            return tile
+        data = np.ascontiguousarray(tile, dtype=np.uint8).tobytes()
+        if len(data) != self.tile_bytes:
+            raise ValueError(f"Tile for {path} is not {self.tile_size}")
+        with self._lock, _process_lock(self.lock_path):
+            self._follow()
+            with open(self.tiles_path, "ab") as f:
+                offset = f.seek(0, os.SEEK_END)
+                if offset % self.tile_bytes:
+                    # Align past a partial tile left by an interrupted write
+                    f.write(b"\0" * (self.tile_bytes - offset % self.tile_bytes))
+                    offset = f.tell()
+                f.write(data)
+            slot = offset // self.tile_bytes
+            # Pixels land before the index line that points at them
+            self._write_index(slot, key, resolution, path)
+        return tile
+
+    def get_or_build(self, path, build=None):
+        """(tile, full size) for path, building and appending the tile when missing or stale.
+
+        build(path, tile_size) returns (tile, size) like build_tile. The size
+        is None for entries cached before sizes were recorded.
+        """
+        key = stat_key(path)
+        tile, resolution = self.get(path, key)
+        if tile is None:
+            tile, resolution = (build or build_tile)(path, self.tile_size)
+            if tile is not None:
+                self.put(path, tile, key, resolution)
+        return tile, resolution
+
+    def compact(self):
+        """Copy the current tiles of files that still exist into a new generation and switch to it."""
+        with self._lock, _process_lock(self.lock_path):
+            # Re-read the index so tiles other sessions appended are carried over too
+            self._open_generation(self._read_current())
+            live = [(path, slot, key, resolution)
+                    for path, (slot, key, resolution) in sorted(self.entries.items(), key=lambda e: e[1][0])
+                    if stat_key(path) == key]
+            generation = f"{int(time.time() * 1000):x}{os.getpid():x}"
+            tiles_path, index_path = self._generation_paths(generation)
+            pointer = f"{self.current_path}.{os.getpid():x}"
+            try:
+                with open(self.tiles_path, "rb") as src, open(tiles_path, "wb") as dst, \
+                        open(index_path, "w", encoding="utf-8") as index:
+                    for new_slot, (path, slot, key, resolution) in enumerate(live):
+                        src.seek(slot * self.tile_bytes)
+                        dst.write(src.read(self.tile_bytes))
+                        width, height = resolution or (0, 0)
+                        index.write(f"{new_slot}\t{key[0]}\t{key[1]}\t{width}\t{height}\t{path}\n")
+                with open(pointer, "w", encoding="utf-8") as f:
+                    f.write(generation)
+                # The only shared file that changes, and it is replaced whole
+                os.replace(pointer, self.current_path)
+            except OSError as e:
+                print(f"Atlas compaction skipped for {self.root}: {e}")
+                for leftover in (tiles_path, index_path, pointer):
+                    try:
+                        os.remove(leftover)
+                    except OSError:
+                        pass
+                return
+            self._open_generation(generation)
+
+    def close(self):
+        with self._lock:
+            self._map = None
+
+
+_open_atlases = {}
+_open_lock = threading.Lock()
+
+
+def open_atlas(root, tile_size):
+    """Shared ThumbnailAtlas for a root, opened once per session."""
+    key = (os.path.normcase(os.path.abspath(root)), tuple(tile_size))
+    with _open_lock:
+        if key not in _open_atlases:
+            _open_atlases[key] = ThumbnailAtlas(root, tile_size)
+        return _open_atlases[key]
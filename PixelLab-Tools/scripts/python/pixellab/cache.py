@@ -0,0 +1,29 @@
+import hashlib
+import os
+
+from pixellab import colour
+
+
+def cache_root():
+    root = os.getenv("PIXELLAB_CACHE") or os.path.join(os.path.expanduser("~"), ".pixellab", "cache")
+    return os.path.normpath(root)
+
+
+def path_key(path):
+    norm = os.path.normcase(os.path.abspath(path))
+    return hashlib.sha1(norm.encode("utf-8")).hexdigest()[:16]
+
+
+def proxy_dir(source_dir, scale):
+    # Everything with the display transform baked in is keyed on it
+    return os.path.join(cache_root(), "proxies", path_key(source_dir), colour.default_display(), scale)
+
+
+def filmstrip_path(source_dir):
+    return os.path.join(cache_root(), "filmstrips", f"{path_key(source_dir)}_{colour.default_display()}.npz")
+
+
+def atlas_base(source_dir, tile_size):
+    # <base>.current names the live generation of <base>.tiles and <base>.index, see atlas.py
+    w, h = tile_size
+    return os.path.join(cache_root(), "atlases", f"{path_key(source_dir)}_{w}x{h}_{colour.default_display()}")
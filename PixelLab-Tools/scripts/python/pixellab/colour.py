@@ -0,0 +1,83 @@
+"""Display transforms for previews as precomputed 1D LUTs.
+
+Linear float RGB goes through a square-root shaper into a 4096 entry uint8
+table, which spends the entries where the encoded curves are steep (the
+darks) and keeps the per-pixel work to a few in-place NumPy passes and one
+lookup. Every preview path (thumbnails, filmstrips, proxies, contact
+sheets) goes through here so they all match.
+
+The transform is picked with PIXELLAB_DISPLAY: "srgb" (default), "rec709"
+or "aces" (Narkowicz's filmic fit, which rolls highlights off instead of
+clipping them at 1.0).
+"""
+import os
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+LUT_SIZE = 4096
+
+
+def srgb_encode(x):
+    return np.where(x <= 0.0031308, x * 12.92, 1.055 * np.power(x, 1.0 / 2.4) - 0.055)
+
+
+def rec709_encode(x):
+    return np.where(x < 0.018, x * 4.5, 1.099 * np.power(x, 0.45) - 0.099)
+
+
+def aces_filmic(x):
+    # Narkowicz 2015, with his 0.6 exposure so mid grey lands near sRGB's
+    x = x * 0.6
+    return np.clip((x * (2.51 * x + 0.03)) / (x * (2.43 * x + 0.59) + 0.14), 0.0, 1.0)
+
+
+# name: (curve from linear to encoded 0-1, largest linear value kept)
+TRANSFORMS = {
+    "srgb": (srgb_encode, 1.0),
+    "rec709": (rec709_encode, 1.0),
+    "aces": (lambda x: srgb_encode(aces_filmic(x)), 16.0),
+}
+
+_luts = {}
+
+
+def default_display():
+    name = os.getenv("PIXELLAB_DISPLAY", "srgb").lower()
+    return name if name in TRANSFORMS else "srgb"
+
+
+def lut(name):
+    """uint8 table indexed by sqrt(x / max_value) * (LUT_SIZE - 1)."""
+    if name not in _luts:
+        curve, max_value = TRANSFORMS[name]
+        shaped = np.linspace(0.0, 1.0, LUT_SIZE, dtype=np.float64)
+        encoded = np.clip(curve(shaped * shaped * max_value), 0.0, 1.0)
+        _luts[name] = (encoded * 255.0 + 0.5).astype(np.uint8)
+    return _luts[name]
+
+
+def apply_display(rgb, name=None):
+    """Linear float32 RGB -> display uint8. Overwrites rgb as scratch space."""
+    name = name or default_display()
+    table = lut(name)
+    max_value = TRANSFORMS[name][1]
+    np.nan_to_num(rgb, copy=False, nan=0.0, posinf=max_value, neginf=0.0)
+    np.clip(rgb, 0.0, max_value, out=rgb)
+    if max_value != 1.0:
+        rgb *= 1.0 / max_value
+    np.sqrt(rgb, out=rgb)
+    rgb *= LUT_SIZE - 1
+    rgb += 0.5
+    return table[rgb.astype(np.uint16)]
+
+
+def apply_display_referred(rgb):
+    """Already display-encoded float RGB -> uint8. Overwrites rgb."""
+    np.nan_to_num(rgb, copy=False, nan=0.0, posinf=1.0, neginf=0.0)
+    np.clip(rgb, 0.0, 1.0, out=rgb)
+    rgb *= 255.0
+    rgb += 0.5
+    return rgb.astype(np.uint8)
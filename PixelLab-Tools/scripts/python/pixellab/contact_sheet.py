@@ -0,0 +1,103 @@
+"""Tiled contact sheets of every layer in a render version."""
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from pixellab import cache, images, proxies, workers
+from pixellab.sequences import scan_sequence
+
+TILE_SIZE = (320, 180)
+GUTTER = 4
+
+
+def pick_frames(seq, count):
+    """count evenly spaced frames from a sequence, always including first and last."""
+    frames = sorted(seq.frames)
+    if count <= 1:
+        return [frames[len(frames) // 2]]
+    if count >= len(frames):
+        return frames
+    step = (len(frames) - 1) / (count - 1)
+    return [frames[int(round(i * step))] for i in range(count)]
+
+
+def tile_source(layer_dir, seq, frame):
+    # Proxies are small and display-ready, only fall back to the EXR if needed
+    return proxies.proxy_for_frame(layer_dir, seq.frames[frame]) or seq.path(frame)
+
+
+def load_tile(path, tile_size=TILE_SIZE):
+    rgb, _ = images.read_rgb(path, max_size=tile_size)
+    if rgb is None:
+        return None
+    return images.fit_tile(images.display_uint8(rgb, path), *tile_size)
+
+
+def collect_cells(version_dir, frames_per_layer=1):
+    """[(label, path)] for each layer/frame of a version, in row order; path may be None."""
+    cells = []
+    for layer in sorted(os.listdir(version_dir)):
+        layer_dir = os.path.join(version_dir, layer)
+        if not os.path.isdir(layer_dir):
+            continue
+        seq = scan_sequence(layer_dir)
+        if not seq:
+            continue
+        frames = pick_frames(seq, frames_per_layer)
+        for frame in frames:
+            cells.append((f"{layer}  {frame}", tile_source(layer_dir, seq, frame)))
+        # Keep one layer per row when a layer is shorter than the others
+        if frames_per_layer > 1:
+            cells.extend(("", None) for _ in range(frames_per_layer - len(frames)))
+    return cells
+
+
+def assemble(tiles, columns, gutter=GUTTER):
+    """Join equally sized (h, w, 3) uint8 tiles into one row-major mosaic."""
+    th, tw = tiles.shape[1:3]
+    rows = int(math.ceil(len(tiles) / columns))
+    padded = np.zeros((rows * columns, th + gutter, tw + gutter, 3), dtype=np.uint8)
+    padded[:len(tiles), :th, :tw] = tiles
+    mosaic = padded.reshape(rows, columns, th + gutter, tw + gutter, 3).transpose(0, 2, 1, 3, 4)
+    return mosaic.reshape(rows * (th + gutter), columns * (tw + gutter), 3)[:-gutter or None, :-gutter or None]
+
+
+def build_contact_sheet(version_dir, frames_per_layer=1, tile_size=TILE_SIZE,
+                        max_workers=None, cancel_event=None, progress=None):
+    """Decode tiles in parallel and return (mosaic, cells).
+
+    cells is [(label, x, y)] giving the top-left corner of each tile so the
+    caller can draw labels. Returns (None, []) if the version has no frames.
+    """
+    cells = collect_cells(version_dir, frames_per_layer)
+    if not cells:
+        return None, []
+
+    tw, th = tile_size
+    tiles = np.zeros((len(cells), th, tw, 3), dtype=np.uint8)
+    jobs = [(i, path, tile_size) for i, (_, path) in enumerate(cells) if path]
+    with ThreadPoolExecutor(max_workers=max_workers or workers.default_workers()) as pool:
+        for n, (job, tile, error) in enumerate(workers.map_bounded(pool, _load_indexed, jobs, cancel_event), 1):
+            if error:
+                print(f"Contact sheet tile failed for {job[1]}: {error}")
+            elif tile is not None:
+                tiles[job[0]] = tile
+            if progress:
+                progress(n, len(jobs))
+
+    columns = frames_per_layer if frames_per_layer > 1 else int(math.ceil(math.sqrt(len(cells))))
+    mosaic = assemble(tiles, columns)
+    layout = [(label, (i % columns) * (tw + GUTTER), (i // columns) * (th + GUTTER))
+              for i, (label, _) in enumerate(cells) if label]
+    return mosaic, layout
+
+
+def _load_indexed(index, path, tile_size):
+    return load_tile(path, tile_size)
+
+
+def sheet_path(version_dir):
+    name = os.path.basename(os.path.normpath(version_dir))
+    return os.path.join(cache.cache_root(), "contact_sheets", f"{name}_{cache.path_key(version_dir)}.jpg")
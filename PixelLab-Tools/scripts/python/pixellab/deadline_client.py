@@ -0,0 +1,438 @@
+"""Deadline access for the PixelLab tools.
+
+Every deadlinecommand call pays the .NET start-up (1-3 s), so when the
+Deadline Web Service is reachable the tools talk to its REST API instead,
+over a small pool of keep-alive HTTP connections that stay open between
+refreshes. Set DEADLINE_WEBSERVICE to host:port to use it; without it the
+tools fall back to deadlinecommand from DEADLINE_PATH.
+
+Both clients return jobs as the flat key=value dicts deadlinecommand
+prints, so the tables do not care which one is in use.
+
+A mock Web Service is included for testing without a farm:
+
+    python -m pixellab.deadline_client --mock 8082 --jobs 5000
+    python -m pixellab.deadline_client --self-test
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import queue
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlparse
+
+from pixellab import deadline_jobs
+
+DEFAULT_DEADLINE_PATH = r"C:\Program Files\Thinkbox\Deadline10\bin"
+POOL_SIZE = 4
+ACTION_BATCH = 100  # job ids per comma-joined command
+ACTION_WORKERS = 4  # commands in flight at once
+
+# deadlinecommand verb -> Web Service job command
+WEB_COMMANDS = {"SuspendJob": "suspend", "ResumeJob": "resume", "DeleteJob": "delete"}
+
+# Web Service job status codes
+STATUS_NAMES = {0: "Unknown", 1: "Active", 2: "Suspended", 3: "Completed", 4: "Failed", 6: "Pending"}
+
+
+def find_deadline_cmd():
+    deadline_bin_dir = os.getenv("DEADLINE_PATH", DEFAULT_DEADLINE_PATH)
+    deadline_cmd = os.path.join(deadline_bin_dir, "deadlinecommand")
+    if platform.system() == "Windows" and os.path.isfile(deadline_cmd + ".exe"):
+        deadline_cmd += ".exe"
+    return deadline_cmd
+
+
+class DeadlineError(RuntimeError):
+    pass
+
+
+class Client:
+    """Batched job actions shared by both clients; subclasses implement command()."""
+
+    def command(self, command, job_ids):
+        """Run command on a list of job ids in one call. Returns (ok, message)."""
+        raise NotImplementedError
+
+    def job_command(self, command, job_ids, progress=None):
+        """Run command on every job, ACTION_BATCH ids per call and ACTION_WORKERS calls at a time.
+
+        A batch that fails is retried one job at a time so every job gets
+        its own result. progress(job_id, ok, message) is called from the
+        calling thread as results come in. Returns {job id: (ok, message)}.
+        """
+        job_ids = list(dict.fromkeys(job_ids))
+        results = {}
+
+        def report(jid, ok, message):
+            results[jid] = (ok, message)
+            if progress:
+                progress(jid, ok, message)
+
+        def call(ids):
+            try:
+                return self.command(command, ids)
+            except Exception as e:
+                return False, str(e)
+
+        if not job_ids:
+            return results
+        batches = [job_ids[i:i + ACTION_BATCH] for i in range(0, len(job_ids), ACTION_BATCH)]
+        with ThreadPoolExecutor(max_workers=ACTION_WORKERS) as pool:
+            futures = {pool.submit(call, ids): ids for ids in batches}
+            retries = {}
+            for future in as_completed(futures):
+                ids = futures[future]
+                ok, message = future.result()
+                if ok or len(ids) == 1:
+                    for jid in ids:
+                        report(jid, ok, message)
+                else:
+                    retries.update((pool.submit(call, [jid]), jid) for jid in ids)
+            for future in as_completed(retries):
+                report(retries[future], *future.result())
+        return results
+
+
+class CommandClient(Client):
+    """deadlinecommand, one process per call."""
+
+    def __init__(self, deadline_cmd=None):
+        self.deadline_cmd = deadline_cmd or find_deadline_cmd()
+
+    def _run(self, *args):
+        result = subprocess.run([self.deadline_cmd] + list(args), stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE, text=True)
+        return result.returncode, (result.stdout.strip() or result.stderr.strip())
+
+    def iter_jobs(self, user=None):
+        """Yield jobs as deadlinecommand prints them."""
+        args = [self.deadline_cmd, "GetJobsFilter", f"Username={user}"] if user else [self.deadline_cmd, "GetJobs"]
+        process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        with process.stdout:
+            for job in deadline_jobs.iter_jobs(process.stdout):
+                yield job
+        if process.wait() != 0:
+            raise DeadlineError(f"deadlinecommand exited with {process.returncode}")
+
+    def get_jobs(self, user=None):
+        return list(self.iter_jobs(user))
+
+    def get_job(self, job_id):
+        code, out = self._run("GetJob", job_id)
+        if code != 0:
+            raise DeadlineError(out or f"GetJob failed for {job_id}")
+        return deadline_jobs.parse_job(out)
+
+    def command(self, command, job_ids):
+        # SuspendJob, ResumeJob and DeleteJob take comma separated ids
+        code, out = self._run(command, ",".join(job_ids))
+        return code == 0, out
+
+
+def job_from_json(data):
+    """Web Service job JSON -> the flat fields deadlinecommand prints."""
+    props = data.get("Props") or {}
+    status = data.get("Stat")
+    return {
+        "JobId": data.get("_id", ""),
+        "Name": props.get("Name", ""),
+        "UserName": props.get("User", ""),
+        "Status": STATUS_NAMES.get(status, str(status or "")),
+        "Frames": props.get("Frames", ""),
+        "Pool": props.get("Pool", ""),
+        "Priority": str(props.get("Pri", "")),
+        "JobSubmitDateTime": data.get("Date", ""),
+        "JobStartedDateTime": data.get("DateStart", ""),
+        "JobCompletedDateTime": data.get("DateComp", ""),
+        "JobTaskCount": str(props.get("Tasks", data.get("Tasks", ""))),
+        "JobCompletedTasks": str(data.get("CompletedChunks", "")),
+        "JobOutputDirectories": ",".join(data.get("OutDir") or []),
+        "JobOutputFileNames": ",".join(data.get("OutFile") or []),
+        "JobSubmitMachine": data.get("Mach", ""),
+        "LastWriteTime": data.get("LastWriteTime", ""),
+    }
+
+
+class WebServiceClient(Client):
+    """Deadline Web Service REST API over pooled keep-alive connections.
+
+    Connections are opened lazily and reused for every request, so a
+    session pays the TCP setup a handful of times instead of a process
+    start per call. A request is only sent again when a reused idle
+    connection turns out to be dead: either it failed before the request
+    went out, or the server had closed it and the request is a GET. A PUT
+    or DELETE that reached the server is never repeated.
+    """
+
+    def __init__(self, host, port=8082, pool_size=POOL_SIZE, timeout=30):
+        self.host = host
+        self.port = int(port)
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self.connections_opened = 0
+
+    def _connection(self):
+        """(connection, reused)"""
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            self.connections_opened += 1
+            return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout), False
+
+    def request(self, method, path, body=None):
+        payload = json.dumps(body).encode("utf-8") if body is not None else None
+        headers = {"Content-Type": "application/json"} if payload is not None else {}
+        with self._slots:
+            while True:
+                conn, reused = self._connection()
+                sent = False
+                try:
+                    if conn.sock is None:
+                        conn.connect()
+                        conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    conn.request(method, path, body=payload, headers=headers)
+                    sent = True
+                    response = conn.getresponse()
+                    data = response.read()
+                except (http.client.HTTPException, OSError) as e:
+                    conn.close()
+                    closed_by_server = isinstance(e, (http.client.RemoteDisconnected, ConnectionResetError))
+                    if reused and (not sent or (method == "GET" and closed_by_server)):
+                        continue  # stale keep-alive connection, retry (on another idle one or a fresh one)
+                    raise
+                if response.will_close:
+                    conn.close()
+                else:
+                    self._idle.put(conn)
+                if response.status >= 400:
+                    raise DeadlineError(f"{method} {path}: {response.status} {data.decode('utf-8', 'replace')[:200]}")
+                if not data:
+                    return None
+                try:
+                    return json.loads(data.decode("utf-8"))
+                except ValueError:
+                    return data.decode("utf-8", "replace")
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def iter_jobs(self, user=None):
+        """Jobs of user, or every job.
+
+        The Web Service has no user filter for job lists, so this downloads
+        every job on the farm and filters here: one larger response instead
+        of deadlinecommand's start-up, but on a big farm most of it is
+        thrown away.
+        """
+        for data in self.request("GET", "/api/jobs") or []:
+            job = job_from_json(data)
+            if not user or job["UserName"].lower() == user.lower():
+                yield job
+
+    def get_jobs(self, user=None):
+        return list(self.iter_jobs(user))
+
+    def get_job(self, job_id):
+        found = self.request("GET", "/api/jobs?JobID=" + quote(job_id)) or []
+        if not found:
+            raise DeadlineError(f"No job {job_id}")
+        return job_from_json(found[0])
+
+    def command(self, command, job_ids):
+        ids = ",".join(job_ids)
+        try:
+            if command == "DeleteJob":
+                message = self.request("DELETE", "/api/jobs?JobID=" + quote(ids, safe=","))
+            else:
+                message = self.request("PUT", "/api/jobs", {"Command": WEB_COMMANDS[command], "JobID": ids})
+        except (DeadlineError, OSError, http.client.HTTPException, KeyError) as e:
+            return False, str(e)
+        return True, str(message or "Success")
+
+
+_shared = {}
+
+
+def shared_client():
+    """One client per process so its connections outlive a single refresh."""
+    key = os.getenv("DEADLINE_WEBSERVICE", "") or find_deadline_cmd()
+    client = _shared.get(key)
+    if client is None:
+        web = os.getenv("DEADLINE_WEBSERVICE", "")
+        if web:
+            host, _, port = web.partition(":")
+            client = WebServiceClient(host, int(port or 8082))
+        else:
+            client = CommandClient()
+        _shared.clear()
+        _shared[key] = client
+    return client
+
+
+# --------- Mock Web Service --------- #
+
+def mock_jobs(count, users=("artist", "lighter", "fx")):
+    jobs = {}
+    for n in range(count):
+        jid = f"{n:024x}"
+        jobs[jid] = {
+            "_id": jid,
+            "Props": {"Name": f"shot_{n % 400:04d}_v{n % 30:03d}", "User": users[n % len(users)],
+                      "Frames": "1001-1100", "Pool": "gpu", "Pri": n % 100, "Tasks": 100},
+            "Stat": 1 + n % 4,
+            "Date": f"2026-10-{1 + n % 28:02d}T12:00:00.000Z",
+            "DateStart": "",
+            "DateComp": "",
+            "CompletedChunks": n % 101,
+            "OutDir": [f"/renders/shot_{n % 400:04d}"],
+            "OutFile": ["beauty.####.exr"],
+            "Mach": "ws01",
+            "LastWriteTime": f"2026-10-19T10:{n % 60:02d}:00.000Z",
+        }
+    return jobs
+
+
+class MockWebService(ThreadingHTTPServer):
+    """Just enough of the Deadline Web Service for the tools and tests."""
+    daemon_threads = True
+
+    def __init__(self, port=0, jobs=100, latency=0.0):
+        super().__init__(("127.0.0.1", port), _MockHandler)
+        self.jobs = mock_jobs(jobs)
+        self.latency = latency
+        self.connections = 0
+        self.requests = 0
+        self.lock = threading.Lock()
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    wbufsize = 64 * 1024  # one write per response, or Nagle stalls every reply
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _begin(self):
+        with self.server.lock:
+            self.server.requests += 1
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        url = urlparse(self.path)
+        return url.path, parse_qs(url.query)
+
+    def _ids(self, query):
+        return [jid for value in query.get("JobID", []) for jid in value.split(",") if jid]
+
+    def do_GET(self):
+        path, query = self._begin()
+        if path != "/api/jobs":
+            return self._reply(404, "Not found")
+        ids = self._ids(query)
+        jobs = self.server.jobs
+        self._reply(200, [jobs[jid] for jid in ids if jid in jobs] if ids else list(jobs.values()))
+
+    def do_PUT(self):
+        path, _ = self._begin()
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        status = {"suspend": 2, "resume": 1}.get(body.get("Command"))
+        ids = [jid for jid in str(body.get("JobID", "")).split(",") if jid]
+        if path != "/api/jobs" or status is None or not all(jid in self.server.jobs for jid in ids):
+            return self._reply(400, "Bad request")
+        for jid in ids:
+            self.server.jobs[jid]["Stat"] = status
+        self._reply(200, "Success")
+
+    def do_DELETE(self):
+        path, query = self._begin()
+        ids = self._ids(query)
+        if path != "/api/jobs" or not all(jid in self.server.jobs for jid in ids):
+            return self._reply(400, "Bad request")
+        for jid in ids:
+            del self.server.jobs[jid]
+        self._reply(200, "Success")
+
+
+def self_test(jobs=2000, lookups=200):
+    server = MockWebService(jobs=jobs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = WebServiceClient("127.0.0.1", server.server_address[1])
+    try:
+        began = time.time()
+        listed = client.get_jobs()
+        list_seconds = time.time() - began
+        # the table builds a record per job; Web Service dates carry a zone
+        dated = sum(1 for job in listed if deadline_jobs.JobRecord(job).submit_date is not None)
+        began = time.time()
+        for job in listed[:lookups]:
+            client.get_job(job["JobId"])
+        lookup_seconds = time.time() - began
+        ids = [job["JobId"] for job in listed[:250]]
+        began = time.time()
+        results = client.job_command("SuspendJob", ids)
+        action_seconds = time.time() - began
+        # an unknown id fails its batch; the rest of that batch must still go through one by one
+        mixed = client.job_command("ResumeJob", ids[:5] + ["missing"])
+        ok = (len(listed) == jobs and dated == jobs and all(ok for ok, _ in results.values())
+              and [jid for jid, (ok, _) in mixed.items() if not ok] == ["missing"])
+        print(f"SuspendJob on {len(ids)} jobs in {action_seconds * 1000:.0f} ms")
+        print(f"{len(listed)} jobs listed in {list_seconds * 1000:.0f} ms, {lookups} GetJob in "
+              f"{lookup_seconds * 1000:.0f} ms over {server.connections} connection(s) "
+              f"for {server.requests} requests")
+        return 0 if ok else 1
+    finally:
+        client.close()
+        server.shutdown()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mock Deadline Web Service and client self-test.")
+    parser.add_argument("--mock", type=int, metavar="PORT", help="serve a mock Web Service on this port")
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every mock request")
+    parser.add_argument("--self-test", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.self_test:
+        return self_test(args.jobs)
+    if args.mock is None:
+        parser.error("give --mock PORT or --self-test")
+    server = MockWebService(args.mock, args.jobs, args.latency)
+    print(f"Mock Deadline Web Service with {args.jobs} jobs on 127.0.0.1:{args.mock}, "
+          f"set DEADLINE_WEBSERVICE=127.0.0.1:{args.mock}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
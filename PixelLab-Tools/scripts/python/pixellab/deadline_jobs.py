@@ -0,0 +1,262 @@
+"""Deadline job records shared by the Deadline viewer and Houdini Lab.
+
+deadlinecommand prints jobs as key=value lines separated by blank lines.
+Jobs are keyed by JobId so a refresh can be diffed against the previous
+one and only the rows that changed are touched.
+
+Each job becomes a JobRecord holding its display values, per-column sort
+keys and a lowercase search string, all computed once when the job
+arrives, so sorting and filtering thousands of jobs never re-parses them.
+
+GetJob details are kept in a JobDetailCache so browsing the table does
+not ask Deadline again for jobs it has just shown.
+"""
+import datetime
+import re
+import threading
+import time
+
+from pixellab.framesets import FrameSet
+
+COLUMNS = [
+    "Job Name", "User", "Progress", "Status", "Frames", "Pool",
+    "Priority", "Submitted", "Started", "Completed",
+    "Output Directory", "Output File", "Submitted From", "Job ID"
+]
+PROGRESS_COLUMN = 2
+FRAMES_COLUMN = 4
+PRIORITY_COLUMN = 6
+DATE_COLUMNS = (7, 8, 9)
+DATE_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d",
+                "%m/%d/%Y %H:%M:%S", "%m/%d/%Y %I:%M:%S %p")
+EPOCH = datetime.datetime(1970, 1, 1)
+DETAIL_TTL = 30.0  # seconds a GetJob result is trusted without a newer list poll
+
+
+def job_id(job):
+    return job.get("JobId") or job.get("Id") or job.get("ID") or ""
+
+
+def iter_jobs(lines):
+    """key=value lines -> one dict per blank-line separated job."""
+    job = {}
+    for line in lines:
+        line = line.strip()
+        if not line:
+            if job:
+                yield job
+                job = {}
+        elif "=" in line:
+            key, value = line.split("=", 1)
+            job[key.strip()] = value.strip()
+    if job:
+        yield job
+
+
+def batches(jobs, size=200, seconds=0.1):
+    """Group a job stream into lists of up to size jobs, or whatever arrived within seconds."""
+    batch = []
+    started = time.monotonic()
+    for job in jobs:
+        batch.append(job)
+        if len(batch) >= size or time.monotonic() - started >= seconds:
+            yield batch
+            batch = []
+            started = time.monotonic()
+    if batch:
+        yield batch
+
+
+def parse_job(text):
+    """GetJob output -> dict."""
+    return next(iter_jobs(text.splitlines()), {})
+
+
+def frame_range(raw_frames):
+    """"1-10,20" or "1-100x5" -> "1-20" / "1-96", the span shown in the table."""
+    return FrameSet.parse(raw_frames).span() if isinstance(raw_frames, str) else ""
+
+
+def progress(job):
+    try:
+        completed = int(job.get("JobCompletedTasks", 0))
+        total = int(job.get("JobTaskCount", 1))
+        return int((completed / total) * 100) if total > 0 else 0
+    except (TypeError, ValueError):
+        return 0
+
+
+def _first(value):
+    return value[0] if isinstance(value, list) and value else (value or "")
+
+
+def row_values(job):
+    """Display values for COLUMNS; the progress column holds an int percentage."""
+    return [
+        job.get("Name", "Unknown"),
+        job.get("UserName", "") or job.get("User", ""),
+        progress(job),
+        job.get("Status", ""),
+        frame_range(job.get("Frames", "")),
+        job.get("Pool", ""),
+        str(job.get("Priority", "")),
+        job.get("JobSubmitDateTime", ""),
+        job.get("JobStartedDateTime", ""),
+        job.get("JobCompletedDateTime", ""),
+        _first(job.get("JobOutputDirectories", "")),
+        _first(job.get("JobOutputFileNames", "")),
+        job.get("JobSubmitMachine", ""),
+        job_id(job),
+    ]
+
+
+def parse_datetime(value):
+    """Deadline date string or epoch seconds -> naive local datetime, None if unparseable."""
+    if not value:
+        return None
+    value = str(value).strip()
+    if value.isdigit():
+        try:
+            return datetime.datetime.fromtimestamp(int(value))
+        except (OverflowError, OSError, ValueError):
+            return None
+    try:
+        # the common case, far cheaper than strptime; the Web Service sends UTC as "...Z"
+        parsed = datetime.datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value)
+    except ValueError:
+        pass
+    else:
+        # zoned dates become local time so they compare and subtract with the naive ones
+        return parsed.astimezone().replace(tzinfo=None) if parsed.tzinfo else parsed
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(value, fmt)
+        except ValueError:
+            pass
+    match = re.search(r"(\d{4}-\d{2}-\d{2})", value)
+    if match:
+        return datetime.datetime.strptime(match.group(1), "%Y-%m-%d")
+    return None
+
+
+def submit_date(job):
+    parsed = parse_datetime(job.get("JobSubmitDateTime", "") or job.get("JobSubmitDate", ""))
+    return parsed.date() if parsed else None
+
+
+def _int_key(text):
+    match = re.match(r"-?\d+", text or "")
+    return int(match.group()) if match else -1
+
+
+class JobRecord:
+    """One job as the table needs it, built once per job update."""
+    __slots__ = ("job_id", "job", "values", "sort_keys", "search", "user", "submit_date", "visible")
+
+    def __init__(self, job):
+        self.job_id = job_id(job)
+        self.job = job
+        self.values = row_values(job)
+        keys = []
+        for col, value in enumerate(self.values):
+            if col == PROGRESS_COLUMN:
+                keys.append(value)
+            elif col in (FRAMES_COLUMN, PRIORITY_COLUMN):
+                keys.append(_int_key(value))
+            elif col in DATE_COLUMNS:
+                parsed = parse_datetime(value)
+                keys.append((parsed - EPOCH).total_seconds() if parsed else 0.0)
+            else:
+                keys.append((value or "").lower())
+        self.sort_keys = keys
+        self.user = (self.values[1] or "").lower()
+        self.search = "\n".join(((self.values[0] or "").lower(), self.user, self.job_id.lower()))
+        self.submit_date = submit_date(job)
+        self.visible = True
+
+
+class JobFilter:
+    """Search text, user and submit date range; require_date drops jobs without a date."""
+
+    def __init__(self, text="", user="", date_from=None, date_to=None, require_date=False):
+        self.text = text.lower().strip()
+        self.user = user.lower().strip()
+        self.date_from = date_from
+        self.date_to = date_to
+        self.require_date = require_date
+
+    def matches(self, record):
+        if record.submit_date is None:
+            if self.require_date:
+                return False
+        elif self.date_from and self.date_to and not (self.date_from <= record.submit_date <= self.date_to):
+            return False
+        if self.user and self.user not in record.user:
+            return False
+        return not self.text or self.text in record.search
+
+
+def diff_jobs(old, new):
+    """old/new {job id: job} -> (added, removed, changed) lists of ids."""
+    added = [jid for jid in new if jid not in old]
+    removed = [jid for jid in old if jid not in new]
+    changed = [jid for jid, job in new.items() if jid in old and old[jid] != job]
+    return added, removed, changed
+
+
+def signature(job):
+    """Changes whenever the job does: LastWriteTime when Deadline lists it, else the listed fields."""
+    return job.get("LastWriteTime") or hash(tuple(sorted(job.items())))
+
+
+class JobDetailCache:
+    """GetJob results by job id, trusted for ttl seconds and until the list poll shows the job changed.
+
+    Shared between the GUI thread and the detail fetch thread.
+    """
+
+    def __init__(self, ttl=DETAIL_TTL):
+        self.ttl = ttl
+        self.entries = {}  # job id -> (detail, signature, fetched at)
+        self.signatures = {}  # job id -> signature from the latest list poll
+        self.lock = threading.Lock()
+
+    def note_jobs(self, jobs):
+        """Record listed jobs; drops details of jobs that changed and returns their ids."""
+        changed = []
+        with self.lock:
+            for job in jobs:
+                jid = job_id(job)
+                sig = signature(job)
+                if self.signatures.get(jid, sig) != sig and jid in self.entries:
+                    del self.entries[jid]
+                    changed.append(jid)
+                self.signatures[jid] = sig
+        return changed
+
+    def forget(self, job_ids):
+        with self.lock:
+            for jid in job_ids:
+                self.entries.pop(jid, None)
+                self.signatures.pop(jid, None)
+
+    def listed_signature(self, jid):
+        with self.lock:
+            return self.signatures.get(jid)
+
+    def get(self, jid):
+        """The cached detail dict, or None if missing, expired or superseded by a list poll."""
+        with self.lock:
+            entry = self.entries.get(jid)
+            if entry is None:
+                return None
+            detail, sig, fetched = entry
+            if time.monotonic() - fetched > self.ttl or sig != self.signatures.get(jid, sig):
+                del self.entries[jid]
+                return None
+            return detail
+
+    def put(self, jid, detail, sig=None):
+        """Store a detail fetched while the list showed sig (take it before fetching)."""
+        with self.lock:
+            self.entries[jid] = (detail, sig, time.monotonic())
@@ -0,0 +1,309 @@
+"""Model/view Deadline job table shared by the Deadline viewer and Houdini Lab.
+
+JobTableModel keeps one deadline_jobs.JobRecord per job in a flat list.
+A refresh is diffed by JobId so only added, removed and changed rows are
+signalled and the view keeps its selection and scroll position.
+
+Sorting is done by the model on the records' precomputed keys (numbers
+for progress, frames and priority, timestamps for the date columns), one
+list.sort instead of a Python lessThan call per comparison. Filtering
+goes through JobFilterProxy, which evaluates the filter once per record
+when it changes and then only reads a flag per row, so typing in the
+search bar stays cheap with thousands of jobs. Progress bars are painted
+by ProgressDelegate instead of one QProgressBar widget per row.
+
+JobDetailFetcher feeds the Job Info panel. Selection changes are
+debounced so arrowing through rows does not queue a GetJob per row,
+details come from a deadline_jobs.JobDetailCache when still valid, and
+the rows around the selection are fetched in the background so the next
+row is usually already cached.
+"""
+from PySide2 import QtCore, QtWidgets
+
+from pixellab import deadline_client, deadline_jobs
+
+JOB_ID_ROLE = QtCore.Qt.UserRole
+
+
+class JobTableModel(QtCore.QAbstractTableModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.records = []
+        self.rows = {}  # job id -> row
+        self.jobs = {}  # job id -> job dict from the last update
+        self.job_filter = deadline_jobs.JobFilter()
+        self.sort_column = -1
+        self.sort_order = QtCore.Qt.AscendingOrder
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.records)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(deadline_jobs.COLUMNS)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return deadline_jobs.COLUMNS[section]
+        return None
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        record = self.records[index.row()]
+        if role == QtCore.Qt.DisplayRole:
+            value = record.values[index.column()]
+            return f"{value}%" if index.column() == deadline_jobs.PROGRESS_COLUMN else value
+        if role == JOB_ID_ROLE:
+            return record.job_id
+        if role == QtCore.Qt.TextAlignmentRole:
+            if index.column() == 0:
+                return int(QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter)
+            return int(QtCore.Qt.AlignCenter)
+        return None
+
+    def progress(self, row):
+        return self.records[row].values[deadline_jobs.PROGRESS_COLUMN]
+
+    def _reindex(self):
+        self.rows = {record.job_id: row for row, record in enumerate(self.records)}
+
+    def _record(self, job):
+        record = deadline_jobs.JobRecord(job)
+        record.visible = self.job_filter.matches(record)
+        return record
+
+    def update(self, jobs):
+        """Diff a full job list into the model. Returns (added, removed, changed) ids."""
+        new = {}
+        for job in jobs:
+            jid = deadline_jobs.job_id(job)
+            if jid:
+                new[jid] = job
+        added, removed, changed = deadline_jobs.diff_jobs(self.jobs, new)
+        self.jobs = new
+        self.merge([new[jid] for jid in added + changed], removed)
+        return added, removed, changed
+
+    def merge(self, jobs, removed=()):
+        """Add or replace the given jobs and drop the removed ids, leaving other rows alone."""
+        for jid in removed:
+            self.jobs.pop(jid, None)
+        for row in sorted((self.rows[jid] for jid in removed if jid in self.rows), reverse=True):
+            self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+            del self.records[row]
+            self.endRemoveRows()
+        if removed:
+            self._reindex()
+
+        appended = []
+        last_column = len(deadline_jobs.COLUMNS) - 1
+        for job in jobs:
+            jid = deadline_jobs.job_id(job)
+            if not jid:
+                continue
+            self.jobs[jid] = job
+            row = self.rows.get(jid)
+            if row is None:
+                appended.append(self._record(job))
+            else:
+                self.records[row] = self._record(job)
+                self.dataChanged.emit(self.index(row, 0), self.index(row, last_column))
+        if appended:
+            first = len(self.records)
+            self.beginInsertRows(QtCore.QModelIndex(), first, first + len(appended) - 1)
+            self.records.extend(appended)
+            for offset, record in enumerate(appended):
+                self.rows[record.job_id] = first + offset
+            self.endInsertRows()
+        if jobs and self.sort_column >= 0:
+            self.sort(self.sort_column, self.sort_order)
+
+    def sort(self, column, order=QtCore.Qt.AscendingOrder):
+        self.sort_column = column
+        self.sort_order = order
+        if column < 0 or not self.records:
+            return
+        self.layoutAboutToBeChanged.emit()
+        old_ids = [record.job_id for record in self.records]
+        self.records.sort(key=lambda record: record.sort_keys[column], reverse=order == QtCore.Qt.DescendingOrder)
+        self._reindex()
+        old_indexes = self.persistentIndexList()
+        new_indexes = [self.index(self.rows[old_ids[index.row()]], index.column()) for index in old_indexes]
+        self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
+
+    def record(self, row):
+        return self.records[row]
+
+
+class JobFilterProxy(QtCore.QSortFilterProxyModel):
+    def set_filter(self, job_filter):
+        model = self.sourceModel()
+        model.job_filter = job_filter
+        for record in model.records:
+            record.visible = job_filter.matches(record)
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return self.sourceModel().records[source_row].visible
+
+
+class ProgressDelegate(QtWidgets.QStyledItemDelegate):
+    def paint(self, painter, option, index):
+        source = index.model().mapToSource(index) if hasattr(index.model(), "mapToSource") else index
+        value = source.model().progress(source.row())
+        bar = QtWidgets.QStyleOptionProgressBar()
+        bar.rect = option.rect.adjusted(2, 3, -2, -3)
+        bar.minimum = 0
+        bar.maximum = 100
+        bar.progress = value
+        bar.text = f"{value}%"
+        bar.textVisible = True
+        bar.textAlignment = QtCore.Qt.AlignCenter
+        bar.state = option.state
+        style = option.widget.style() if option.widget else QtWidgets.QApplication.style()
+        style.drawControl(QtWidgets.QStyle.CE_ProgressBar, bar, painter, option.widget)
+
+
+class JobTable:
+    """Wires a QTableView to the model, proxy and progress delegate."""
+
+    def __init__(self, view):
+        self.view = view
+        self.model = JobTableModel(view)
+        self.proxy = JobFilterProxy(view)
+        self.proxy.setSourceModel(self.model)
+        view.setModel(self.proxy)
+        view.setItemDelegateForColumn(deadline_jobs.PROGRESS_COLUMN, ProgressDelegate(view))
+        view.setSortingEnabled(False)  # the model sorts, see module docstring
+        header = view.horizontalHeader()
+        header.setSectionsClickable(True)
+        header.setSortIndicatorShown(True)
+        header.setSortIndicator(-1, QtCore.Qt.AscendingOrder)
+        header.sortIndicatorChanged.connect(self.model.sort)
+        view.verticalHeader().setDefaultSectionSize(20)
+
+    @property
+    def jobs(self):
+        return self.model.jobs
+
+    def update(self, jobs):
+        return self.model.update(jobs)
+
+    def merge(self, jobs, removed=()):
+        self.model.merge(jobs, removed)
+
+    def apply_filter(self, job_filter):
+        self.proxy.set_filter(job_filter)
+
+    def job_id_at(self, row):
+        index = self.proxy.index(row, 0)
+        return index.data(JOB_ID_ROLE) if index.isValid() else None
+
+    def selected_job_ids(self):
+        rows = self.view.selectionModel().selectedRows()
+        return [jid for jid in (index.data(JOB_ID_ROLE) for index in rows) if jid]
+
+    def neighbour_ids(self, row, count):
+        """Job ids of the visible rows around row, nearest first, the row below before the row above."""
+        ids = []
+        for distance in range(1, count + 1):
+            for neighbour in (row + distance, row - distance):
+                if 0 <= neighbour < self.proxy.rowCount():
+                    jid = self.job_id_at(neighbour)
+                    if jid:
+                        ids.append(jid)
+        return ids
+
+
+class JobDetailWorker(QtCore.QThread):
+    loaded = QtCore.Signal(str, dict)  # job id, GetJob fields
+
+    def __init__(self, client, cache, job_ids):
+        super().__init__()
+        self.client = client
+        self.cache = cache
+        self.job_ids = job_ids
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        for jid in self.job_ids:
+            if self.cancelled:
+                return
+            if self.cache.get(jid) is not None:
+                continue
+            sig = self.cache.listed_signature(jid)
+            try:
+                detail = self.client.get_job(jid)
+            except Exception as e:
+                print(f"GetJob failed for {jid}: {e}")
+                continue
+            self.cache.put(jid, detail, sig)
+            self.loaded.emit(jid, detail)
+
+
+class JobDetailFetcher(QtCore.QObject):
+    """Debounced, cached GetJob for the selected job plus background prefetch of its neighbours."""
+    detail_ready = QtCore.Signal(str, dict)  # job id, GetJob fields; only for the current job
+
+    DEBOUNCE_MS = 150
+    PREFETCH_ROWS = 2
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.cache = deadline_jobs.JobDetailCache()
+        self.current = None
+        self.pending = []
+        self.worker = None
+        self.workers = []  # cancelled workers finish their in-flight GetJob
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(self.DEBOUNCE_MS)
+        self.timer.timeout.connect(self._fetch)
+
+    def request(self, job_id, neighbours=(), immediate=False):
+        """Show job_id: at once if cached, otherwise after the debounce (or now if immediate)."""
+        self.current = job_id
+        detail = self.cache.get(job_id)
+        if detail is not None:
+            self.detail_ready.emit(job_id, detail)
+        self.pending = [job_id] + [jid for jid in neighbours if jid != job_id]
+        if immediate:
+            self.timer.stop()
+            self._fetch()
+        else:
+            self.timer.start()
+
+    def note_jobs(self, jobs):
+        """Invalidate details of jobs a list poll shows changed; refetches the current one."""
+        if self.current in self.cache.note_jobs(jobs):
+            self.request(self.current)
+
+    def forget(self, job_ids):
+        self.cache.forget(job_ids)
+
+    def _fetch(self):
+        if self.worker is not None:
+            self.worker.cancel()
+        job_ids = [jid for jid in self.pending if self.cache.get(jid) is None]
+        self.pending = []
+        if not job_ids:
+            self.worker = None
+            return
+        worker = JobDetailWorker(deadline_client.shared_client(), self.cache, job_ids)
+        worker.loaded.connect(self._loaded)
+        worker.finished.connect(lambda: self._cleanup(worker))
+        self.workers.append(worker)
+        self.worker = worker
+        worker.start()
+
+    def _loaded(self, job_id, detail):
+        if job_id == self.current:
+            self.detail_ready.emit(job_id, detail)
+
+    def _cleanup(self, worker):
+        if worker in self.workers:
+            self.workers.remove(worker)
+        if worker is self.worker:
+            self.worker = None
@@ -0,0 +1,406 @@
+"""Background ffmpeg encode queue shared by the flipbook tools.
+
+Encodes run as QProcesses on Houdini's event loop, so the flipbook scripts
+return as soon as the frames are written. One queue lives for the whole
+session (stashed on hou.session when running inside Houdini) and a small
+window lists queued, running and finished jobs with progress and ETA.
+"""
+import itertools
+import os
+import time
+
+from PySide2 import QtCore, QtWidgets
+
+from pixellab import ffmpeg, flipbook_meta
+
+MAX_RUNNING = max(1, int(os.getenv("PIXELLAB_ENCODE_JOBS", "1")))
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "Queued", "Running", "Done", "Failed", "Cancelled"
+
+_job_ids = itertools.count(1)
+
+
+class EncodeJob:
+    """One flipbook encode, run as stages of ffmpeg commands.
+
+    Commands within a stage run concurrently and the next stage starts
+    when they have all succeeded, e.g. [[segment, segment, ...], [concat]].
+    Progress counts frames reported by the first stage.
+    """
+
+    def __init__(self, name, cmd, total_frames, output, folder=None, on_done=None, stages=None, temp_files=(),
+                 extra_outputs=None):
+        self.id = next(_job_ids)
+        self.name = name
+        self.stages = stages or [[cmd]]
+        self.total_frames = max(1, total_frames)
+        self.output = output
+        self.extra_outputs = extra_outputs or {}  # name: path written by the same ffmpeg run
+        self.folder = folder  # flipbook version folder whose sidecar gets the result
+        self.on_done = on_done
+        self.temp_files = list(temp_files)
+        self.state = QUEUED
+        self.stage = 0
+        self.frame = 0
+        self.fps = 0.0
+        self.started = None
+        self.finished = None
+        self.error = ""
+        self.processes = []  # [(QProcess, cmd)] of the running stage
+        self.stage_frames = {}
+        self.stage_fps = {}
+
+    @property
+    def cmd(self):
+        return self.stages[0][0]
+
+    @property
+    def percent(self):
+        if self.state == DONE:
+            return 100
+        return min(100, int(100 * self.frame / self.total_frames))
+
+    def eta_seconds(self):
+        if self.state != RUNNING or not self.started:
+            return None
+        # Average rate over the whole job, ffmpeg's own fps is per process
+        rate = self.frame / max(0.001, time.time() - self.started)
+        if rate <= 0:
+            return None
+        return (self.total_frames - self.frame) / rate
+
+
+def sequence_job(name, ffmpeg_bin, input_pattern, start, end, output, folder=None, on_done=None,
+                 framerate=24, segments=None, gop=ffmpeg.DEFAULT_GOP, extra_outputs=None, **encode):
+    """Encode job for an image sequence, split into parallel segments when it is long enough.
+
+    extra_outputs is [(name, multi_output_cmd output)], e.g. from
+    flipbook_profiles.extra_outputs. They are written by the same ffmpeg
+    run as the review MP4 so the frames are only decoded once, which
+    means such jobs are not split into segments.
+    """
+    total = end - start + 1
+    if extra_outputs:
+        outputs = [ffmpeg.x264_output(output, **encode)] + [out for _, out in extra_outputs]
+        cmd = ffmpeg.multi_output_cmd(ffmpeg_bin, ffmpeg.sequence_input_args(input_pattern, start, framerate), outputs)
+        return EncodeJob(name, cmd, total, output, folder, on_done,
+                         extra_outputs={extra_name: out["path"] for extra_name, out in extra_outputs})
+
+    segments = segments or ffmpeg.default_segments()
+    ranges = ffmpeg.segment_ranges(start, end, segments, gop)
+    if len(ranges) < 2 or total < ffmpeg.MIN_SEGMENT_FRAMES * 2:
+        cmd = ffmpeg.sequence_to_mp4_cmd(ffmpeg_bin, input_pattern, start, output, framerate, **encode)
+        return EncodeJob(name, cmd, total, output, folder, on_done)
+
+    root, ext = os.path.splitext(output)
+    threads = max(1, (os.cpu_count() or 1) // len(ranges))
+    segment_paths = [f"{root}.part{n:03d}{ext}" for n in range(len(ranges))]
+    segment_cmds = [ffmpeg.segment_cmd(ffmpeg_bin, input_pattern, first, last, path, framerate,
+                                       gop=gop, threads=threads, **encode)
+                    for (first, last), path in zip(ranges, segment_paths)]
+    list_path = ffmpeg.write_concat_list(root + ".concat.txt", segment_paths)
+    stages = [segment_cmds, [ffmpeg.concat_cmd(ffmpeg_bin, list_path, output)]]
+    return EncodeJob(name, None, total, output, folder, on_done, stages=stages,
+                     temp_files=segment_paths + [list_path])
+
+
+def format_eta(seconds):
+    if seconds is None:
+        return ""
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+class EncodeQueue(QtCore.QObject):
+    changed = QtCore.Signal()  # jobs added, removed or reordered
+    job_updated = QtCore.Signal(object)
+
+    def __init__(self, max_running=MAX_RUNNING, parent=None):
+        super().__init__(parent)
+        self.max_running = max_running
+        self.jobs = []
+
+    def submit(self, job):
+        self.jobs.append(job)
+        self.changed.emit()
+        self._start_next()
+        return job
+
+    def job(self, job_id):
+        for job in self.jobs:
+            if job.id == job_id:
+                return job
+        return None
+
+    def running(self):
+        return [job for job in self.jobs if job.state == RUNNING]
+
+    def cancel(self, job_id):
+        job = self.job(job_id)
+        if not job or job.state not in (QUEUED, RUNNING):
+            return
+        was_running = job.state == RUNNING
+        job.state = CANCELLED
+        if was_running and job.processes:
+            for process, _ in job.processes:
+                process.kill()  # _on_process_finished tidies up
+        else:
+            self._remove_files(job.temp_files)
+            self.job_updated.emit(job)
+
+    def move(self, job_id, delta):
+        """Reorder a queued job; delta=-1 moves it one place closer to starting."""
+        job = self.job(job_id)
+        if not job or job.state != QUEUED:
+            return
+        index = self.jobs.index(job)
+        target = min(max(0, index + delta), len(self.jobs) - 1)
+        self.jobs.insert(target, self.jobs.pop(index))
+        self.changed.emit()
+
+    def prioritise(self, job_id):
+        """Move a queued job in front of every other queued job."""
+        job = self.job(job_id)
+        if not job or job.state != QUEUED:
+            return
+        first_queued = next(i for i, j in enumerate(self.jobs) if j.state == QUEUED)
+        self.jobs.remove(job)
+        self.jobs.insert(first_queued, job)
+        self.changed.emit()
+
+    def clear_finished(self):
+        self.jobs = [job for job in self.jobs if job.state in (QUEUED, RUNNING)]
+        self.changed.emit()
+
+    def _start_next(self):
+        while len(self.running()) < self.max_running:
+            job = next((j for j in self.jobs if j.state == QUEUED), None)
+            if not job:
+                return
+            self._start(job)
+
+    def _start(self, job):
+        job.state = RUNNING
+        job.started = time.time()
+        self._start_stage(job)
+        self.job_updated.emit(job)
+
+    def _start_stage(self, job):
+        job.processes = []
+        job.stage_frames = {}
+        job.stage_fps = {}
+        for cmd in job.stages[job.stage]:
+            process = QtCore.QProcess(self)
+            process.setProgram(cmd[0])
+            process.setArguments(cmd[1:])
+            parser = ffmpeg.ProgressParser()
+            process.readyReadStandardOutput.connect(lambda p=process, pr=parser: self._read_progress(job, p, pr))
+            process.readyReadStandardError.connect(lambda p=process: self._read_errors(job, p))
+            process.finished.connect(lambda code, status, p=process: self._on_process_finished(
+                job, p, code if status == QtCore.QProcess.NormalExit else -1))
+            process.errorOccurred.connect(lambda err, p=process: self._on_error(job, p, err))
+            job.processes.append((process, cmd))
+        for process, _ in job.processes:
+            process.start()
+
+    def _read_progress(self, job, process, parser):
+        text = bytes(process.readAllStandardOutput()).decode("utf-8", "replace")
+        reports = parser.feed(text)
+        if reports and job.stage == 0:
+            job.stage_frames[id(process)] = ffmpeg.report_frame(reports[-1])
+            job.stage_fps[id(process)] = ffmpeg.report_fps(reports[-1])
+            job.frame = sum(job.stage_frames.values())
+            job.fps = sum(job.stage_fps.values())
+            self.job_updated.emit(job)
+
+    def _read_errors(self, job, process):
+        text = bytes(process.readAllStandardError()).decode("utf-8", "replace")
+        # -loglevel error keeps this short, hold on to the tail only
+        job.error = (job.error + text)[-4000:]
+
+    def _on_error(self, job, process, error):
+        if error == QtCore.QProcess.FailedToStart:
+            job.error = f"Could not start {process.program()}"
+            self._on_process_finished(job, process, -1)
+
+    def _on_process_finished(self, job, process, exit_code):
+        remaining = [(p, cmd) for p, cmd in job.processes if p is not process]
+        if len(remaining) == len(job.processes):
+            return  # already handled, e.g. errorOccurred followed by finished
+        job.processes = remaining
+        process.deleteLater()
+        if exit_code != 0 and job.state == RUNNING:
+            job.state = FAILED
+            for other, _ in remaining:
+                other.kill()
+        if job.processes:
+            return
+        if job.state == RUNNING and job.stage + 1 < len(job.stages):
+            job.stage += 1
+            self._start_stage(job)
+            return
+        self._on_finished(job)
+
+    def _on_finished(self, job):
+        job.finished = time.time()
+        if job.state == RUNNING:
+            job.state = DONE
+            job.frame = job.total_frames
+            if job.folder:
+                try:
+                    flipbook_meta.update_sidecar(
+                        job.folder, encode_seconds=round(job.finished - job.started, 2), mp4=job.output,
+                        encode_segments=len(job.stages[0]), outputs=job.extra_outputs)
+                except OSError as e:
+                    print(f"Could not update flipbook sidecar in {job.folder}: {e}")
+            if job.on_done:
+                try:
+                    job.on_done(job)
+                except Exception as e:
+                    print(f"Encode callback failed for {job.name}: {e}")
+        else:
+            self._remove_files([job.output] + list(job.extra_outputs.values()))
+            if job.state == FAILED:
+                print(f"Encode failed for {job.name}:\n{job.error}")
+        self._remove_files(job.temp_files)
+        self.job_updated.emit(job)
+        self._start_next()
+
+    def _remove_files(self, paths):
+        for path in paths:
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+            except OSError as e:
+                print(f"Could not remove {path}: {e}")
+
+
+class EncodeQueueWindow(QtWidgets.QWidget):
+    COLUMNS = ["Flipbook", "Status", "Progress", "FPS", "ETA"]
+
+    def __init__(self, queue, parent=None):
+        super().__init__(parent, QtCore.Qt.Window)
+        self.queue = queue
+        self.setWindowTitle("Flipbook Encodes")
+        self.resize(620, 260)
+
+        self.table = QtWidgets.QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(0, QtWidgets.QHeaderView.Stretch)
+        self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+
+        buttons = QtWidgets.QHBoxLayout()
+        for label, slot in (("Cancel", self.cancel_selected), ("Move Up", lambda: self.move_selected(-1)),
+                            ("Move Down", lambda: self.move_selected(1)), ("Run Next", self.prioritise_selected),
+                            ("Clear Finished", self.queue.clear_finished)):
+            btn = QtWidgets.QPushButton(label)
+            btn.clicked.connect(slot)
+            buttons.addWidget(btn)
+        buttons.addStretch()
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.addWidget(self.table)
+        layout.addLayout(buttons)
+
+        self.rows = {}
+        queue.changed.connect(self.rebuild)
+        queue.job_updated.connect(self.update_job)
+        # ETA keeps counting down between ffmpeg reports
+        self.timer = QtCore.QTimer(self)
+        self.timer.timeout.connect(self.update_running)
+        self.timer.start(1000)
+        self.rebuild()
+
+    def selected_job_id(self):
+        row = self.table.currentRow()
+        item = self.table.item(row, 0) if row >= 0 else None
+        return item.data(QtCore.Qt.UserRole) if item else None
+
+    def cancel_selected(self):
+        job_id = self.selected_job_id()
+        if job_id is not None:
+            self.queue.cancel(job_id)
+
+    def move_selected(self, delta):
+        job_id = self.selected_job_id()
+        if job_id is not None:
+            self.queue.move(job_id, delta)
+            self.select(job_id)
+
+    def prioritise_selected(self):
+        job_id = self.selected_job_id()
+        if job_id is not None:
+            self.queue.prioritise(job_id)
+            self.select(job_id)
+
+    def select(self, job_id):
+        if job_id in self.rows:
+            self.table.selectRow(self.rows[job_id])
+
+    def rebuild(self):
+        self.table.setRowCount(0)
+        self.rows = {}
+        for row, job in enumerate(self.queue.jobs):
+            self.table.insertRow(row)
+            name = QtWidgets.QTableWidgetItem(job.name)
+            name.setData(QtCore.Qt.UserRole, job.id)
+            name.setToolTip(job.output)
+            self.table.setItem(row, 0, name)
+            for col in range(1, len(self.COLUMNS)):
+                if col != 2:
+                    self.table.setItem(row, col, QtWidgets.QTableWidgetItem())
+            bar = QtWidgets.QProgressBar()
+            bar.setRange(0, 100)
+            self.table.setCellWidget(row, 2, bar)
+            self.rows[job.id] = row
+            self.update_job(job)
+
+    def update_job(self, job):
+        row = self.rows.get(job.id)
+        if row is None:
+            return
+        self.table.item(row, 1).setText(job.state)
+        self.table.item(row, 1).setToolTip(job.error if job.state == FAILED else "")
+        self.table.cellWidget(row, 2).setValue(job.percent)
+        self.table.item(row, 3).setText(f"{job.fps:.1f}" if job.state == RUNNING else "")
+        self.table.item(row, 4).setText(format_eta(job.eta_seconds()))
+
+    def update_running(self):
+        if not self.isVisible():
+            return
+        for job in self.queue.running():
+            self.update_job(job)
+
+
+_queue = None
+_window = None
+
+
+def shared_queue():
+    """The session's encode queue, created on first use."""
+    global _queue
+    try:
+        import hou
+        # Survives the pixellab modules being reloaded during the session
+        queue = getattr(hou.session, "pixellab_encode_queue", None)
+        if queue is None:
+            queue = hou.session.pixellab_encode_queue = EncodeQueue()
+        return queue
+    except ImportError:
+        if _queue is None:
+            _queue = EncodeQueue()
+        return _queue
+
+
+def show_queue_window(parent=None):
+    global _window
+    if _window is None:
+        _window = EncodeQueueWindow(shared_queue(), parent)
+    _window.show()
+    _window.raise_()
+    return _window
@@ -0,0 +1,250 @@
+"""ffmpeg lookup, command building and -progress parsing for the flipbook tools."""
+import os
+import shutil
+
+DEFAULT_GOP = 48
+MIN_SEGMENT_FRAMES = 4 * DEFAULT_GOP
+
+
+def get_ffmpeg_bin():
+    pixellab = os.getenv("PIXELLAB")
+    if not pixellab:
+        raise RuntimeError("Environment variable PIXELLAB is not set.")
+    ffmpeg = os.path.join(pixellab, "ffmpeg", "bin", "ffmpeg.exe" if os.name == "nt" else "ffmpeg")
+    if not os.path.exists(ffmpeg):
+        raise RuntimeError(f"ffmpeg not found at:\n{ffmpeg}")
+    return ffmpeg
+
+
+def find_ffmpeg(explicit=None):
+    """ffmpeg for command line tools: explicit path, then $PIXELLAB, then PATH."""
+    if explicit:
+        return explicit
+    try:
+        return get_ffmpeg_bin()
+    except RuntimeError:
+        found = shutil.which("ffmpeg")
+        if not found:
+            raise
+        return found
+
+
+def even_size_args(pix_fmt):
+    # 4:2:0 chroma needs even dimensions, crop the odd row/column if there is one
+    if pix_fmt.endswith("420p"):
+        return ["-vf", "crop=trunc(iw/2)*2:trunc(ih/2)*2"]
+    return []
+
+
+def sequence_to_mp4_cmd(ffmpeg_bin, input_pattern, start_frame, output, framerate=24,
+                        preset="veryslow", crf=0, pix_fmt="yuv444p"):
+    """Encode a printf-style image sequence, reporting progress on stdout."""
+    return [
+        ffmpeg_bin,
+        "-y",
+        "-hide_banner",
+        "-loglevel", "error",
+        "-nostats",
+        "-progress", "pipe:1",
+        "-start_number", str(start_frame),
+        "-framerate", str(framerate),
+        "-i", input_pattern,
+        "-c:v", "libx264",
+        "-preset", preset,
+        "-crf", str(crf),
+        "-pix_fmt", pix_fmt,
+    ] + even_size_args(pix_fmt) + [output]
+
+
+def rawvideo_to_mp4_cmd(ffmpeg_bin, width, height, output, framerate=24,
+                        preset="veryslow", crf=0, pix_fmt="yuv444p"):
+    """Encode packed rgb24 frames written to ffmpeg's stdin."""
+    return [
+        ffmpeg_bin,
+        "-y",
+        "-hide_banner",
+        "-loglevel", "error",
+        "-f", "rawvideo",
+        "-pix_fmt", "rgb24",
+        "-s", f"{width}x{height}",
+        "-framerate", str(framerate),
+        "-i", "pipe:0",
+        "-c:v", "libx264",
+        "-preset", preset,
+        "-crf", str(crf),
+        "-pix_fmt", pix_fmt,
+    ] + even_size_args(pix_fmt) + [output]
+
+
+def default_segments():
+    """Parallel encodes per job; libx264 still threads within each one."""
+    env = os.getenv("PIXELLAB_ENCODE_SEGMENTS")
+    if env:
+        return max(1, int(env))
+    return max(1, (os.cpu_count() or 1) // 4)
+
+
+def segment_ranges(start, end, segments, gop):
+    """Split start..end into at most `segments` ranges that begin on a GOP boundary."""
+    total = end - start + 1
+    gops = -(-total // gop)
+    segments = max(1, min(segments, gops))
+    ranges = []
+    first = start
+    for n in range(segments):
+        # Spread whole GOPs as evenly as possible, the last segment takes the remainder
+        count = gops // segments + (1 if n < gops % segments else 0)
+        last = min(end, first + count * gop - 1)
+        ranges.append((first, last))
+        first = last + 1
+    return ranges
+
+
+def segment_cmd(ffmpeg_bin, input_pattern, first, last, output, framerate=24, preset="veryslow", crf=0,
+                pix_fmt="yuv444p", gop=48, threads=0):
+    """Encode one GOP-aligned piece of a sequence for joining with concat_cmd.
+
+    Every segment gets the same fixed GOP and no scene-cut keyframes so the
+    pieces are identical in structure to a single encode and can be joined
+    without re-encoding.
+    """
+    return [
+        ffmpeg_bin,
+        "-y",
+        "-hide_banner",
+        "-loglevel", "error",
+        "-nostats",
+        "-progress", "pipe:1",
+        "-start_number", str(first),
+        "-framerate", str(framerate),
+        "-i", input_pattern,
+        "-frames:v", str(last - first + 1),
+        "-c:v", "libx264",
+        "-preset", preset,
+        "-crf", str(crf),
+        "-pix_fmt", pix_fmt,
+        "-g", str(gop),
+        "-keyint_min", str(gop),
+        "-sc_threshold", "0",
+        "-threads", str(threads),
+    ] + even_size_args(pix_fmt) + [output]
+
+
+def write_concat_list(path, segment_paths):
+    with open(path, "w", encoding="utf-8") as f:
+        for segment in segment_paths:
+            # concat demuxer quoting: close the quote, escape, reopen
+            escaped = segment.replace("\\", "/").replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+    return path
+
+
+def concat_cmd(ffmpeg_bin, list_path, output):
+    """Join segments listed by write_concat_list without re-encoding."""
+    return [
+        ffmpeg_bin,
+        "-y",
+        "-hide_banner",
+        "-loglevel", "error",
+        "-nostats",
+        "-progress", "pipe:1",
+        "-f", "concat",
+        "-safe", "0",
+        "-i", list_path,
+        "-c", "copy",
+        "-movflags", "+faststart",
+        output,
+    ]
+
+
+def sequence_input_args(input_pattern, start_frame, framerate=24):
+    return ["-start_number", str(start_frame), "-framerate", str(framerate), "-i", input_pattern]
+
+
+def rawvideo_input_args(width, height, framerate=24):
+    return ["-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}", "-framerate", str(framerate),
+            "-i", "pipe:0"]
+
+
+def x264_output(path, preset="veryslow", crf=0, pix_fmt="yuv444p"):
+    """Output for multi_output_cmd matching sequence_to_mp4_cmd's encode."""
+    even = even_size_args(pix_fmt)
+    return {
+        "path": path,
+        "filters": even[1] if even else None,
+        "args": ["-c:v", "libx264", "-preset", preset, "-crf", str(crf), "-pix_fmt", pix_fmt],
+    }
+
+
+def multi_output_cmd(ffmpeg_bin, input_args, outputs):
+    """Decode the input once and fan it out to several outputs with split.
+
+    Each output is {"path", "filters", "args", "palette"}: filters is an
+    optional filter chain for that branch, args the codec options, and
+    palette builds a per-clip palette for GIFs.
+    """
+    count = len(outputs)
+    graph = []
+    if count > 1:
+        graph.append("[0:v]split=%d%s" % (count, "".join(f"[s{i}]" for i in range(count))))
+    for i, output in enumerate(outputs):
+        source = f"[s{i}]" if count > 1 else "[0:v]"
+        filters = output.get("filters") or "null"
+        if output.get("palette"):
+            graph.append(f"{source}{filters},split[a{i}][b{i}]")
+            graph.append(f"[a{i}]palettegen[p{i}]")
+            graph.append(f"[b{i}][p{i}]paletteuse[o{i}]")
+        else:
+            graph.append(f"{source}{filters}[o{i}]")
+
+    cmd = [
+        ffmpeg_bin,
+        "-y",
+        "-hide_banner",
+        "-loglevel", "error",
+        "-nostats",
+        "-progress", "pipe:1",
+    ] + list(input_args) + ["-filter_complex", ";".join(graph)]
+    for i, output in enumerate(outputs):
+        cmd += ["-map", f"[o{i}]"] + list(output["args"]) + [output["path"]]
+    return cmd
+
+
+class ProgressParser:
+    """Turns ffmpeg -progress key=value output into one dict per report.
+
+    ffmpeg ends every report with progress=continue (or progress=end on
+    the last one), so a report is complete when that key arrives.
+    """
+
+    def __init__(self):
+        self._partial = ""
+        self._current = {}
+
+    def feed(self, text):
+        reports = []
+        lines = (self._partial + text).split("\n")
+        self._partial = lines.pop()
+        for line in lines:
+            key, sep, value = line.strip().partition("=")
+            if not sep:
+                continue
+            self._current[key] = value.strip()
+            if key == "progress":
+                reports.append(self._current)
+                self._current = {}
+        return reports
+
+
+def report_frame(report):
+    try:
+        return int(report.get("frame", 0))
+    except ValueError:
+        return 0
+
+
+def report_fps(report):
+    try:
+        return float(report.get("fps", 0.0))
+    except ValueError:
+        return 0.0
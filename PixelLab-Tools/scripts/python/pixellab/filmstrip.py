@@ -0,0 +1,93 @@
+"""Hover-scrub filmstrips for flipbooks.
+
+A filmstrip is N evenly spaced frames of a flipbook, downsampled to
+thumbnail size and packed into one .npz under the PixelLab cache together
+with the names of the frames it was built from. Hovering only indexes into
+the already decoded frames.
+"""
+import os
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from pixellab import cache, images
+
+FILMSTRIP_FRAMES = int(os.getenv("PIXELLAB_FILMSTRIP_FRAMES", "12"))
+FILMSTRIP_SIZE = (160, 90)
+
+
+def pick_paths(paths, count=FILMSTRIP_FRAMES):
+    """count evenly spaced paths including the first and last frame."""
+    if len(paths) <= count:
+        return list(paths)
+    if count < 2:
+        return [paths[0]]
+    return [paths[round(i * (len(paths) - 1) / (count - 1))] for i in range(count)]
+
+
+def _newest_mtime(paths):
+    newest = 0.0
+    for path in paths:
+        try:
+            newest = max(newest, os.path.getmtime(path))
+        except OSError:
+            return None
+    return newest
+
+
+def load_filmstrip(folder, paths):
+    """Cached (n, h, w, 3) uint8 frames for paths, or None if missing or stale."""
+    strip_path = cache.filmstrip_path(folder)
+    try:
+        strip_mtime = os.path.getmtime(strip_path)
+        newest = _newest_mtime(paths)
+        if newest is None or strip_mtime < newest:
+            return None
+        with np.load(strip_path) as data:
+            if list(data["sources"]) != [os.path.basename(p) for p in paths]:
+                return None
+            return data["frames"]
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def build_filmstrip(paths, size=FILMSTRIP_SIZE):
+    """(frames, paths that decoded); unreadable frames are left out of both."""
+    tiles = []
+    decoded = []
+    for path in paths:
+        rgb, _ = images.read_rgb(path, max_size=size)
+        if rgb is None:
+            continue
+        tiles.append(images.fit_tile(images.display_uint8(rgb, path), size[0], size[1]))
+        decoded.append(path)
+    if not tiles:
+        return None, []
+    return np.stack(tiles), decoded
+
+
+def write_filmstrip(folder, frames, paths):
+    strip_path = cache.filmstrip_path(folder)
+    os.makedirs(os.path.dirname(strip_path), exist_ok=True)
+    tmp_path = strip_path + ".partial"
+    # np.savez appends .npz to bare filenames, hand it a file object instead
+    with open(tmp_path, "wb") as f:
+        np.savez(f, frames=frames, sources=np.array([os.path.basename(p) for p in paths]))
+    os.replace(tmp_path, strip_path)
+
+
+def filmstrip(folder, paths, count=FILMSTRIP_FRAMES, size=FILMSTRIP_SIZE):
+    """Frames for a flipbook's filmstrip, building and caching them if needed."""
+    picked = pick_paths(paths, count)
+    if not picked:
+        return None
+    frames = load_filmstrip(folder, picked)
+    if frames is None:
+        frames, decoded = build_filmstrip(picked, size)
+        # A strip short of frames would pass the sources check with every
+        # hover position shifted, so only complete strips are cached
+        if frames is not None and len(decoded) == len(picked):
+            write_filmstrip(folder, frames, decoded)
+    return frames
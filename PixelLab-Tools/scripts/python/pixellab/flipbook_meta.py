@@ -0,0 +1,101 @@
+"""JSON sidecar written next to each flipbook version.
+
+The flipbook tools already know the frame range, resolution, camera and
+naming when they render, so they record it here and the browsers read it
+back instead of opening and regex-parsing the frames.
+"""
+import getpass
+import json
+import os
+import time
+
+from pixellab import progressive
+
+SIDECAR_NAME = "flipbook.json"
+
+
+def sidecar_path(folder):
+    return os.path.join(folder, SIDECAR_NAME)
+
+
+def read_sidecar(folder):
+    try:
+        with open(sidecar_path(folder), "r") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else None
+    except (OSError, ValueError):
+        return None
+
+
+def write_sidecar(folder, data):
+    path = sidecar_path(folder)
+    tmp_path = path + ".partial"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+    return data
+
+
+def update_sidecar(folder, **fields):
+    data = read_sidecar(folder) or {}
+    data.update(fields)
+    return write_sidecar(folder, data)
+
+
+def new_sidecar(folder, tool, hip_name, version, camera, resolution, frame_range,
+                frame_pattern, render_seconds=None, **extra):
+    """Start a sidecar for a freshly rendered version.
+
+    frame_pattern is printf style relative to the folder, e.g.
+    "shot_V003.%04d.exr", the same string ffmpeg is given.
+    """
+    data = {
+        "tool": tool,
+        "hip_name": hip_name,
+        "version": version,
+        "camera": camera,
+        "resolution": list(resolution),
+        "frame_range": list(frame_range),
+        "frame_pattern": frame_pattern,
+        "user": getpass.getuser(),
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "render_seconds": render_seconds,
+        "encode_seconds": None,
+    }
+    data.update(extra)
+    return write_sidecar(folder, data)
+
+
+def is_partial(data):
+    """True while a progressive flipbook is still filling in frames."""
+    return data.get("progressive_step", 1) != 1
+
+
+def frame_paths(folder, data):
+    """Expected frame paths from a sidecar, without listing the folder.
+
+    While a progressive flipbook is rendering, frames that are not done yet
+    hold the nearest finished one, so the list always covers the full range.
+    Versions whose frames were cleaned up have none.
+    """
+    pattern = data.get("frame_pattern")
+    frame_range = data.get("frame_range")
+    if not pattern or not frame_range or data.get("frames_deleted"):
+        return []
+    start, end = int(frame_range[0]), int(frame_range[1])
+    if is_partial(data):
+        step = data.get("progressive_step")
+        if not step:
+            return []  # the first pass has not finished
+        frames = progressive.hold_frames(start, end, step)
+    else:
+        frames = range(start, end + 1)
+    return [os.path.join(folder, pattern % f) for f in frames]
+
+
+def houdini_pattern(folder, data):
+    """Sidecar frame pattern as a $F pattern for mplay."""
+    pattern = data.get("frame_pattern", "")
+    prefix, _, rest = pattern.partition("%0")
+    padding, _, suffix = rest.partition("d")
+    return os.path.join(folder, f"{prefix}$F{padding}{suffix}")
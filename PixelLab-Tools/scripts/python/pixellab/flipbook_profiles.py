@@ -0,0 +1,216 @@
+"""Flipbook intermediate formats and MP4 encode presets.
+
+The flipbook tools pick one intermediate (what the ROP writes per frame)
+and one encode preset (how ffmpeg makes the MP4). The studio defaults come
+from PIXELLAB_FLIPBOOK_INTERMEDIATE and PIXELLAB_FLIPBOOK_ENCODE and are
+meant to be chosen from the benchmark, which writes our own frames in
+every intermediate and encodes each with every preset:
+
+    python -m pixellab.flipbook_profiles /path/to/render/layer --frames 48
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import namedtuple
+
+from pixellab import ffmpeg, images
+from pixellab.sequences import scan_sequence
+
+Intermediate = namedtuple("Intermediate", "label ext rop_parms pixel_type compression")
+EncodePreset = namedtuple("EncodePreset", "label preset crf pix_fmt")
+
+# pixel_type is an oiio type name; None means 8-bit display-referred. Only
+# formats and bit depths the OpenGL ROP can be told to write belong here;
+# it has no parm for EXR compression, so EXRs keep its default.
+INTERMEDIATES = {
+    "exr": Intermediate("Float EXR", ".exr", {"usehdr": 2}, "float", "zip"),
+    "exr_half": Intermediate("Half EXR", ".exr", {"usehdr": 1}, "half", "zip"),
+    "png": Intermediate("8-bit PNG", ".png", {"usehdr": 0}, None, None),
+    "jpeg": Intermediate("JPEG", ".jpg", {"usehdr": 0}, None, None),
+}
+
+# Names older sidecars and settings may still use -> the intermediate that matches their frames.
+# exr_dwaa only ever got its half floats from the ROP, never the DWAA compression.
+RETIRED_INTERMEDIATES = {"exr_dwaa": "exr_half"}
+
+# Bit depth is a ROP parm; the viewport flipbook only picks the format from the extension
+ROP_ONLY_INTERMEDIATES = {"exr_half"}
+
+ENCODE_PRESETS = {
+    "fast": EncodePreset("Fast review", "veryfast", 23, "yuv420p"),
+    "balanced": EncodePreset("Balanced", "medium", 18, "yuv420p"),
+    "archival": EncodePreset("Archival (lossless)", "veryslow", 0, "yuv444p"),
+}
+
+ExtraOutput = namedtuple("ExtraOutput", "label subfolder ext filters args palette")
+
+# Written next to the review MP4 from the same decode, each in its own mp4/ subfolder
+EXTRA_OUTPUTS = {
+    "proxy": ExtraOutput("Half-res proxy", "proxy", ".mp4", "scale=trunc(iw/4)*2:trunc(ih/4)*2",
+                         ["-c:v", "libx264", "-preset", "veryfast", "-crf", "23", "-pix_fmt", "yuv420p"], False),
+    "gif": ExtraOutput("GIF", "gif", ".gif", "fps=12,scale=480:-1:flags=lanczos", ["-loop", "0"], True),
+    "webm": ExtraOutput("WebM", "webm", ".webm", "scale=640:-2",
+                        ["-c:v", "libvpx-vp9", "-b:v", "0", "-crf", "35", "-row-mt", "1"], False),
+}
+
+
+def default_intermediate():
+    name = os.getenv("PIXELLAB_FLIPBOOK_INTERMEDIATE", "exr")
+    name = RETIRED_INTERMEDIATES.get(name, name)
+    return name if name in INTERMEDIATES else "exr"
+
+
+def default_encode():
+    name = os.getenv("PIXELLAB_FLIPBOOK_ENCODE", "archival")
+    return name if name in ENCODE_PRESETS else "archival"
+
+
+def encode_args(name):
+    preset = ENCODE_PRESETS[name]
+    return {"preset": preset.preset, "crf": preset.crf, "pix_fmt": preset.pix_fmt}
+
+
+def default_outputs():
+    names = os.getenv("PIXELLAB_FLIPBOOK_OUTPUTS", "")
+    return [name.strip() for name in names.split(",") if name.strip() in EXTRA_OUTPUTS]
+
+
+def extra_outputs(mp4_dir, basename, names):
+    """[(name, multi_output_cmd output)] for the chosen extras, creating their folders."""
+    outputs = []
+    for name in names:
+        extra = EXTRA_OUTPUTS[name]
+        folder = os.path.join(mp4_dir, extra.subfolder)
+        os.makedirs(folder, exist_ok=True)
+        outputs.append((name, {
+            "path": os.path.join(folder, basename + extra.ext),
+            "filters": extra.filters,
+            "args": extra.args,
+            "palette": extra.palette,
+        }))
+    return outputs
+
+
+def apply_rop_parms(rop, name):
+    """Set the intermediate's ROP parms that this ROP actually has."""
+    for parm_name, value in INTERMEDIATES[name].rop_parms.items():
+        parm = rop.parm(parm_name)
+        if parm:
+            parm.set(value)
+
+
+def write_intermediate(path, rgb, source_path, name):
+    """Write float RGB read from source_path the way the ROP would for this intermediate."""
+    intermediate = INTERMEDIATES[name]
+    if intermediate.pixel_type:
+        pixel_type = getattr(images.oiio, intermediate.pixel_type.upper())
+        return images.write_image(path, rgb, pixel_type=pixel_type, compression=intermediate.compression)
+    return images.write_image(path, images.display_uint8(rgb, source_path))
+
+
+def _folder_bytes(folder):
+    return sum(entry.stat().st_size for entry in os.scandir(folder) if entry.is_file())
+
+
+def benchmark(seq, frames, ffmpeg_bin, workdir, intermediates=None, encodes=None, framerate=24):
+    """[{intermediate, encode, frames_bytes, frames_seconds, mp4_bytes, encode_seconds, error}]"""
+    rows = []
+    for inter_name in intermediates or list(INTERMEDIATES):
+        ext = INTERMEDIATES[inter_name].ext
+        folder = os.path.join(workdir, inter_name)
+        os.makedirs(folder, exist_ok=True)
+        pattern = os.path.join(folder, "frame.%04d" + ext)
+
+        # Reading the source is common to every intermediate, keep it out of the timing
+        write_seconds = 0.0
+        for n, frame in enumerate(frames):
+            rgb, _ = images.read_rgb(seq.path(frame))
+            if rgb is None:
+                raise IOError(f"Could not read {seq.path(frame)}")
+            began = time.time()
+            write_intermediate(pattern % n, rgb, seq.path(frame), inter_name)
+            write_seconds += time.time() - began
+        frames_bytes = _folder_bytes(folder)
+
+        for encode_name in encodes or list(ENCODE_PRESETS):
+            mp4_path = os.path.join(workdir, f"{inter_name}_{encode_name}.mp4")
+            cmd = ffmpeg.sequence_to_mp4_cmd(ffmpeg_bin, pattern, 0, mp4_path, framerate,
+                                             **encode_args(encode_name))
+            began = time.time()
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            encode_seconds = time.time() - began
+            ok = result.returncode == 0 and os.path.exists(mp4_path)
+            rows.append({
+                "intermediate": inter_name,
+                "encode": encode_name,
+                "frames_bytes": frames_bytes,
+                "frames_seconds": round(write_seconds, 3),
+                "mp4_bytes": os.path.getsize(mp4_path) if ok else None,
+                "encode_seconds": round(encode_seconds, 3),
+                "error": None if ok else (result.stderr.decode("utf-8", "replace").strip()[-500:] or "no output"),
+            })
+    return rows
+
+
+def _mb(size):
+    return "-" if size is None else f"{size / (1024.0 * 1024.0):.1f}"
+
+
+def format_rows(rows, frame_count):
+    lines = [f"{'intermediate':<10} {'encode':<9} {'frames MB':>10} {'write s':>8} {'mp4 MB':>8} "
+             f"{'encode s':>9} {'total s/frame':>14}"]
+    for row in rows:
+        per_frame = (row["frames_seconds"] + row["encode_seconds"]) / max(1, frame_count)
+        line = (f"{row['intermediate']:<10} {row['encode']:<9} {_mb(row['frames_bytes']):>10} "
+                f"{row['frames_seconds']:>8.2f} {_mb(row['mp4_bytes']):>8} {row['encode_seconds']:>9.2f} "
+                f"{per_frame:>14.3f}")
+        if row["error"]:
+            line += f"  FAILED: {row['error'].splitlines()[-1]}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure flipbook intermediates and encode presets on a real sequence.")
+    parser.add_argument("sequence", help="folder holding a rendered or flipbooked image sequence")
+    parser.add_argument("--frames", type=int, default=48, help="evenly spaced frames to use")
+    parser.add_argument("--intermediates", nargs="+", choices=list(INTERMEDIATES))
+    parser.add_argument("--encodes", nargs="+", choices=list(ENCODE_PRESETS))
+    parser.add_argument("--ffmpeg", help="ffmpeg binary, defaults to $PIXELLAB/ffmpeg or PATH")
+    parser.add_argument("--keep", help="write into this folder and keep the results")
+    parser.add_argument("--json", help="also write the rows to this JSON file")
+    args = parser.parse_args(argv)
+
+    if not images.HAS_OIIO:
+        parser.error("OpenImageIO is needed to write the intermediates")
+    seq = scan_sequence(args.sequence)
+    if not seq:
+        parser.error(f"No image sequence in {args.sequence}")
+    all_frames = sorted(seq.frames)
+    step = max(1, len(all_frames) // max(1, args.frames))
+    frames = all_frames[::step][:args.frames]
+
+    ffmpeg_bin = ffmpeg.find_ffmpeg(args.ffmpeg)
+
+    workdir = args.keep or tempfile.mkdtemp(prefix="pixellab_bench_")
+    try:
+        rows = benchmark(seq, frames, ffmpeg_bin, workdir, args.intermediates, args.encodes)
+    finally:
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"{len(frames)} frames from {args.sequence}")
+    print(format_rows(rows, len(frames)))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
+    return 0 if all(not row["error"] for row in rows) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
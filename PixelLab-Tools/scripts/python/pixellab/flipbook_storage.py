@@ -0,0 +1,175 @@
+"""Disk usage and retention for $HIP/Flipbooks.
+
+One scan walks the Flipbooks tree and records, per version folder, the
+bytes taken by its frames and whether its MP4 is a verified, complete
+encode. plan_cleanup turns that scan into a list of deletions and
+delete_frames carries them out without rescanning.
+
+Retention: the frames of the newest keep_last versions are always kept
+so recent work can still be scrubbed and re-encoded. Older versions lose
+their frames only once their MP4 is verified; a version without one is
+never touched. Sidecars and MP4s are kept, and the sidecar is marked
+frames_deleted so the browsers stop listing the folder.
+"""
+import os
+import re
+import struct
+import time
+
+from pixellab import flipbook_meta
+
+VERSION_RE = re.compile(r"V\d{3,}$")
+FRAME_EXTS = (".exr", ".png", ".jpg", ".jpeg", ".tif", ".tiff")
+DEFAULT_KEEP_LAST = 3
+
+
+class VersionUsage:
+    def __init__(self, name, folder, meta):
+        self.name = name
+        self.folder = folder
+        self.meta = meta
+        self.frames = []  # paths
+        self.frame_bytes = 0
+        self.other_bytes = 0
+        self.mp4 = None
+        self.mp4_bytes = 0
+        self.verified = False
+
+    @property
+    def total_bytes(self):
+        return self.frame_bytes + self.other_bytes
+
+
+def mp4_complete(path):
+    """True if the top-level MP4 boxes cover the whole file and include moov and mdat.
+
+    A killed or still running ffmpeg leaves a file that ends mid-box or has
+    no moov, which is enough to tell a finished encode from a broken one
+    without decoding it.
+    """
+    try:
+        size = os.path.getsize(path)
+        seen = set()
+        offset = 0
+        with open(path, "rb") as f:
+            while offset < size:
+                f.seek(offset)
+                header = f.read(8)
+                if len(header) < 8:
+                    return False
+                box_size, box_type = struct.unpack(">I4s", header)
+                if box_size == 1:
+                    box_size = struct.unpack(">Q", f.read(8))[0]
+                elif box_size == 0:
+                    box_size = size - offset  # extends to the end of the file
+                if box_size < 8:
+                    return False
+                seen.add(box_type)
+                offset += box_size
+        return offset == size and b"moov" in seen and b"mdat" in seen
+    except (OSError, struct.error):
+        return False
+
+
+def _frame_names(meta):
+    pattern = meta.get("frame_pattern")
+    frame_range = meta.get("frame_range")
+    if not pattern or not frame_range:
+        return None
+    return {pattern % f for f in range(int(frame_range[0]), int(frame_range[1]) + 1)}
+
+
+def scan(root):
+    """[VersionUsage] for every Vnnn folder under root, oldest first, plus the bytes in root/mp4."""
+    versions = []
+    mp4s = {}
+    mp4_bytes = 0
+    try:
+        # By number, V1000 comes after V999
+        entries = sorted(os.scandir(root), key=lambda e: (int(e.name[1:]) if VERSION_RE.match(e.name) else -1, e.name))
+    except OSError:
+        return versions, mp4_bytes
+
+    mp4_dir = os.path.join(root, "mp4")
+    if os.path.isdir(mp4_dir):
+        for dirpath, _, filenames in os.walk(mp4_dir):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    size = os.path.getsize(path)
+                except OSError:
+                    continue
+                mp4_bytes += size
+                if dirpath == mp4_dir and name.lower().endswith(".mp4"):
+                    mp4s[name] = (path, size)
+
+    for entry in entries:
+        if not entry.is_dir() or not VERSION_RE.match(entry.name):
+            continue
+        meta = flipbook_meta.read_sidecar(entry.path) or {}
+        usage = VersionUsage(entry.name, entry.path, meta)
+        names = None if meta.get("frames_deleted") else _frame_names(meta)
+        for child in os.scandir(entry.path):
+            if not child.is_file():
+                continue
+            size = child.stat().st_size
+            is_frame = (child.name in names) if names is not None else child.name.lower().endswith(FRAME_EXTS)
+            if is_frame:
+                usage.frames.append(child.path)
+                usage.frame_bytes += size
+            else:
+                usage.other_bytes += size
+
+        # The sidecar names the MP4; older flipbooks only follow the <hip>.<version>.mp4 convention
+        mp4 = meta.get("mp4")
+        if mp4 and os.path.exists(mp4):
+            usage.mp4, usage.mp4_bytes = mp4, os.path.getsize(mp4)
+        else:
+            for name, (path, size) in mp4s.items():
+                if name.endswith(f".{entry.name}.mp4"):
+                    usage.mp4, usage.mp4_bytes = path, size
+                    break
+        usage.verified = bool(usage.mp4) and not flipbook_meta.is_partial(meta) and mp4_complete(usage.mp4)
+        versions.append(usage)
+    return versions, mp4_bytes
+
+
+def plan_cleanup(versions, keep_last=DEFAULT_KEEP_LAST):
+    """Versions whose frames can go: older than the newest keep_last and with a verified MP4."""
+    older = versions[:-keep_last] if keep_last > 0 else versions
+    return [v for v in older if v.frames and v.verified]
+
+
+def delete_frames(versions, progress=None, cancel_event=None):
+    """Delete the scanned frames of each version. Returns (freed bytes, [(version name, error)])."""
+    freed = 0
+    errors = []
+    for n, usage in enumerate(versions):
+        if cancel_event is not None and cancel_event.is_set():
+            break
+        removed = 0
+        for path in usage.frames:
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+                removed += size
+            except OSError as e:
+                errors.append((usage.name, str(e)))
+        freed += removed
+        usage.frames = []
+        usage.frame_bytes = 0
+        try:
+            flipbook_meta.update_sidecar(usage.folder, frames_deleted=time.strftime("%Y-%m-%d %H:%M:%S"))
+        except OSError as e:
+            errors.append((usage.name, str(e)))
+        if progress:
+            progress(n + 1, len(versions), usage.name)
+    return freed, errors
+
+
+def format_bytes(size):
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024.0
+    return f"{size:.1f} PB"
@@ -0,0 +1,262 @@
+"""Frame sets stored as sorted (first, last, step) runs.
+
+A Deadline job of 1-100000 or a render folder with a few gaps is a
+handful of runs, so parsing, counting, membership and set operations cost
+per run instead of per frame. Frame-list syntax follows Deadline:
+
+    FrameSet.parse("1-100x4,120,130-150:2,-10--1")
+
+Union, intersection and difference sweep the run boundaries of both sets.
+Within each stretch between boundaries either set holds at most one run,
+and the result is worked out arithmetically; only where two runs with
+different steps interleave is that stretch expanded to frames.
+"""
+import bisect
+import re
+
+from math import gcd
+
+_TOKEN = re.compile(r"^(-?\d+)(?:-(-?\d+))?(?:x(\d+))?$")
+_STEP_WORD = re.compile(r"\s*(?:x|:|step|by)\s*", re.IGNORECASE)
+_DASH = re.compile(r"(\d)\s*-\s*(?=-?\d)")
+
+
+def _run(first, last, step):
+    """Run clipped so last is on the step; single frames always have step 1."""
+    step = max(1, step)
+    last = first + (last - first) // step * step
+    return (first, last, step if last > first else 1)
+
+
+def _clip(run, lo, hi):
+    """Part of run inside lo..hi-1, or None."""
+    first, last, step = run
+    if first < lo:
+        first += -(-(lo - first) // step) * step
+    if last >= hi:
+        last = first + (hi - 1 - first) // step * step if hi - 1 >= first else first - 1
+    return _run(first, last, step) if first <= last else None
+
+
+def _contains(run, frame):
+    first, last, step = run
+    return first <= frame <= last and (frame - first) % step == 0
+
+
+def _subset(a, b):
+    """Every frame of run a is in run b."""
+    if a[0] == a[1]:
+        return _contains(b, a[0])
+    return b[0] <= a[0] and a[1] <= b[1] and a[2] % b[2] == 0 and (a[0] - b[0]) % b[2] == 0
+
+
+def _disjoint(a, b):
+    return (a[0] - b[0]) % gcd(a[2], b[2]) != 0
+
+
+def _frames(run):
+    return range(run[0], run[1] + 1, run[2])
+
+
+def runs_from_frames(frames):
+    """Sorted unique frames -> [(first, last, step)] runs of equal spacing."""
+    runs = []
+    i = 0
+    while i < len(frames):
+        first = frames[i]
+        if i + 1 == len(frames):
+            runs.append((first, first, 1))
+            break
+        step = frames[i + 1] - first
+        j = i + 1
+        while j + 1 < len(frames) and frames[j + 1] - frames[j] == step:
+            j += 1
+        runs.append((first, frames[j], step))
+        i = j + 1
+    return runs
+
+
+def _segment(a, b, op):
+    """Runs of a op b where a and b are runs (or None) clipped to the same stretch."""
+    if op == "|":
+        if a is None or b is None:
+            return [a or b] if (a or b) else []
+        if _subset(b, a):
+            return [a]
+        if _subset(a, b):
+            return [b]
+        frames = sorted(set(_frames(a)).union(_frames(b)))
+    elif op == "&":
+        if a is None or b is None or _disjoint(a, b):
+            return []
+        if _subset(a, b):
+            return [a]
+        if _subset(b, a):
+            return [b]
+        frames = [f for f in _frames(a) if _contains(b, f)]
+    else:
+        if a is None:
+            return []
+        if b is None or _disjoint(a, b):
+            return [a]
+        if _subset(a, b):
+            return []
+        frames = [f for f in _frames(a) if not _contains(b, f)]
+    return runs_from_frames(frames)
+
+
+def _merge(runs):
+    """Join neighbouring runs that continue each other."""
+    merged = []
+    for run in runs:
+        if merged:
+            first, last, step = merged[-1]
+            if run[0] == last + step and (run[2] == step or run[0] == run[1]):
+                merged[-1] = (first, run[1], step)
+                continue
+            if first == last and run[0] - last == run[2] and run[0] < run[1]:
+                merged[-1] = (first, run[1], run[2])
+                continue
+        merged.append(run)
+    return merged
+
+
+def _combine(a, b, op):
+    bounds = sorted({r[0] for r in a + b} | {r[1] + 1 for r in a + b})
+    out = []
+    ia = ib = 0
+    for lo, hi in zip(bounds, bounds[1:]):
+        while ia < len(a) and a[ia][1] < lo:
+            ia += 1
+        while ib < len(b) and b[ib][1] < lo:
+            ib += 1
+        ra = _clip(a[ia], lo, hi) if ia < len(a) and a[ia][0] < hi else None
+        rb = _clip(b[ib], lo, hi) if ib < len(b) and b[ib][0] < hi else None
+        out.extend(_segment(ra, rb, op))
+    return _merge(out)
+
+
+class FrameSet:
+    """Immutable set of frame numbers kept as disjoint sorted runs."""
+    __slots__ = ("_runs", "_firsts")
+
+    def __init__(self, runs=()):
+        # Only for runs that are already sorted and disjoint; use parse/from_frames/from_range otherwise
+        self._runs = _merge([_run(*run) for run in runs])
+        self._firsts = [run[0] for run in self._runs]
+
+    @classmethod
+    def parse(cls, text):
+        """Deadline frame list -> FrameSet. Tokens that are not frames are ignored."""
+        if not text:
+            return cls()
+        text = _DASH.sub(r"\1-", _STEP_WORD.sub("x", str(text)))
+        runs = []
+        for token in re.split(r"[,\s]+", text.strip()):
+            match = _TOKEN.match(token)
+            if not match:
+                continue
+            first = int(match.group(1))
+            last = int(match.group(2)) if match.group(2) is not None else first
+            if last < first:
+                first, last = last, first
+            runs.append(_run(first, last, int(match.group(3) or 1)))
+        return cls.from_runs(runs)
+
+    @classmethod
+    def from_runs(cls, runs):
+        """Any (first, last, step) runs, overlapping or not."""
+        runs = sorted(runs)
+        if all(runs[i][1] < runs[i + 1][0] for i in range(len(runs) - 1)):
+            return cls(runs)
+        result = cls()
+        for run in runs:
+            result = result | cls([run])
+        return result
+
+    @classmethod
+    def from_frames(cls, frames):
+        return cls(runs_from_frames(sorted(set(frames))))
+
+    @classmethod
+    def from_range(cls, first, last, step=1):
+        return cls([(first, last, step)] if first <= last else [])
+
+    def ranges(self):
+        """[(first, last, step)], e.g. for rop.render(frame_range=...)."""
+        return list(self._runs)
+
+    @property
+    def first(self):
+        return self._runs[0][0] if self._runs else None
+
+    @property
+    def last(self):
+        return self._runs[-1][1] if self._runs else None
+
+    def span(self):
+        """"first-last", or "" when empty."""
+        return f"{self.first}-{self.last}" if self._runs else ""
+
+    def dominant_step(self):
+        """Step of the runs holding the most frames, e.g. 2 for a render of every other frame."""
+        counts = {}
+        for first, last, step in self._runs:
+            if last > first:
+                counts[step] = counts.get(step, 0) + (last - first) // step + 1
+        return max(counts, key=counts.get) if counts else 1
+
+    def missing(self, first=None, last=None, step=1):
+        """Frames of first..last by step (default: this set's own span) that are not in the set."""
+        first = self.first if first is None else first
+        last = self.last if last is None else last
+        if first is None or last is None:
+            return FrameSet()
+        return FrameSet.from_range(first, last, step) - self
+
+    def union(self, other):
+        return FrameSet(_combine(self._runs, other._runs, "|"))
+
+    def intersection(self, other):
+        return FrameSet(_combine(self._runs, other._runs, "&"))
+
+    def difference(self, other):
+        return FrameSet(_combine(self._runs, other._runs, "-"))
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+
+    def __contains__(self, frame):
+        i = bisect.bisect_right(self._firsts, frame) - 1
+        return i >= 0 and _contains(self._runs[i], frame)
+
+    def __iter__(self):
+        for run in self._runs:
+            yield from _frames(run)
+
+    def __len__(self):
+        return sum((last - first) // step + 1 for first, last, step in self._runs)
+
+    def __bool__(self):
+        return bool(self._runs)
+
+    def __eq__(self, other):
+        return isinstance(other, FrameSet) and self._runs == other._runs
+
+    def __hash__(self):
+        return hash(tuple(self._runs))
+
+    def __str__(self):
+        parts = []
+        for first, last, step in self._runs:
+            if first == last:
+                parts.append(str(first))
+            elif step == 1:
+                parts.append(f"{first}-{last}")
+            else:
+                parts.append(f"{first}-{last}x{step}")
+        return ",".join(parts)
+
+    def __repr__(self):
+        return f"FrameSet({str(self)!r})"
@@ -0,0 +1,159 @@
+import os
+
+from pixellab import colour
+
+try:
+    import numpy as np
+    import OpenImageIO as oiio
+    HAS_OIIO = True
+except ImportError:
+    HAS_OIIO = False
+
+
+def downsample(pixels, step):
+    """Box-filter an (h, w, c) array by an integer step."""
+    if step <= 1:
+        return pixels
+    h, w = pixels.shape[0] // step, pixels.shape[1] // step
+    if h == 0 or w == 0:
+        return pixels
+    blocks = pixels[:h * step, :w * step].reshape(h, step, w, step, pixels.shape[2])
+    return blocks.mean(axis=(1, 3), dtype=np.float32)
+
+
+LINEAR_EXTENSIONS = (".exr", ".hdr")
+
+
+def is_linear(path):
+    """Scene-linear files need the display transform, everything else is display-referred."""
+    return os.path.splitext(path)[1].lower() in LINEAR_EXTENSIONS
+
+
+def read_size(path):
+    """(width, height) from the header only, or None."""
+    if not HAS_OIIO:
+        return None
+    inp = oiio.ImageInput.open(path)
+    if not inp:
+        return None
+    spec = inp.spec()
+    inp.close()
+    return spec.width, spec.height
+
+
+def _seek_miplevel(inp, max_size):
+    """Move inp to its smallest MIP level still at least max_size; returns that level's spec."""
+    spec = inp.spec()
+    level = 0
+    while inp.seek_subimage(0, level + 1):
+        smaller = inp.spec()
+        if smaller.width < max_size[0] or smaller.height < max_size[1]:
+            break
+        level += 1
+        spec = smaller
+    inp.seek_subimage(0, level)
+    return level, spec
+
+
+def read_rgb(path, step=1, max_size=None):
+    """Read the first three channels of an image as float32, optionally downsampled.
+
+    With max_size=(w, h) the smallest MIP level that still covers max_size
+    is read (tiled, mipmapped files only) and the step is picked from its
+    size so the result is no smaller than max_size. A downsampled read goes
+    through the file in bands of scanlines, box-filtering each band as it
+    arrives, so only a band is held at full resolution instead of the whole
+    image. Returns (pixels, (width, height)) where the size is the
+    full-resolution size from the header, or (None, None) if the file
+    can't be read.
+    """
+    if not HAS_OIIO:
+        return None, None
+    inp = oiio.ImageInput.open(path)
+    if not inp:
+        return None, None
+    try:
+        spec = inp.spec()
+        full_size = (spec.width, spec.height)
+        level = 0
+        if max_size:
+            level, spec = _seek_miplevel(inp, max_size)
+            step = max(1, min(spec.width // max_size[0], spec.height // max_size[1]))
+        nch = min(3, spec.nchannels)
+        if step <= 1 or spec.height < step or spec.width < step:
+            pixels = inp.read_image(0, level, 0, nch, oiio.FLOAT)
+            if pixels is None:
+                return None, None
+            pixels = np.asarray(pixels, dtype=np.float32).reshape(spec.height, spec.width, nch)
+        else:
+            band_rows = step * max(1, 64 // step)
+            bands = []
+            for first in range(0, spec.height // step * step, band_rows):
+                rows = min(band_rows, spec.height // step * step - first)
+                band = inp.read_scanlines(0, level, spec.y + first, spec.y + first + rows, spec.z, 0, nch, oiio.FLOAT)
+                if band is None:
+                    return None, None
+                bands.append(downsample(np.asarray(band, dtype=np.float32).reshape(rows, spec.width, nch), step))
+            pixels, step = np.concatenate(bands, axis=0), 1
+    finally:
+        inp.close()
+
+    if nch < 3:
+        pixels = np.repeat(pixels[:, :, :1], 3, axis=2)
+    return downsample(pixels, step), full_size
+
+
+def display_uint8(rgb, source_path, display=None):
+    """uint8 for display, applying the display transform only to linear sources.
+
+    rgb is used as scratch space and should not be reused afterwards.
+    """
+    if is_linear(source_path):
+        return colour.apply_display(rgb, display)
+    return colour.apply_display_referred(rgb)
+
+
+def fit_tile(pixels, width, height):
+    """Letterbox an (h, w, c) array into a (height, width, c) tile with nearest sampling."""
+    h, w = pixels.shape[:2]
+    scale = min(width / w, height / h)
+    nw, nh = max(1, int(w * scale)), max(1, int(h * scale))
+    ys = np.minimum((np.arange(nh) / scale).astype(np.intp), h - 1)
+    xs = np.minimum((np.arange(nw) / scale).astype(np.intp), w - 1)
+    tile = np.zeros((height, width, pixels.shape[2]), dtype=pixels.dtype)
+    oy, ox = (height - nh) // 2, (width - nw) // 2
+    tile[oy:oy + nh, ox:ox + nw] = pixels[ys[:, None], xs[None, :]]
+    return tile
+
+
+def write_image(path, pixels, quality=90, pixel_type=None, compression=None):
+    """Write an (h, w, c) array, replacing path atomically.
+
+    uint8 arrays are written as 8-bit. Float arrays are written as
+    pixel_type (an oiio type, FLOAT by default) with optional compression,
+    e.g. "dwaa" for EXR.
+    """
+    root, ext = os.path.splitext(path)
+    tmp_path = f"{root}.partial{ext}"
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    h, w, c = pixels.shape
+    out = oiio.ImageOutput.create(tmp_path)
+    if not out:
+        raise IOError(f"No image writer for {path}")
+    if pixels.dtype == np.uint8:
+        spec = oiio.ImageSpec(w, h, c, oiio.UINT8)
+    else:
+        spec = oiio.ImageSpec(w, h, c, pixel_type or oiio.FLOAT)
+    if ext.lower() in (".jpg", ".jpeg"):
+        spec.attribute("Compression", f"jpeg:{quality}")
+    elif compression:
+        spec.attribute("Compression", compression)
+    try:
+        if not out.open(tmp_path, spec):
+            raise IOError(out.geterror())
+        out.write_image(np.ascontiguousarray(pixels))
+    finally:
+        out.close()
+    os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,174 @@
+"""Run flipbook frame chunks as parallel headless processes on this machine.
+
+The flipbook tools save a temporary copy of the scene and hand each worker
+a disjoint chunk of frames (see render_worker.py). LocalJobRunner keeps at
+most max_parallel of them running, counts the frames they report and
+raises with the worker's output if one fails.
+
+Self-test with fake workers, no Houdini needed:
+
+    python -m pixellab.local_render --frames 1-120 --workers 4 --seconds 0.02
+"""
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from pixellab import render_worker
+
+WORKER_SCRIPT = os.path.abspath(render_worker.__file__)
+
+
+def default_workers():
+    env = os.getenv("PIXELLAB_RENDER_WORKERS")
+    if env:
+        return max(1, int(env))
+    # OpenGL renders share the GPU, a few processes already saturate it
+    return max(1, min(4, (os.cpu_count() or 1) // 4))
+
+
+def hython_bin():
+    hfs = os.getenv("HFS")
+    if not hfs:
+        raise RuntimeError("Environment variable HFS is not set.")
+    return os.path.join(hfs, "bin", "hython.exe" if os.name == "nt" else "hython")
+
+
+def split_frames(frames, chunks):
+    """Sorted frames -> up to `chunks` contiguous slices of near equal length."""
+    frames = sorted(frames)
+    chunks = max(1, min(chunks, len(frames)))
+    size, extra = divmod(len(frames), chunks)
+    result = []
+    first = 0
+    for n in range(chunks):
+        last = first + size + (1 if n < extra else 0)
+        result.append(frames[first:last])
+        first = last
+    return [chunk for chunk in result if chunk]
+
+
+def worker_cmd(hython, hip_path, rop_path, frames, scene_name=None):
+    """hython command rendering frames from hip_path, loaded under scene_name when given."""
+    name_args = ["--name", scene_name] if scene_name else []
+    return [hython, WORKER_SCRIPT] + name_args + [hip_path, rop_path, render_worker.format_frames(frames)]
+
+
+def fake_worker_cmd(frames, seconds=0.01):
+    return [sys.executable, WORKER_SCRIPT, "--fake", str(seconds), render_worker.format_frames(frames)]
+
+
+class Chunk:
+    def __init__(self, frames, cmd):
+        self.frames = frames
+        self.cmd = cmd
+        self.process = None
+        self.done = set()
+        self.output = []
+        self.returncode = None
+        self._reader = None
+
+    def start(self):
+        self.process = subprocess.Popen(self.cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        self._reader = threading.Thread(target=self._read, daemon=True)
+        self._reader.start()
+
+    def _read(self):
+        prefix = render_worker.FRAME_PREFIX + " "
+        for raw in self.process.stdout:
+            line = raw.decode("utf-8", "replace").rstrip()
+            if line.startswith(prefix):
+                try:
+                    self.done.add(int(line[len(prefix):]))
+                except ValueError:
+                    pass
+            else:
+                self.output.append(line)
+                del self.output[:-50]
+
+    def poll(self):
+        if self.process is None or self.returncode is not None:
+            return self.returncode
+        code = self.process.poll()
+        if code is not None:
+            self._reader.join(1.0)
+            self.returncode = code
+        return self.returncode
+
+    def kill(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.kill()
+            self.process.wait()
+
+
+class LocalJobRunner:
+    """Schedules chunk commands, at most max_parallel at a time."""
+
+    def __init__(self, chunks, max_parallel):
+        self.chunks = [Chunk(frames, cmd) for frames, cmd in chunks]
+        self.max_parallel = max(1, max_parallel)
+        self.total = sum(len(chunk.frames) for chunk in self.chunks)
+
+    def rendered(self):
+        return sum(len(chunk.done) for chunk in self.chunks)
+
+    def running(self):
+        return sum(1 for chunk in self.chunks if chunk.process is not None and chunk.returncode is None)
+
+    def poll(self):
+        """Reap finished workers and start queued ones. True once every chunk is done."""
+        for chunk in self.chunks:
+            if chunk.poll() not in (None, 0):
+                raise RuntimeError(f"Worker for frames {render_worker.format_frames(chunk.frames)} failed "
+                                   f"({chunk.returncode}):\n" + "\n".join(chunk.output[-20:]))
+        for chunk in self.chunks:
+            if self.running() >= self.max_parallel:
+                break
+            if chunk.process is None:
+                chunk.start()
+        return all(chunk.returncode == 0 for chunk in self.chunks)
+
+    def cancel(self):
+        for chunk in self.chunks:
+            chunk.kill()
+
+    def run(self, progress=None, interval=0.25):
+        """Block until all chunks finish. progress(rendered, total, running) may raise to cancel."""
+        try:
+            while not self.poll():
+                if progress:
+                    progress(self.rendered(), self.total, self.running())
+                time.sleep(interval)
+        except BaseException:
+            self.cancel()
+            raise
+        if progress:
+            progress(self.rendered(), self.total, 0)
+        return self.rendered()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Self-test the local chunk runner with fake workers.")
+    parser.add_argument("--frames", default="1-120", help='e.g. "1-120" or "1-40,60-80"')
+    parser.add_argument("--workers", type=int, default=default_workers())
+    parser.add_argument("--chunks", type=int, help="defaults to one chunk per worker")
+    parser.add_argument("--seconds", type=float, default=0.02, help="fake render time per frame")
+    args = parser.parse_args(argv)
+
+    frames = render_worker.parse_frames(args.frames)
+    chunks = split_frames(frames, args.chunks or args.workers)
+    runner = LocalJobRunner([(chunk, fake_worker_cmd(chunk, args.seconds)) for chunk in chunks], args.workers)
+
+    def progress(rendered, total, running):
+        print(f"\r{rendered}/{total} frames, {running} workers running", end="", flush=True)
+
+    began = time.time()
+    rendered = runner.run(progress)
+    print(f"\n{rendered}/{len(frames)} frames from {len(chunks)} chunks in {time.time() - began:.2f}s")
+    return 0 if rendered == len(frames) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
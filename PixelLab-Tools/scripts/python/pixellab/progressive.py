@@ -0,0 +1,62 @@
+"""Coarse-to-fine frame order for progressive flipbooks.
+
+Every 8th frame is rendered first, then the 4ths, 2nds and the rest, each
+pass filling the gaps of the previous ones. After a pass the version can
+be played by holding the nearest finished frame over the gaps, so motion
+is readable long before the last pass is done. The last frame is part of
+the first pass so the hold always covers the whole range.
+"""
+import bisect
+
+from pixellab.framesets import runs_from_frames
+
+STEPS = (8, 4, 2, 1)
+
+
+def passes(start, end, steps=STEPS):
+    """[(step, frames)] in render order, every frame in exactly one pass."""
+    done = set()
+    result = []
+    for step in steps:
+        frames = [f for f in range(start, end + 1, step) if f not in done]
+        if step == steps[0] and end not in frames:
+            frames.append(end)
+        done.update(frames)
+        if frames:
+            result.append((step, frames))
+    return result
+
+
+def rendered_after(start, end, step, steps=STEPS):
+    """Sorted frames on disk once the pass with this step has finished."""
+    frames = []
+    for pass_step, pass_frames in passes(start, end, steps):
+        if pass_step < step:
+            break
+        frames.extend(pass_frames)
+    return sorted(frames)
+
+
+def hold_frames(start, end, step, steps=STEPS):
+    """For every frame in start..end, the nearest frame rendered so far (earlier on a tie)."""
+    rendered = rendered_after(start, end, step, steps)
+    if not rendered:
+        return []
+    held = []
+    for frame in range(start, end + 1):
+        i = bisect.bisect_left(rendered, frame)
+        if i < len(rendered) and rendered[i] == frame:
+            held.append(frame)
+            continue
+        before = rendered[i - 1] if i > 0 else None
+        after = rendered[i] if i < len(rendered) else None
+        if after is None or (before is not None and frame - before <= after - frame):
+            held.append(before)
+        else:
+            held.append(after)
+    return held
+
+
+def frame_ranges(frames):
+    """Sorted frames -> [(first, last, step)] runs, for ROP and flipbook frame ranges."""
+    return runs_from_frames(frames)
@@ -0,0 +1,105 @@
+"""Half/quarter resolution review proxies for render layers.
+
+Proxies are RGB only with the display transform baked in, written one file
+per source frame under the PixelLab cache. A proxy is current when it is at
+least as new as its source frame, so reruns only redo frames that changed.
+"""
+import os
+
+from pixellab import cache, images, workers
+from pixellab.sequences import scan_sequence
+
+PROXY_SCALES = {"half": 2, "quarter": 4}
+PROXY_FORMATS = (".jpg", ".png")
+
+
+def proxy_path(layer_dir, scale, filename, fmt=".jpg"):
+    return os.path.join(cache.proxy_dir(layer_dir, scale), os.path.splitext(filename)[0] + fmt)
+
+
+def is_up_to_date(src, dst):
+    try:
+        return os.path.getmtime(dst) >= os.path.getmtime(src)
+    except OSError:
+        return False
+
+
+def make_proxy(src, dst, step):
+    # Runs in a pool worker, keep it at module level so it pickles
+    rgb, _ = images.read_rgb(src, step)
+    if rgb is None:
+        raise IOError(f"Could not read {src}")
+    return images.write_image(dst, images.display_uint8(rgb, src))
+
+
+def pending_frames(layer_dir, scale="half", fmt=".jpg", seq=None):
+    seq = seq or scan_sequence(layer_dir)
+    if not seq:
+        return []
+    step = PROXY_SCALES[scale]
+    jobs = []
+    for frame in sorted(seq.frames):
+        src = seq.path(frame)
+        dst = proxy_path(layer_dir, scale, seq.frames[frame], fmt)
+        if not is_up_to_date(src, dst):
+            jobs.append((src, dst, step))
+    return jobs
+
+
+def generate_proxies(layer_dirs, scale="half", fmt=".jpg", max_workers=None,
+                     cancel_event=None, progress=None):
+    """Build missing or stale proxies for each layer in a process pool.
+
+    progress(done, total, layer_dir) is called after every frame. Returns
+    (written, failed) counts; on cancel the frames already written stay.
+    """
+    jobs = []
+    for layer_dir in layer_dirs:
+        jobs.extend((src, dst, step, layer_dir) for src, dst, step in pending_frames(layer_dir, scale, fmt))
+    total = len(jobs)
+    if not total:
+        return 0, 0
+
+    written = failed = 0
+    with workers.process_pool(max_workers) as pool:
+        results = workers.map_bounded(pool, _make_proxy_job, jobs, cancel_event)
+        for job, _, error in results:
+            if error:
+                failed += 1
+                print(f"Proxy failed for {job[0]}: {error}")
+            else:
+                written += 1
+            if progress:
+                progress(written + failed, total, job[3])
+    return written, failed
+
+
+def _make_proxy_job(src, dst, step, layer_dir):
+    return make_proxy(src, dst, step)
+
+
+def find_proxy_sequence(layer_dir, seq=None):
+    """Return the sharpest proxy Sequence that is current for every frame, or None."""
+    seq = seq or scan_sequence(layer_dir)
+    if not seq:
+        return None
+    for scale in PROXY_SCALES:
+        folder = cache.proxy_dir(layer_dir, scale)
+        if not os.path.isdir(folder):
+            continue
+        for fmt in PROXY_FORMATS:
+            names = {f: os.path.splitext(n)[0] + fmt for f, n in seq.frames.items()}
+            if all(is_up_to_date(seq.path(f), os.path.join(folder, n)) for f, n in names.items()):
+                return seq._replace(folder=folder, ext=fmt, frames=names)
+    return None
+
+
+def proxy_for_frame(layer_dir, filename):
+    """Current proxy file for a single source frame, or None."""
+    src = os.path.join(layer_dir, filename)
+    for scale in PROXY_SCALES:
+        for fmt in PROXY_FORMATS:
+            dst = proxy_path(layer_dir, scale, filename, fmt)
+            if is_up_to_date(src, dst):
+                return dst
+    return None
@@ -0,0 +1,114 @@
+"""Per-frame differences between two versions of the same render layers."""
+import math
+import os
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from pixellab import images, workers
+from pixellab.sequences import scan_sequence
+
+HEATMAP_SIZE = (320, 180)
+DEFAULT_BUDGET = int(os.getenv("PIXELLAB_DIFF_MEMORY_MB", "2048")) * 1024 * 1024
+
+FrameDiff = namedtuple("FrameDiff", "frame max_abs mean psnr")
+
+
+def match_layers(version_a, version_b):
+    """[(layer, seq_a, seq_b, frames)] for layers present in both versions."""
+    matched = []
+    for layer in sorted(os.listdir(version_a)):
+        dir_a, dir_b = os.path.join(version_a, layer), os.path.join(version_b, layer)
+        if not (os.path.isdir(dir_a) and os.path.isdir(dir_b)):
+            continue
+        seq_a, seq_b = scan_sequence(dir_a), scan_sequence(dir_b)
+        if not (seq_a and seq_b):
+            continue
+        frames = sorted(set(seq_a.frames) & set(seq_b.frames))
+        if frames:
+            matched.append((layer, seq_a, seq_b, frames))
+    return matched
+
+
+def psnr(mse, peak=1.0):
+    return float("inf") if mse <= 0 else 10.0 * math.log10(peak * peak / mse)
+
+
+def frame_diff(path_a, path_b, heatmap_size=None):
+    """Compare two frames, returning (max_abs, mean, psnr, heat).
+
+    heat is the per-pixel largest channel difference downsampled to
+    heatmap_size, or None when not requested.
+    """
+    a, size_a = images.read_rgb(path_a)
+    b, size_b = images.read_rgb(path_b)
+    if a is None or b is None:
+        raise IOError(f"Could not read {path_a if a is None else path_b}")
+    if size_a != size_b:
+        raise ValueError(f"Resolution changed {size_a} -> {size_b}")
+
+    # Reuse a's buffer for |a - b| and then its square
+    np.subtract(a, b, out=a)
+    del b
+    np.abs(a, out=a)
+    max_abs = float(a.max())
+    mean = float(a.mean(dtype=np.float64))
+    heat = None
+    if heatmap_size:
+        heat = a.max(axis=2)[:, :, None]
+        step = max(1, min(heat.shape[1] // heatmap_size[0], heat.shape[0] // heatmap_size[1]))
+        heat = images.downsample(heat, step)[:, :, 0]
+    np.multiply(a, a, out=a)
+    return max_abs, mean, psnr(float(a.mean(dtype=np.float64))), heat
+
+
+def heatmap_rgb(heat, scale=None):
+    """Black -> red -> yellow -> white ramp as uint8 (h, w, 3)."""
+    scale = scale or float(heat.max()) or 1.0
+    t = np.clip(heat / scale, 0.0, 1.0) * 3.0
+    rgb = np.empty(heat.shape + (3,), dtype=np.float32)
+    for c in range(3):
+        np.clip(t - c, 0.0, 1.0, out=rgb[:, :, c])
+    return (rgb * 255.0 + 0.5).astype(np.uint8)
+
+
+def frame_bytes(path):
+    size = images.read_size(path)
+    if not size:
+        return 0
+    # Two float32 RGB frames in flight plus the heat plane
+    return size[0] * size[1] * (3 * 4 * 2 + 4)
+
+
+def diff_layer(seq_a, seq_b, frames, budget=DEFAULT_BUDGET, cancel_event=None, progress=None):
+    """Diff every common frame of one layer within a memory budget.
+
+    Returns ([FrameDiff], worst_frame, heat) where heat belongs to the
+    frame with the largest mean difference.
+    """
+    per_frame = max(1, frame_bytes(seq_a.path(frames[0])))
+    max_workers = max(1, min(workers.default_workers(), budget // per_frame))
+
+    lock = threading.Lock()
+    worst = {"mean": -1.0, "frame": None, "heat": None}
+
+    def run(frame):
+        max_abs, mean, value, heat = frame_diff(seq_a.path(frame), seq_b.path(frame), HEATMAP_SIZE)
+        with lock:
+            if mean > worst["mean"]:
+                worst.update(mean=mean, frame=frame, heat=heat)
+        return FrameDiff(frame, max_abs, mean, value)
+
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        jobs = [(f,) for f in frames]
+        for n, (job, result, error) in enumerate(workers.map_bounded(pool, run, jobs, cancel_event, max_workers), 1):
+            if error:
+                print(f"Diff failed for frame {job[0]}: {error}")
+            else:
+                results.append(result)
+            if progress:
+                progress(n, len(jobs))
+    return sorted(results), worst["frame"], worst["heat"]
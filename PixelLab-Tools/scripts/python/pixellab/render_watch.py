@@ -0,0 +1,88 @@
+"""Cheap change detection for render folders that are still being written.
+
+Polling compares one directory stat per layer (plus the newest frame, which
+is the one a renderer may still be growing) against the previous poll, so
+an idle watch costs a handful of stat calls per interval and nothing else.
+"""
+import os
+from collections import namedtuple
+
+from pixellab.sequences import IMAGE_EXTENSIONS, scan_sequence
+
+LayerSummary = namedtuple("LayerSummary", "seq frame_range frame_count missing empty health latest")
+
+
+def _stat_key(path):
+    try:
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size
+    except OSError:
+        return None
+
+
+def layer_summary(layer_dir):
+    """Frame range, counts and health for a layer from one directory listing."""
+    sizes = {}
+    try:
+        with os.scandir(layer_dir) as it:
+            for entry in it:
+                if os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS:
+                    try:
+                        sizes[entry.name] = entry.stat().st_size
+                    except OSError:
+                        sizes[entry.name] = 0
+    except OSError:
+        return None
+
+    seq = scan_sequence(layer_dir, names=list(sizes))
+    if not seq:
+        if not sizes:
+            return None
+        return LayerSummary(None, f"1-{len(sizes)}", len(sizes), 0, 0, "OK", None)
+
+    count = len(seq.frames)
+    frames = seq.frame_set
+    # Against the layer's own step, so a render of every other frame is complete
+    gaps = frames.missing(step=frames.dominant_step())
+    missing = len(gaps)
+    empty = sum(1 for name in seq.frames.values() if sizes.get(name, 0) == 0)
+    problems = []
+    if missing:
+        # Name the gaps while they still fit in the cell
+        problems.append(f"{missing} missing ({gaps})" if len(gaps.ranges()) <= 3 else f"{missing} missing")
+    if empty:
+        problems.append(f"{empty} empty")
+    health = ", ".join(problems) if problems else "OK"
+    return LayerSummary(seq, frames.span(), count, missing, empty, health, seq.path(frames.last))
+
+
+class DirectoryPoller:
+    """Tracks directories and reports which changed since the last poll."""
+
+    def __init__(self):
+        self.watched = {}
+
+    def add(self, path, probe=None):
+        self.watched[path] = (probe, self._key(path, probe))
+
+    def set_probe(self, path, probe):
+        if path in self.watched:
+            self.watched[path] = (probe, self._key(path, probe))
+
+    def remove(self, path):
+        self.watched.pop(path, None)
+
+    def clear(self):
+        self.watched.clear()
+
+    def _key(self, path, probe):
+        return _stat_key(path), (_stat_key(probe) if probe else None)
+
+    def poll(self):
+        changed = []
+        for path, (probe, key) in list(self.watched.items()):
+            new_key = self._key(path, probe)
+            if new_key != key:
+                self.watched[path] = (probe, new_key)
+                changed.append(path)
+        return changed
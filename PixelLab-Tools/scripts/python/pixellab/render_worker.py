@@ -0,0 +1,83 @@
+"""Headless flipbook worker, run by hython once per frame chunk.
+
+    hython render_worker.py [--name ORIGINAL.hip] SCENE.hip /out/temp_flipbook 1001-1040,1052
+
+Loads the scene, renders the given frames through the ROP and prints one
+"PIXELLAB_FRAME <n>" line per finished frame for local_render to count.
+With --fake SECONDS it only sleeps and prints, which is how the runner is
+tested without Houdini. --name renames the loaded scene, so a temporary
+copy still evaluates $HIPNAME and $HIPFILE as the user's scene.
+"""
+import os
+import sys
+import time
+
+if __name__ == "__main__":
+    # Run as a plain script by hython, so make the pixellab package importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pixellab.framesets import FrameSet
+
+FRAME_PREFIX = "PIXELLAB_FRAME"
+
+
+def format_frames(frames):
+    """Frames -> "1001-1040,1052" for the command line."""
+    return str(frames if isinstance(frames, FrameSet) else FrameSet.from_frames(frames))
+
+
+def parse_frames(text):
+    return list(FrameSet.parse(text))
+
+
+def report(frame):
+    print(f"{FRAME_PREFIX} {frame}", flush=True)
+
+
+def render(hip_path, rop_path, frames, scene_name=None):
+    import hou
+
+    hou.hipFile.load(hip_path, suppress_save_prompt=True, ignore_load_warnings=True)
+    if scene_name:
+        # Before anything evaluates, so $HIPNAME-based cache and texture paths match the session
+        hou.hipFile.setName(scene_name)
+    rop = hou.node(rop_path)
+    if rop is None:
+        raise RuntimeError(f"No ROP {rop_path} in {hip_path}")
+    # A post-frame script reports every frame even when a whole range renders in one call
+    per_frame = rop.parm("postframe") is not None and rop.parm("lpostframe") is not None
+    if per_frame:
+        rop.parm("postframe").set(f'print("{FRAME_PREFIX} %d" % int(hou.frame()), flush=True)')
+        rop.parm("lpostframe").set("python")
+    for first, last, step in FrameSet.from_frames(frames).ranges():
+        rop.render(frame_range=(first, last, step))
+        if not per_frame:
+            for frame in range(first, last + 1, step):
+                report(frame)
+
+
+def fake_render(frames, seconds):
+    for frame in frames:
+        time.sleep(seconds)
+        report(frame)
+
+
+def main(argv=None):
+    args = list(sys.argv[1:] if argv is None else argv)
+    if args and args[0] == "--fake":
+        fake_render(parse_frames(args[2]), float(args[1]))
+        return 0
+    scene_name = None
+    if len(args) == 5 and args[0] == "--name":
+        scene_name = args[1]
+        args = args[2:]
+    if len(args) != 3:
+        print(__doc__, file=sys.stderr)
+        return 2
+    hip_path, rop_path, frames = args
+    render(hip_path, rop_path, parse_frames(frames), scene_name)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
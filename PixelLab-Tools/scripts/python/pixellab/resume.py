@@ -0,0 +1,49 @@
+"""Find the frames of an interrupted flipbook that still need rendering.
+
+A frame counts as done when the file is non-empty, starts with its
+format's magic bytes and, for formats with a trailer, ends with it, which
+catches the half-written last frame of a crashed session.
+"""
+import os
+
+from pixellab.framesets import FrameSet
+
+# ext: (header magic, trailer or None, smallest plausible size)
+FORMATS = {
+    ".exr": (b"\x76\x2f\x31\x01", None, 64),
+    ".png": (b"\x89PNG\r\n\x1a\n", b"IEND\xaeB`\x82", 64),
+    ".jpg": (b"\xff\xd8\xff", b"\xff\xd9", 64),
+    ".jpeg": (b"\xff\xd8\xff", b"\xff\xd9", 64),
+}
+
+
+def is_valid_frame(path):
+    ext = os.path.splitext(path)[1].lower()
+    magic, trailer, min_size = FORMATS.get(ext, (b"", None, 1))
+    try:
+        size = os.path.getsize(path)
+        if size < min_size:
+            return False
+        with open(path, "rb") as f:
+            if f.read(len(magic)) != magic:
+                return False
+            if trailer:
+                f.seek(-len(trailer), os.SEEK_END)
+                return f.read(len(trailer)) == trailer
+    except OSError:
+        return False
+    return True
+
+
+def missing_frames(folder, frame_name, start, end):
+    """FrameSet of the frames in start..end whose file is missing or invalid. frame_name is printf style."""
+    try:
+        present = set(os.listdir(folder))
+    except OSError:
+        return FrameSet.from_range(start, end)
+    missing = []
+    for frame in range(start, end + 1):
+        name = frame_name % frame
+        if name not in present or not is_valid_frame(os.path.join(folder, name)):
+            missing.append(frame)
+    return FrameSet.from_frames(missing)
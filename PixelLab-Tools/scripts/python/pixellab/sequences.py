@@ -0,0 +1,61 @@
+import os
+import re
+from collections import namedtuple
+
+from pixellab.framesets import FrameSet
+
+IMAGE_EXTENSIONS = (".exr", ".jpg", ".jpeg", ".png", ".dpx", ".tif", ".tiff")
+FRAME_PATTERN = re.compile(r"^(.*?)(\d+)(\.[^.]+)$")
+
+
+class Sequence(namedtuple("Sequence", "folder prefix padding ext frames")):
+    """A numbered image sequence; frames maps frame number -> filename."""
+
+    @property
+    def first(self):
+        return min(self.frames) if self.frames else None
+
+    @property
+    def last(self):
+        return max(self.frames) if self.frames else None
+
+    @property
+    def frame_set(self):
+        return FrameSet.from_frames(self.frames)
+
+    def path(self, frame):
+        return os.path.join(self.folder, self.frames[frame])
+
+    def paths(self):
+        return [os.path.join(self.folder, self.frames[f]) for f in sorted(self.frames)]
+
+    def houdini_pattern(self):
+        return os.path.join(self.folder, f"{self.prefix}$F{self.padding}{self.ext}")
+
+    def mplay_args(self):
+        return ["-f", str(self.first), str(self.last), "1", self.houdini_pattern()]
+
+
+def scan_sequence(folder, extensions=IMAGE_EXTENSIONS, names=None):
+    """Return the largest numbered sequence in folder, or None."""
+    if names is None:
+        try:
+            names = os.listdir(folder)
+        except OSError:
+            return None
+
+    groups = {}
+    for name in names:
+        if os.path.splitext(name)[1].lower() not in extensions:
+            continue
+        m = FRAME_PATTERN.match(name)
+        if not m:
+            continue
+        prefix, digits, ext = m.groups()
+        key = (prefix, len(digits), ext)
+        groups.setdefault(key, {})[int(digits)] = name
+
+    if not groups:
+        return None
+    (prefix, padding, ext), frames = max(groups.items(), key=lambda kv: len(kv[1]))
+    return Sequence(folder, prefix, padding, ext, frames)
@@ -0,0 +1,195 @@
+"""Streaming render -> ffmpeg pipeline for flipbooks.
+
+Frames are rendered a chunk at a time on the calling thread while a feeder
+thread decodes each finished frame and writes it to a running ffmpeg
+through its stdin, so the encode overlaps the render instead of starting
+after the last frame. A bounded queue between the two keeps memory flat
+and lets a slow encoder hold the renderer back.
+
+Run as a module for a self-test with a synthetic renderer, no Houdini
+needed:
+
+    python -m pixellab.stream_encode --frames 48 --size 640x360 out.mp4
+"""
+import argparse
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from pixellab import ffmpeg, images
+
+STREAM_CHUNK = 10
+MAX_BUFFERED = 8
+
+
+class StreamEncoder:
+    """ffmpeg fed rgb24 frames through stdin."""
+
+    def __init__(self, cmd, width, height):
+        self.width = width
+        self.height = height
+        self.frames = 0
+        self._errors = []
+        self.process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                                        stderr=subprocess.PIPE)
+        # Drain stderr so a chatty ffmpeg can never block on a full pipe
+        self._stderr_thread = threading.Thread(target=self._drain_stderr, daemon=True)
+        self._stderr_thread.start()
+
+    def _drain_stderr(self):
+        for line in self.process.stderr:
+            self._errors.append(line.decode("utf-8", "replace"))
+            del self._errors[:-50]
+
+    def error_text(self):
+        return "".join(self._errors).strip()
+
+    def write(self, pixels):
+        if pixels.shape != (self.height, self.width, 3) or pixels.dtype != np.uint8:
+            raise ValueError(f"Expected {self.width}x{self.height} uint8 RGB, got {pixels.shape} {pixels.dtype}")
+        try:
+            self.process.stdin.write(np.ascontiguousarray(pixels).data)
+        except (BrokenPipeError, OSError):
+            self.process.wait()
+            self._stderr_thread.join(1.0)
+            raise RuntimeError(f"ffmpeg stopped accepting frames:\n{self.error_text()}")
+        self.frames += 1
+
+    def close(self):
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        code = self.process.wait()
+        self._stderr_thread.join(1.0)
+        if code != 0:
+            raise RuntimeError(f"ffmpeg failed ({code}):\n{self.error_text()}")
+        return self.frames
+
+    def abort(self):
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+
+
+def decode_frame(path):
+    """EXR/image path -> display uint8, the same transform the thumbnails use."""
+    rgb, _ = images.read_rgb(path)
+    if rgb is None:
+        raise IOError(f"Could not read {path}")
+    return images.display_uint8(rgb, path)
+
+
+def stream_frames(render_chunk, encoder, start, end, decode=decode_frame, chunk_size=STREAM_CHUNK,
+                  progress=None, max_buffered=MAX_BUFFERED):
+    """Render start..end in chunks and encode frames as they finish.
+
+    render_chunk(first, last) renders a chunk and returns one item per frame
+    that decode turns into uint8 RGB, e.g. the EXR paths it wrote.
+    progress(rendered, encoded, total) is called from the rendering thread
+    and may raise to stop early. Returns the number of encoded frames.
+    """
+    total = end - start + 1
+    pending = queue.Queue(maxsize=max_buffered)
+    failure = []
+
+    def feed():
+        while True:
+            item = pending.get()
+            if item is None:
+                return
+            if failure:
+                continue  # keep draining so the renderer never blocks on put()
+            try:
+                encoder.write(decode(item))
+            except Exception as e:
+                failure.append(e)
+
+    feeder = threading.Thread(target=feed, daemon=True)
+    feeder.start()
+    rendered = 0
+    try:
+        for first in range(start, end + 1, chunk_size):
+            last = min(end, first + chunk_size - 1)
+            for item in render_chunk(first, last):
+                pending.put(item)
+                rendered += 1
+            if failure:
+                raise failure[0]
+            if progress:
+                progress(rendered, encoder.frames, total)
+    except BaseException:
+        pending.put(None)
+        feeder.join()
+        encoder.abort()
+        raise
+    pending.put(None)
+    feeder.join()
+    if failure:
+        encoder.abort()
+        raise failure[0]
+    return encoder.close()
+
+
+class SyntheticRenderer:
+    """Stand-in renderer: a moving bar over a gradient, frame_seconds per frame."""
+
+    def __init__(self, width, height, frame_seconds=0.0):
+        self.width = width
+        self.height = height
+        self.frame_seconds = frame_seconds
+        ramp = np.linspace(0, 255, width, dtype=np.float32)
+        self.background = np.empty((height, width, 3), dtype=np.uint8)
+        self.background[:, :, 0] = ramp.astype(np.uint8)
+        self.background[:, :, 1] = 64
+        self.background[:, :, 2] = ramp[::-1].astype(np.uint8)
+        self.render_seconds = 0.0
+
+    def render_chunk(self, first, last):
+        frames = []
+        for frame in range(first, last + 1):
+            began = time.time()
+            pixels = self.background.copy()
+            x = (frame * 8) % self.width
+            pixels[:, x:x + 16] = 255
+            if self.frame_seconds:
+                time.sleep(self.frame_seconds)
+            frames.append(pixels)
+            self.render_seconds += time.time() - began
+        return frames
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Self-test the streaming flipbook encode with a synthetic renderer.")
+    parser.add_argument("output", help="MP4 to write")
+    parser.add_argument("--frames", type=int, default=48)
+    parser.add_argument("--size", default="640x360", help="WIDTHxHEIGHT")
+    parser.add_argument("--frame-seconds", type=float, default=0.02, help="simulated render time per frame")
+    parser.add_argument("--chunk", type=int, default=STREAM_CHUNK)
+    parser.add_argument("--preset", default="veryfast")
+    parser.add_argument("--ffmpeg", help="ffmpeg binary, defaults to $PIXELLAB/ffmpeg or PATH")
+    args = parser.parse_args(argv)
+
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    renderer = SyntheticRenderer(width, height, args.frame_seconds)
+    cmd = ffmpeg.rawvideo_to_mp4_cmd(ffmpeg.find_ffmpeg(args.ffmpeg), width, height, args.output, preset=args.preset)
+    encoder = StreamEncoder(cmd, width, height)
+
+    began = time.time()
+    encoded = stream_frames(renderer.render_chunk, encoder, 1, args.frames, decode=lambda pixels: pixels,
+                            chunk_size=args.chunk)
+    wall = time.time() - began
+    print(f"Encoded {encoded}/{args.frames} frames to {args.output} in {wall:.2f}s "
+          f"({renderer.render_seconds:.2f}s of that rendering)")
+    return 0 if encoded == args.frames else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+"""Flipbook thumbnail service shared by the Flipbook Browser and houdini_lab.
+
+Each first frame is opened once on a worker thread, which reads the header
+and pixels together, downsamples into the root's thumbnail atlas, and paints
+the resolution / frame range overlay onto a QImage. Finished images are handed to the GUI thread in
+batches so the list is updated a few times a second rather than per file.
+Filmstrips for hover scrubbing are queued behind the thumbnails on the same
+pool.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide2 import QtCore, QtGui
+
+from pixellab import atlas, filmstrip, images, workers
+from pixellab.sequences import FRAME_PATTERN
+
+THUMBNAIL_SIZE = (160, 90)
+
+
+def frame_range_from_names(paths):
+    """First/last frame from an already sorted list of sequence paths."""
+    first = FRAME_PATTERN.match(os.path.basename(paths[0])) if paths else None
+    last = FRAME_PATTERN.match(os.path.basename(paths[-1])) if paths else None
+    if not (first and last):
+        return 0, 0
+    return int(first.group(2)), int(last.group(2))
+
+
+def array_to_qimage(pixels):
+    return tile_qimage(pixels).copy()
+
+
+def tile_qimage(pixels):
+    """QImage over a uint8 array's buffer without copying, keep the array alive."""
+    h, w, c = pixels.shape
+    fmt = QtGui.QImage.Format_RGB888 if c == 3 else QtGui.QImage.Format_RGBA8888
+    return QtGui.QImage(pixels.data, w, h, w * c, fmt)
+
+
+def paint_overlay(image, resolution, frame_range):
+    # QPainter on a QImage is allowed outside the GUI thread
+    image = image.convertToFormat(QtGui.QImage.Format_RGB32)
+    painter = QtGui.QPainter(image)
+    painter.setRenderHint(QtGui.QPainter.TextAntialiasing)
+    margin = 6
+    rect = image.rect().adjusted(margin, margin, -margin, -margin)
+    text = f"{resolution[0]}x{resolution[1]}\n{frame_range[0]}-{frame_range[1]}"
+    painter.setPen(QtGui.QColor("white"))
+    painter.setFont(QtGui.QFont("Segoe UI", 6, QtGui.QFont.Normal))
+    painter.drawText(rect, QtCore.Qt.AlignLeft | QtCore.Qt.AlignTop, text)
+    painter.end()
+    return image
+
+
+def build_thumbnail(path, size=THUMBNAIL_SIZE, frame_range=None, resolution=None, overlay=True, root=None):
+    thumbs = atlas.open_atlas(root, size) if root else None
+    if thumbs:
+        tile, full_size = thumbs.get_or_build(path)
+    else:
+        tile, full_size = atlas.build_tile(path, size)
+    if tile is None:
+        return None
+    if not overlay:
+        return array_to_qimage(tile)
+    if not resolution and not full_size:
+        # Only for atlas entries cached before sizes were recorded, and only once per entry
+        full_size = images.read_size(path)
+        if thumbs and full_size:
+            thumbs.set_resolution(path, full_size)
+    # Painting converts to RGB32, which is the only copy made of the tile
+    return paint_overlay(tile_qimage(tile), resolution or full_size or (0, 0), frame_range or (0, 0))
+
+
+class FlipbookThumbnailService(QtCore.QObject):
+    thumbnails_ready = QtCore.Signal(object)  # [(key, QImage)]
+    filmstrips_ready = QtCore.Signal(object)  # [(key, [QImage])]
+
+    def __init__(self, size=THUMBNAIL_SIZE, max_workers=None, batch_ms=100, parent=None):
+        super().__init__(parent)
+        self.size = size
+        self.root = None
+        self.pool = ThreadPoolExecutor(max_workers=max_workers or min(4, workers.default_workers()))
+        self._lock = threading.Lock()
+        self._results = []
+        self._strips = []
+        self._pending = 0
+        self._generation = 0
+        self._flush_timer = QtCore.QTimer(self)
+        self._flush_timer.setInterval(batch_ms)
+        self._flush_timer.timeout.connect(self._flush)
+
+    def request(self, key, path, frame_range=None, resolution=None, overlay=True):
+        self._submit(self._work, key, path, frame_range, resolution, overlay)
+
+    def set_root(self, root):
+        """Cache thumbnails in the atlas for root, e.g. the Flipbooks folder."""
+        self.root = root
+
+    def request_filmstrip(self, key, folder, paths):
+        self._submit(self._work_filmstrip, key, folder, paths)
+
+    def _submit(self, fn, *args):
+        with self._lock:
+            self._pending += 1
+            generation = self._generation
+        self.pool.submit(fn, generation, self.root, *args)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def cancel(self):
+        """Drop everything queued so far, e.g. before a refresh."""
+        with self._lock:
+            self._generation += 1
+            self._results = []
+            self._strips = []
+
+    def shutdown(self):
+        self.cancel()
+        self._flush_timer.stop()
+        self.pool.shutdown(wait=False)
+
+    def _work(self, generation, root, key, path, frame_range, resolution, overlay):
+        image = None
+        try:
+            if generation == self._generation:
+                image = build_thumbnail(path, self.size, frame_range, resolution, overlay, root)
+        except Exception as e:
+            print(f"Thumbnail load failed for {path}: {e}")
+        with self._lock:
+            self._pending -= 1
+            if image is not None and generation == self._generation:
+                self._results.append((key, image))
+
+    def _work_filmstrip(self, generation, root, key, folder, paths):
+        strip = None
+        try:
+            if generation == self._generation:
+                frames = filmstrip.filmstrip(folder, paths, size=self.size)
+                if frames is not None:
+                    strip = [array_to_qimage(frame) for frame in frames]
+        except Exception as e:
+            print(f"Filmstrip failed for {folder}: {e}")
+        with self._lock:
+            self._pending -= 1
+            if strip and generation == self._generation:
+                self._strips.append((key, strip))
+
+    def _flush(self):
+        with self._lock:
+            batch, self._results = self._results, []
+            strips, self._strips = self._strips, []
+            idle = self._pending == 0
+        if batch:
+            self.thumbnails_ready.emit(batch)
+        if strips:
+            self.filmstrips_ready.emit(strips)
+        if idle:
+            self._flush_timer.stop()
+
+
+class FilmstripScrubber(QtCore.QObject):
+    """Swaps an icon-mode list item's icon for filmstrip frames under the mouse."""
+
+    def __init__(self, list_widget):
+        super().__init__(list_widget)
+        self.list_widget = list_widget
+        self.strips = {}
+        self._active = None  # (item, resting icon, frame index)
+        list_widget.viewport().setMouseTracking(True)
+        list_widget.viewport().installEventFilter(self)
+
+    def set_strip(self, item, images):
+        self.strips[id(item)] = (item, [QtGui.QIcon(QtGui.QPixmap.fromImage(img)) for img in images])
+
+    def clear(self):
+        # Items are about to be deleted, so don't touch the active one
+        self._active = None
+        self.strips.clear()
+
+    def rest_icon(self, item, icon):
+        """Set an item's normal icon without it being overwritten by an active scrub."""
+        if self._active and self._active[0] is item:
+            self._active = (item, icon, self._active[2])
+        else:
+            item.setIcon(icon)
+
+    def _restore(self):
+        if self._active:
+            item, icon, _ = self._active
+            item.setIcon(icon)
+            self._active = None
+
+    def eventFilter(self, obj, event):
+        if event.type() == QtCore.QEvent.MouseMove and not event.buttons():
+            self._scrub(event.pos())
+        elif event.type() == QtCore.QEvent.Leave:
+            self._restore()
+        return False
+
+    def _scrub(self, pos):
+        item = self.list_widget.itemAt(pos)
+        entry = self.strips.get(id(item)) if item else None
+        if not entry or entry[0] is not item:
+            self._restore()
+            return
+        if self._active and self._active[0] is not item:
+            self._restore()
+        rect = self.list_widget.visualItemRect(item)
+        icons = entry[1]
+        fraction = (pos.x() - rect.left()) / max(1, rect.width())
+        index = min(len(icons) - 1, max(0, int(fraction * len(icons))))
+        if not self._active:
+            self._active = (item, item.icon(), None)
+        if self._active[2] != index:
+            item.setIcon(icons[index])
+            self._active = (item, self._active[1], index)
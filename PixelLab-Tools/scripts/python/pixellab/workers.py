@@ -0,0 +1,81 @@
+import glob
+import os
+import sys
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+def default_workers():
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def standalone_python():
+    """Plain Python interpreter for worker processes.
+
+    Inside Houdini sys.executable is houdini/hython, which must not be used
+    to spawn pool workers, so fall back to the interpreter shipped in $HFS.
+    """
+    exe = sys.executable or ""
+    if os.path.basename(exe).lower().startswith("python"):
+        return exe
+
+    hfs = os.getenv("HFS")
+    if not hfs:
+        return None
+    if os.name == "nt":
+        patterns = [os.path.join(hfs, "python*", "python3*.exe"), os.path.join(hfs, "python*", "python.exe")]
+    else:
+        patterns = [os.path.join(hfs, "python", "bin", "python3*")]
+    for pattern in patterns:
+        found = sorted(glob.glob(pattern))
+        if found:
+            return found[0]
+    return None
+
+
+def _init_worker(hfs_bin):
+    # Python 3.8+ on Windows no longer resolves DLLs through PATH
+    if hfs_bin and hasattr(os, "add_dll_directory") and os.path.isdir(hfs_bin):
+        os.add_dll_directory(hfs_bin)
+
+
+def process_pool(max_workers=None):
+    """ProcessPoolExecutor using a standalone interpreter, or threads if none is found."""
+    max_workers = max_workers or default_workers()
+    exe = standalone_python()
+    if not exe:
+        return ThreadPoolExecutor(max_workers=max_workers)
+
+    ctx = multiprocessing.get_context("spawn")
+    ctx.set_executable(exe)
+    hfs_bin = os.path.join(os.getenv("HFS", ""), "bin") if os.getenv("HFS") else ""
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx,
+                               initializer=_init_worker, initargs=(hfs_bin,))
+
+
+def map_bounded(pool, fn, jobs, cancel_event=None, max_in_flight=None):
+    """Yield (job, result, error) as pool work finishes.
+
+    Only max_in_flight jobs are submitted at a time so a cancel stops new
+    work straight away instead of after the whole queue has been handed out.
+    """
+    max_in_flight = max_in_flight or 2 * getattr(pool, "_max_workers", default_workers())
+    pending = deque(jobs)
+    running = deque()
+
+    while pending or running:
+        while pending and len(running) < max_in_flight:
+            if cancel_event is not None and cancel_event.is_set():
+                pending.clear()
+                break
+            job = pending.popleft()
+            running.append((job, pool.submit(fn, *job)))
+
+        if not running:
+            break
+        job, future = running.popleft()
+        try:
+            yield job, future.result(), None
+        except Exception as e:
+            yield job, None, e
@@ -3,20 +3,29 @@ import os
 import re
 import sys
 import subprocess
+import time
 import toolutils
 from PySide2 import QtWidgets, QtCore
 
+from pixellab import encode_queue, ffmpeg, flipbook_meta, flipbook_profiles, progressive
+
 
 # --------- Utilities --------- #
 
 def get_ffmpeg_bin():
-    pixellab = os.getenv("PIXELLAB")
-    if not pixellab:
-        raise hou.Error("PIXELLAB environment variable not set.")
-    ffmpeg = os.path.join(pixellab, "ffmpeg", "bin", "ffmpeg.exe" if os.name == "nt" else "ffmpeg")
-    if not os.path.exists(ffmpeg):
-        raise hou.Error(f"FFmpeg not found:\n{ffmpeg}")
-    return ffmpeg
+    try:
+        return ffmpeg.get_ffmpeg_bin()
+    except RuntimeError as e:
+        raise hou.Error(str(e))
+
+
+def open_mp4(job):
+    if sys.platform == "win32":
+        os.startfile(job.output)
+    elif sys.platform == "darwin":
+        subprocess.call(["open", job.output])
+    else:
+        subprocess.call(["xdg-open", job.output])
 
 
 def find_next_version(base_folder):
@@ -46,11 +55,33 @@ class FlipbookDialog(QtWidgets.QDialog):
         self.version_edit = QtWidgets.QLineEdit(version)
         self.open_checkbox = QtWidgets.QCheckBox("Open MP4 After Render")
         self.open_checkbox.setChecked(False)
+        self.progressive_checkbox = QtWidgets.QCheckBox("Progressive (every 8th frame first)")
+        self.progressive_checkbox.setToolTip("Render every 8th, 4th and 2nd frame before the rest so the browser can play it early")
+        self.intermediate_combo = QtWidgets.QComboBox()
+        for name, intermediate in flipbook_profiles.INTERMEDIATES.items():
+            if name not in flipbook_profiles.ROP_ONLY_INTERMEDIATES:
+                self.intermediate_combo.addItem(intermediate.label, name)
+        self.intermediate_combo.setCurrentIndex(max(0, self.intermediate_combo.findData(flipbook_profiles.default_intermediate())))
+        self.encode_combo = QtWidgets.QComboBox()
+        for name, preset in flipbook_profiles.ENCODE_PRESETS.items():
+            self.encode_combo.addItem(preset.label, name)
+        self.encode_combo.setCurrentIndex(self.encode_combo.findData(flipbook_profiles.default_encode()))
+        self.extra_checks = {}
+        extras_row = QtWidgets.QHBoxLayout()
+        for name, extra in flipbook_profiles.EXTRA_OUTPUTS.items():
+            check = QtWidgets.QCheckBox(extra.label)
+            check.setChecked(name in flipbook_profiles.default_outputs())
+            extras_row.addWidget(check)
+            self.extra_checks[name] = check
 
         layout.addRow("Start Frame:", self.start_edit)
         layout.addRow("End Frame:", self.end_edit)
         layout.addRow("Version:", self.version_edit)
+        layout.addRow("Frames:", self.intermediate_combo)
+        layout.addRow("Encode:", self.encode_combo)
+        layout.addRow("Also write:", extras_row)
         layout.addRow("", self.open_checkbox)
+        layout.addRow("", self.progressive_checkbox)
 
         btn_layout = QtWidgets.QHBoxLayout()
         self.ok_btn = QtWidgets.QPushButton("Flipbook")
@@ -76,7 +107,11 @@ class FlipbookDialog(QtWidgets.QDialog):
             int(self.start_edit.text()),
             int(self.end_edit.text()),
             self.version_edit.text().strip(),
-            self.open_checkbox.isChecked()
+            self.open_checkbox.isChecked(),
+            self.intermediate_combo.currentData(),
+            self.encode_combo.currentData(),
+            [name for name, check in self.extra_checks.items() if check.isChecked()],
+            self.progressive_checkbox.isChecked()
         )
 
 
@@ -105,7 +140,7 @@ def main():
     if not dialog.exec_():
         return  # Cancelled
 
-    start_frame, end_frame, version_str, open_after = dialog.get_values()
+    start_frame, end_frame, version_str, open_after, intermediate, encode, extra_names, progressive_mode = dialog.get_values()
 
     # Scene Viewer & Camera
     viewer = toolutils.sceneViewer()
@@ -120,55 +155,59 @@ def main():
     # Setup output
     version_folder = os.path.join(flipbook_dir, version_str)
     os.makedirs(version_folder, exist_ok=True)
-    image_pattern = os.path.join(version_folder, f"{hip_name}_{version_str}.$F4.exr")
+    # The flipbook picks the image format from the extension
+    frame_ext = flipbook_profiles.INTERMEDIATES[intermediate].ext
+    frame_name = f"{hip_name}_{version_str}.%04d{frame_ext}"
+    image_pattern = os.path.join(version_folder, f"{hip_name}_{version_str}.$F4{frame_ext}")
 
-    # Flipbook settings
-    settings = viewer.flipbookSettings()
-    settings.stash()
+    # A stashed copy, so the progressive passes never change the viewer's own flipbook settings
+    settings = viewer.flipbookSettings().stash()
     settings.output(image_pattern)
     settings.frameRange((start_frame, end_frame))
+    settings.frameIncrement(1)
     settings.useResolution(True)
     settings.resolution((resx, resy))
 
     settings.useMotionBlur(False)
     settings.cropOutMaskOverlay(True)
 
-    viewer.flipbook(viewport, settings)
-
-    # MP4 render via ffmpeg
+    render_start = time.time()
+    if progressive_mode:
+        # Sidecar first so the browsers can show each coarse pass as soon as it lands
+        flipbook_meta.new_sidecar(
+            version_folder, "viewport", hip_name, version_str, camera.path(), (resx, resy),
+            (start_frame, end_frame), frame_name, intermediate=intermediate, encode_profile=encode,
+            progressive_step=None)
+        for step, frames in progressive.passes(start_frame, end_frame):
+            for first, last, inc in progressive.frame_ranges(frames):
+                settings.frameRange((first, last))
+                settings.frameIncrement(inc)
+                viewer.flipbook(viewport, settings)
+            flipbook_meta.update_sidecar(version_folder, progressive_step=step)
+    else:
+        viewer.flipbook(viewport, settings)
+    flipbook_meta.new_sidecar(
+        version_folder, "viewport", hip_name, version_str, camera.path(), (resx, resy), (start_frame, end_frame),
+        frame_name, render_seconds=round(time.time() - render_start, 2), intermediate=intermediate,
+        encode_profile=encode)
+
+    # MP4 render via ffmpeg, queued so Houdini is free as soon as the frames are written
     try:
-        ffmpeg = get_ffmpeg_bin()
+        ffmpeg_bin = get_ffmpeg_bin()
 
         mp4_dir = os.path.normpath(os.path.join(flipbook_dir, "mp4"))
         os.makedirs(mp4_dir, exist_ok=True)
 
-        exr_seq = os.path.normpath(os.path.join(version_folder, f"{hip_name}_{version_str}.%04d.exr"))
+        frame_seq = os.path.normpath(os.path.join(version_folder, frame_name))
         mp4_path = os.path.normpath(os.path.join(mp4_dir, f"{hip_name}.{version_str}.mp4"))
-
-        cmd = [
-            ffmpeg,
-            "-y",
-            "-start_number", str(start_frame),
-            "-framerate", "24",
-            "-i", exr_seq,
-            "-c:v", "libx264",
-            "-preset", "veryslow",
-            "-crf", "0",  # Lossless CRF
-            "-pix_fmt", "yuv444p",  # Full chroma (optional, if source supports it)
-            mp4_path
-        ]
-
-        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        if result.returncode != 0:
-            raise hou.Error("FFmpeg failed:\n" + result.stderr.decode())
-
-        if open_after:
-            if sys.platform == "win32":
-                os.startfile(mp4_path)
-            elif sys.platform == "darwin":
-                subprocess.call(["open", mp4_path])
-            else:
-                subprocess.call(["xdg-open", mp4_path])
+        extras = flipbook_profiles.extra_outputs(mp4_dir, f"{hip_name}.{version_str}", extra_names)
+
+        job = encode_queue.sequence_job(
+            f"{hip_name} {version_str}", ffmpeg_bin, frame_seq, start_frame, end_frame, mp4_path,
+            folder=version_folder, on_done=open_mp4 if open_after else None, extra_outputs=extras,
+            **flipbook_profiles.encode_args(encode))
+        encode_queue.shared_queue().submit(job)
+        encode_queue.show_queue_window(hou.qt.mainWindow())
 
     except Exception as e:
         hou.ui.displayMessage(f"Flipbook succeeded, but MP4 creation failed:\n{e}")